@@ -0,0 +1,125 @@
+"""
+Micro-benchmark: các lời gọi nóng của Board
+So bản cũ (quét / dựng list, chép lại ở đây làm mốc) với bản hiện tại:
+- check_win dựng list cells (insert(0, ...)) vs is_win chỉ đếm
+- is_full / has-pieces / stone count quét 225 ô vs bộ đếm trong place/remove
+
+Chạy từ thư mục Caro19:
+    python -m benchmarks.board_micro [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+from config.game_config import WIN_CONDITION, STORAGE_GRID, STORAGE_BITBOARD
+from src.core.board import Board
+from src.core.constants import SYMBOL_X, SYMBOL_O
+
+
+# BẢN CŨ (mốc so sánh)
+def legacy_check_win(board, row, col, symbol):
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        cells = [(row, col)]
+        r, c = row + dr, col + dc
+        while board.is_inside(r, c) and board.grid[r][c] == symbol:
+            cells.append((r, c))
+            r += dr
+            c += dc
+        r, c = row - dr, col - dc
+        while board.is_inside(r, c) and board.grid[r][c] == symbol:
+            cells.insert(0, (r, c))
+            r -= dr
+            c -= dc
+        if len(cells) >= WIN_CONDITION:
+            return cells[:WIN_CONDITION]
+    return None
+
+
+def legacy_is_full(board):
+    for r in range(board.rows):
+        for c in range(board.cols):
+            if board.grid[r][c] is None:
+                return False
+    return True
+
+
+def legacy_has_any_piece(board):
+    for r in range(board.rows):
+        for c in range(board.cols):
+            if board.grid[r][c] is not None:
+                return True
+    return False
+
+
+def legacy_stone_count(board):
+    return sum(1 for row in board.grid for cell in row if cell is not None)
+
+
+def random_board(storage, stones, rng):
+    #Thế giữa ván: stones quân X / O xen kẽ quanh tâm, chưa ai thắng
+    board = Board(storage)
+    center = board.rows // 2
+    turn = SYMBOL_X
+    while board.stone_count() < stones:
+        r, c = center + rng.randint(-5, 5), center + rng.randint(-5, 5)
+        if board.place(r, c, turn):
+            if board.is_win(r, c, turn):
+                board.remove(r, c)
+                continue
+            turn = SYMBOL_O if turn == SYMBOL_X else SYMBOL_X
+    return board
+
+
+def measure(fn, repeat):
+    #µs mỗi lần gọi (lấy lần nhanh nhất trong 5 lượt)
+    return min(timeit.repeat(fn, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark win check / occupancy của Board")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--stones", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=2019)
+    args = parser.parse_args()
+
+    for storage in (STORAGE_GRID, STORAGE_BITBOARD):
+        board = random_board(storage, args.stones, random.Random(args.seed))
+        # AI gọi win check trên mọi ô trống (coi như đã đặt quân)
+        empties = [
+            (r, c)
+            for r in range(board.rows)
+            for c in range(board.cols)
+            if board.grid[r][c] is None
+        ]
+
+        def old_scan():
+            for r, c in empties:
+                legacy_check_win(board, r, c, SYMBOL_X)
+
+        def new_check():
+            for r, c in empties:
+                board.check_win(r, c, SYMBOL_X)
+
+        def new_bool():
+            for r, c in empties:
+                board.is_win(r, c, SYMBOL_X)
+
+        rows = [
+            (f"win check × {len(empties)} ô", old_scan, new_bool),
+            ("  (check_win hiện tại)", old_scan, new_check),
+            ("is_full", lambda: legacy_is_full(board), board.is_full),
+            ("has pieces", lambda: legacy_has_any_piece(board), board.has_pieces),
+            ("stone count", lambda: legacy_stone_count(board), board.stone_count),
+        ]
+
+        print(f"[{storage}] {args.stones} quân")
+        for name, old, new in rows:
+            t_old, t_new = measure(old, args.repeat), measure(new, args.repeat)
+            print(f"  {name:<28} cũ {t_old:9.2f} µs   mới {t_new:9.2f} µs   × {t_old / t_new:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
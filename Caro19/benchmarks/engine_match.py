@@ -0,0 +1,84 @@
+"""
+Benchmark: AIMcts vs AIHard cùng thời gian mỗi nước
+Mỗi cặp ván đổi màu, 2 nước đầu ngẫu nhiên quanh tâm để các ván khác nhau.
+In kết quả từng ván, tỉ số, và tốc độ (MCTS: lượt / giây, HARD: nút / giây).
+
+Chạy từ thư mục Caro19:
+    python -m benchmarks.engine_match --games 10 --time 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from src.ai.ai_hard import AIHard
+from src.ai.ai_mcts import AIMcts
+from src.core.board import Board
+from src.core.constants import SYMBOL_X, SYMBOL_O
+
+
+def play(engines, rng: random.Random, stats):
+    #engines = {symbol: ai}; trả về symbol thắng hoặc None (hoà)
+    board = Board()
+    center = board.rows // 2
+    turn = SYMBOL_X
+    for r, c in ((center, center), (center + rng.randint(-1, 1), center + rng.choice((-1, 1)))):
+        board.place(r, c, turn)
+        turn = SYMBOL_O if turn == SYMBOL_X else SYMBOL_X
+
+    while not board.is_full():
+        ai = engines[turn]
+        t0 = time.perf_counter()
+        r, c = ai.get_move(board)
+        elapsed = time.perf_counter() - t0
+
+        name = type(ai).__name__
+        work = ai.iterations_done if isinstance(ai, AIMcts) else ai.control.nodes
+        total = stats.setdefault(name, [0, 0.0, 0])
+        total[0] += work
+        total[1] += elapsed
+        total[2] += 1
+
+        if not board.place(r, c, turn):
+            raise RuntimeError(f"{name} trả về nước không hợp lệ {r},{c}")
+        if board.is_win(r, c, turn):
+            return turn
+        turn = SYMBOL_O if turn == SYMBOL_X else SYMBOL_X
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="So sánh AIMcts và AIHard cùng thời gian mỗi nước")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--time", type=float, default=1.0, help="giây mỗi nước cho cả 2 engine")
+    parser.add_argument("--seed", type=int, default=2019)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    score = {"AIMcts": 0, "AIHard": 0, "draw": 0}
+    stats = {}
+    for game in range(args.games):
+        mcts_symbol = SYMBOL_X if game % 2 == 0 else SYMBOL_O
+        hard_symbol = SYMBOL_O if mcts_symbol == SYMBOL_X else SYMBOL_X
+        engines = {
+            mcts_symbol: AIMcts(mcts_symbol, move_time=args.time),
+            hard_symbol: AIHard(hard_symbol, move_time=args.time, parallel_mode=None, ponder=False),
+        }
+
+        winner = play(engines, rng, stats)
+        name = type(engines[winner]).__name__ if winner else "draw"
+        score[name] += 1
+        print(f"game {game + 1}: MCTS={mcts_symbol} → {name}")
+        for ai in engines.values():
+            ai.close()
+
+    print(f"score: MCTS {score['AIMcts']} - HARD {score['AIHard']} (draw {score['draw']})")
+    for name, (work, elapsed, moves) in stats.items():
+        unit = "iterations" if name == "AIMcts" else "nodes"
+        print(f"{name}: {moves} moves, {elapsed / moves:.2f}s / move, {work / elapsed:.0f} {unit} / s")
+
+
+if __name__ == "__main__":
+    main()
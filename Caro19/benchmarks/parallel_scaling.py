@@ -0,0 +1,90 @@
+"""
+Benchmark: AIHard song song từ 1 đến N tiến trình trên bộ thế cờ cố định
+Mỗi thế cờ tìm tới đúng độ sâu --depth (không giới hạn thời gian thực tế, bỏ qua rule),
+đo thời gian tới độ sâu đó, tổng số nút và tốc độ nút / giây.
+
+Chạy từ thư mục Caro19:
+    python -m benchmarks.parallel_scaling --workers 4 --mode lazy_smp --depth 6
+    python -m benchmarks.parallel_scaling --backend thread      # trên CPython free-threaded (3.14t)
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from src.ai.ai_hard import AIHard
+from src.core.board import Board
+from src.ai.parallel import gil_enabled
+from config.ai_config import (
+    PARALLEL_LAZY_SMP, PARALLEL_ROOT,
+    PARALLEL_BACKEND_AUTO, PARALLEL_BACKEND_PROCESS, PARALLEL_BACKEND_THREAD,
+)
+
+# Thế cờ giữa ván (quân X đi trước), AI cầm O
+POSITIONS = [
+    [(7, 7, "X"), (7, 8, "O"), (8, 8, "X"), (6, 6, "O"), (8, 7, "X"), (9, 6, "O"), (8, 6, "X")],
+    [(7, 7, "X"), (8, 8, "O"), (7, 8, "X"), (6, 6, "O"), (7, 6, "X"), (9, 9, "O"), (6, 7, "X"),
+     (5, 5, "O"), (8, 6, "X"), (6, 8, "O"), (9, 5, "X")],
+    [(7, 7, "X"), (7, 8, "O"), (6, 7, "X"), (8, 7, "O"), (6, 8, "X"), (8, 6, "O"), (5, 9, "X")],
+    [(7, 7, "X"), (6, 8, "O"), (8, 9, "X"), (5, 5, "O"), (9, 7, "X")],
+    [(7, 7, "X"), (8, 7, "O"), (7, 9, "X"), (6, 8, "O"), (8, 8, "X"), (9, 9, "O"), (6, 6, "X")],
+    [(7, 7, "X"), (7, 6, "O"), (6, 8, "X"), (8, 6, "O"), (5, 9, "X"), (4, 10, "O"), (8, 8, "X"),
+     (6, 6, "O"), (9, 9, "X")],
+]
+
+TIME_CAP = 600.0
+
+
+def run(workers: int, mode: str, depth: int, backend: str = PARALLEL_BACKEND_AUTO):
+    ai = AIHard("O", move_time=TIME_CAP, workers=workers, parallel_mode=mode, parallel_backend=backend)
+    ai.max_depth = depth
+    total_time = 0.0
+    total_nodes = 0
+    moves = []
+
+    for stones in POSITIONS:
+        board = Board()
+        for r, c, sym in stones:
+            board.place(r, c, sym)
+
+        ai.start_workers()
+        # không dừng sớm: soft = hard = TIME_CAP, hết vòng depth là xong
+        ai.tt.clear()
+        ai.tt.new_search()
+        ai.control.start(TIME_CAP, TIME_CAP)
+        root = ai._generate_candidates(board, "O", "X")
+
+        t0 = time.perf_counter()
+        _, move = ai.search(board, root, "O", "X")
+        total_time += time.perf_counter() - t0
+        total_nodes += ai.parallel.nodes if ai.parallel is not None else ai.control.nodes
+        moves.append(move)
+
+    ai.close()
+    return total_time, total_nodes, moves
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Đo khả năng mở rộng của AIHard song song")
+    parser.add_argument("--workers", type=int, default=4, help="số tiến trình tối đa")
+    parser.add_argument("--mode", choices=[PARALLEL_LAZY_SMP, PARALLEL_ROOT], default=PARALLEL_LAZY_SMP)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument(
+        "--backend", default=PARALLEL_BACKEND_AUTO,
+        choices=[PARALLEL_BACKEND_AUTO, PARALLEL_BACKEND_PROCESS, PARALLEL_BACKEND_THREAD],
+    )
+    args = parser.parse_args()
+
+    print(f"mode={args.mode} backend={args.backend} gil={gil_enabled()} depth={args.depth} positions={len(POSITIONS)}")
+    print(f"{'workers':>7} {'time(s)':>8} {'speedup':>8} {'nodes':>9} {'knps':>7}  moves")
+    base = None
+    for n in range(1, args.workers + 1):
+        elapsed, nodes, moves = run(n, args.mode, args.depth, args.backend)
+        base = base or elapsed
+        print(f"{n:>7} {elapsed:>8.2f} {base / elapsed:>8.2f} {nodes:>9} {nodes / elapsed / 1000:>7.1f}  "
+              + " ".join(f"{r},{c}" for r, c in moves))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,10 @@ AI configuration for Caro19
 Chứa cấu hình cho các mức độ AI
 """
 
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
 # AI DIFFICULTY LEVELS
 
 AI_EASY = "EASY"
@@ -22,17 +26,117 @@ NORMAL_DEFENSE_WEIGHT = 1.0
 # Tỷ lệ đánh ngẫu nhiên để tránh quá "máy"
 NORMAL_RANDOM_RATE = 0.01
 
+# Chấm cả bàn 1 lần bằng NumPy (không có NumPy → tự dùng vòng lặp từng ô)
+NORMAL_USE_NUMPY = True
+
 # HARD MODE
-# Minimax + Alpha-Beta Pruning
+# PVS + LMR + extension, iterative deepening dừng theo thời gian
 
-HARD_SEARCH_DEPTH = 4     # độ sâu minimax
+HARD_SEARCH_DEPTH = 10    # độ sâu danh nghĩa tối đa (thường dừng vì hết thời gian trước)
+HARD_MOVE_TIME = 2.0      # thời gian nghĩ mong muốn mỗi nước (trần của soft deadline)
 HARD_USE_ALPHA_BETA = True
 
+# LMR: từ nước thứ MIN_MOVES + 1 (yên lặng) ở độ sâu >= MIN_DEPTH giảm 1 ply,
+# sau LATE_MOVES nước giảm 2 ply; đọc lại đủ sâu nếu vượt alpha
+HARD_LMR_MIN_DEPTH = 3
+HARD_LMR_MIN_MOVES = 3
+HARD_LMR_LATE_MOVES = 8
+
+# Extension (four, đỡ four, open-three): 1 nhánh dài tối đa factor * độ sâu danh nghĩa
+HARD_EXTENSION_FACTOR = 2
+# open-three đơn chỉ được kéo dài ở ply < độ sâu danh nghĩa // DIV (double-three luôn được)
+HARD_THREE_EXTENSION_DIV = 3
+
+# PVS: nửa độ rộng aspiration window quanh điểm vòng lặp trước
+HARD_ASPIRATION_WINDOW = 3000
+
+# Điểm tĩnh (_quick_score) từ mức này trở lên = nước ép (tạo / chặn four),
+# luôn xếp trước killer / history
+HARD_FORCING_SCORE = 100_000
+
 # Giới hạn số nước đi xét
 HARD_MAX_CANDIDATES = 15
 
-# Thời gian suy nghĩ tối đa
+# Thời gian suy nghĩ tối đa cho 1 nước (trần của hard deadline)
 HARD_TIME_LIMIT = 10
+
+# Điều khiển thời gian (SearchController)
+SEARCH_CHECK_NODES = 256        # đọc đồng hồ mỗi N nút
+SEARCH_SOFT_SHARE = 0.5         # không bấm giờ: soft = share * HARD_TIME_LIMIT
+SEARCH_MOVES_TO_GO = 25         # số nước còn lại ước lượng lúc đầu ván
+SEARCH_MIN_MOVES_TO_GO = 10
+SEARCH_OPENING_STONES = 8       # ít quân hơn → đầu ván, đi nhanh hơn
+SEARCH_OPENING_FACTOR = 0.5
+SEARCH_HARD_FACTOR = 3.0        # hard = soft * factor
+SEARCH_MAX_CLOCK_SHARE = 0.25   # 1 nước không dùng quá 1/4 thời gian còn lại
+SEARCH_CLOCK_RESERVE = 2.0      # giây giữ lại, không bao giờ tiêu
+SEARCH_STABLE_ITERATIONS = 3    # nước tốt nhất giữ nguyên bấy nhiêu vòng → dừng sớm
+SEARCH_NEXT_ITERATION_SHARE = 0.6   # đã dùng quá phần này của soft → không mở vòng sâu hơn
+
+# Tìm kiếm song song (tiến trình hoặc luồng, TT chung)
+PARALLEL_OFF = "off"
+PARALLEL_ROOT = "root"            # chia nước gốc cho các tiến trình
+PARALLEL_LAZY_SMP = "lazy_smp"    # mọi tiến trình tìm cả cây, chia sẻ qua TT
+
+# Backend của helper: tiến trình (mọi bản CPython) hoặc luồng (chỉ nhanh hơn trên bản free-threaded 3.14t)
+PARALLEL_BACKEND_AUTO = "auto"          # luồng nếu không có GIL, ngược lại tiến trình
+PARALLEL_BACKEND_PROCESS = "process"
+PARALLEL_BACKEND_THREAD = "thread"      # còn GIL → tự lùi về tiến trình
+
+HARD_PARALLEL_MODE = PARALLEL_OFF
+HARD_PARALLEL_BACKEND = PARALLEL_BACKEND_AUTO
+HARD_WORKERS = os.cpu_count() or 1   # tính cả tiến trình / luồng chính
+HARD_PARALLEL_START_METHOD = "spawn"  # không fork: get_move chạy trên luồng AIWorker, fork từ tiến trình nhiều luồng (SDL, ponder) có thể kẹt khoá
+HARD_PARALLEL_JOIN_MARGIN = 0.5      # giây chờ helper gửi kết quả sau khi bật cờ dừng
+
+# Pondering: sau nước của AI, tìm trước trên nước đáp đoán được trong lúc người chơi nghĩ
+HARD_PONDER = True
+HARD_PONDER_MAX_TIME = 30.0     # giây tối đa cho 1 lần ponder (ván bị bỏ dở không đốt CPU mãi)
+
+# Transposition table: 2^HARD_TT_BITS ô (16 byte / ô)
+HARD_TT_BITS = 18
+
+# VCF (chuỗi four liên tục)
+VCF_MAX_DEPTH = 12        # số nước four tối đa (~24 nước cờ)
+VCF_MAX_NODES = 20000
+VCF_TT_BITS = 16
+
+# VCT (four + three liên tục)
+VCT_MAX_DEPTH = 6         # số nước tấn công tối đa
+VCT_MAX_NODES = 12000
+VCT_TT_BITS = 16
+VCT_TIME_SHARE = 0.2      # phần ngân sách mỗi nước dành cho VCT
+
+# Proof-number search (chỉ chạy khi thế cờ nhiều đe doạ)
+PNS_MAX_NODES = 200000    # số nút cấp phát sẵn (~29 byte / nút)
+PNS_NODE_BUDGET = 40000   # ngân sách nút mỗi nước trong ván
+PNS_TIME_SHARE = 0.2      # phần ngân sách mỗi nước dành cho PNS
+PNS_DENSE_THREATS = 4     # số ô tạo four + số cửa sổ tạo three tối thiểu
+PNS_CACHE_MAX = 100000    # số thế đã giải giữ trong bộ nhớ
+PNS_CACHE_PATH = os.path.join(BASE_DIR, "assets", "solved", "pns_cache.bin")
+
+# Sách khai cuộc (khoá bất biến qua đối xứng + tịnh tiến, dựng offline: python -m src.ai.opening_book)
+BOOK_ENABLED = True
+BOOK_MAX_STONES = 8       # chỉ tra sách khi bàn có tối đa bấy nhiêu quân
+BOOK_EDGE_MARGIN = 4      # quân gần mép hơn → không coi là tịnh tiến của thế trong sách
+BOOK_PATH = os.path.join(BASE_DIR, "assets", "book", "opening.bin")
+
+# MCTS (AIMcts)
+MCTS_MOVE_TIME = 2.0          # giây mỗi nước (như HARD_MOVE_TIME → so sánh cùng thời gian)
+MCTS_ITERATIONS = 200_000     # trần số lượt mỗi nước
+MCTS_MAX_NODES = 200_000      # số nút cấp phát sẵn (~41 byte / nút)
+MCTS_MAX_CHILDREN = 20        # số con tối đa mỗi nút (theo prior)
+MCTS_RADIUS = 2               # bán kính frontier khi mở rộng
+MCTS_EXPLORATION = 0.7        # hằng số C của UCT
+MCTS_PRIOR_WEIGHT = 1.0       # prior / (1 + visits)
+MCTS_WIDEN_BASE = 2           # progressive widening: base + factor * visits^power con
+MCTS_WIDEN_FACTOR = 1.0
+MCTS_WIDEN_POWER = 0.5
+MCTS_PLAYOUT_DEPTH = 24       # số nước tối đa mỗi playout, quá thì chấm tĩnh
+MCTS_PLAYOUT_SAMPLES = 4      # số ô lấy mẫu mỗi nước playout
+MCTS_EVAL_SCALE = 20_000      # điểm tĩnh → xác suất thắng (sigmoid)
+MCTS_CHECK_ITERATIONS = 16    # đọc đồng hồ mỗi N lượt
+
 AI_PLAYER_SYMBOL = "O"
 HUMAN_PLAYER_SYMBOL = "X"
 # Cho phép AI đi trước
@@ -8,6 +8,11 @@ BOARD_ROWS = 15
 BOARD_COLS = 15
 WIN_CONDITION = 5
 
+# Cách lưu bàn cờ: "grid" (list 2 chiều) hoặc "bitboard" (grid + mặt nạ bit)
+STORAGE_GRID = "grid"
+STORAGE_BITBOARD = "bitboard"
+BOARD_STORAGE = STORAGE_BITBOARD
+
 CELL_SIZE = 40
 BOARD_MARGIN = 50
 
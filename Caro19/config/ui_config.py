@@ -54,6 +54,9 @@ FONT_SIZE_BUTTON = 28
 FONT_SIZE_TEXT = 22
 FONT_SIZE_SMALL = 18
 
+# Số surface chữ tối đa giữ trong TextCache (src/utils/helpers.py)
+TEXT_CACHE_SIZE = 256
+
 
 # MENU LAYOUT
 
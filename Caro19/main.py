@@ -17,6 +17,7 @@ from src.core.constants import (
     ACTION_EASY,
     ACTION_NORMAL,
     ACTION_HARD,
+    ACTION_MCTS,
 )
 
 from src.ui.menu import main_menu
@@ -53,7 +54,7 @@ def main():
 
             elif mode == ACTION_PVE:
                 level = difficulty_menu(screen)
-                if level in (ACTION_EASY, ACTION_NORMAL, ACTION_HARD):
+                if level in (ACTION_EASY, ACTION_NORMAL, ACTION_HARD, ACTION_MCTS):
                     result = game_screen(
                         screen,
                         mode=ACTION_PVE,
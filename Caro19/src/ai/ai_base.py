@@ -1,19 +1,121 @@
 """
 Base AI class for Caro19
 Lớp nền cho tất cả các AI (Easy / Normal / Hard)
+
+Ngoài get_move (chờ tới khi có nước), mọi AI có 2 cách gọi báo tiến độ (anytime):
+- analyse(board, callback): callback(SearchInfo) sau mỗi vòng tìm kiếm, trả về True để dừng sớm
+- stream(board): generator SearchInfo, tìm trên luồng nền; break giữa chừng → huỷ tìm kiếm
+Cả 2 luôn kết thúc bằng 1 SearchInfo có final=True chứa nước get_move trả về.
 """
 
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Optional, Tuple
+
+
+class SearchInfo(NamedTuple):
+    depth: int                      # 0 = nước từ rule / sách, không qua vòng tìm kiếm nào
+    move: Tuple[int, int]
+    score: Optional[float]          # None khi AI không chấm điểm nước này (HARD: điểm nguyên)
+    pv: List[Tuple[int, int]]
+    nodes: int
+    elapsed: float                  # giây tính từ đầu analyse / stream
+    final: bool = False
+
 
 class AIBase(ABC):
     def __init__(self, symbol):
 
         self.symbol = symbol
+        # Thời gian còn lại trên đồng hồ ván (Game gán trước mỗi get_move), None = không bấm giờ
+        self.time_left = None
+
+        # Callback của analyse (None = get_move thường, _report không làm gì)
+        self.progress = None
+        self.last_info = None
+        self._progress_start = 0.0
 
     @abstractmethod
     def get_move(self, board):
         pass
 
+    # ANYTIME API
+    def analyse(self, board, callback):
+        #get_move có báo tiến độ; trả về nước như get_move
+        self.progress = callback
+        self.last_info = None
+        self._progress_start = time.monotonic()
+        try:
+            move = self.get_move(board)
+        finally:
+            self.progress = None
+
+        last = self.last_info
+        if last is not None and last.move == move:
+            final = last._replace(elapsed=time.monotonic() - self._progress_start, final=True)
+        else:
+            # nước từ rule / sách / kết quả gộp của helper: không có vòng tìm kiếm nào của riêng nó
+            nodes = last.nodes if last is not None else 0
+            final = SearchInfo(0, move, None, [move], nodes, time.monotonic() - self._progress_start, True)
+        callback(final)
+        return move
+
+    def stream(self, board):
+        #Generator của analyse, chạy trên bản sao bàn cờ ở luồng nền
+        infos = queue.SimpleQueue()
+        done = object()
+
+        def run():
+            try:
+                self.analyse(board.copy(), infos.put)
+                infos.put(done)
+            except Exception as exc:
+                infos.put(exc)
+
+        thread = threading.Thread(target=run, name="caro-analyse", daemon=True)
+        thread.start()
+        try:
+            while True:
+                info = infos.get()
+                if info is done:
+                    return
+                if isinstance(info, Exception):
+                    raise info
+                yield info
+        finally:
+            # caller dừng sớm (break / close) → huỷ, lặp lại tới khi luồng thật sự dừng
+            while thread.is_alive():
+                self.cancel()
+                thread.join(0.01)
+
+    def _report(self, depth, move, score, pv, nodes):
+        #AI gọi khi có kết quả mới (hết 1 vòng lặp sâu dần, ...); không có callback thì không tốn gì
+        if self.progress is None:
+            return
+        info = SearchInfo(depth, move, score, list(pv), nodes, time.monotonic() - self._progress_start)
+        self.last_info = info
+        if self.progress(info):
+            self.cancel()
+
+    # HOOKS
+    def ponder(self, board):
+        #Gọi sau nước của AI: tìm trước trong lúc đối thủ nghĩ – mặc định không làm gì
+        pass
+
+    def stop_pondering(self):
+        #Huỷ ponder (thế cờ đổi ngoài dự đoán: Undo / Redo / Restart)
+        pass
+
+    def cancel(self):
+        #Huỷ get_move đang chạy trên luồng khác (AIWorker, stream) – AI nhanh không cần làm gì
+        pass
+
+    def close(self):
+        #Giải phóng tài nguyên riêng của AI (tiến trình phụ, ...) – mặc định không có gì
+        pass
+
     def get_opponent_symbol(self):
         #Lấy ký hiệu đối thủ
         return "O" if self.symbol == "X" else "X"
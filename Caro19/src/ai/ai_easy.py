@@ -43,37 +43,16 @@ class AIEasy(AIBase):
     # WIN / BLOCK LOGIC
 
     def _find_winning_move(self, board, symbol):
-        for row in range(board.rows):
-            for col in range(board.cols):
-                if board.is_empty(row, col):
-                    board.grid[row][col] = symbol
-                    if board.check_win(row, col, symbol):
-                        board.grid[row][col] = None
-                        return row, col
-                    board.grid[row][col] = None
-        return None
+        # ô tạo five do board.threats() giữ sẵn (ô đầu tiên theo hàng → cột)
+        return board.threats().five(symbol)
 
     # NEAR MOVE
     def _find_near_move(self, board):
         #Chọn ô trống gần quân đã có (bán kính 1)
-        candidates = set()
-
-        for row in range(board.rows):
-            for col in range(board.cols):
-                if not board.is_empty(row, col):
-                    for dr in (-1, 0, 1):
-                        for dc in (-1, 0, 1):
-                            r = row + dr
-                            c = col + dc
-                            if (
-                                0 <= r < board.rows
-                                and 0 <= c < board.cols
-                                and board.is_empty(r, c)
-                            ):
-                                candidates.add((r, c))
+        candidates = list(board.frontier(1))
 
         if candidates:
-            return random.choice(list(candidates))
+            return random.choice(candidates)
 
         return None
 
@@ -1,73 +1,197 @@
 from __future__ import annotations
 
-import math
-import time
-from typing import List, Tuple, Optional, Set
+import threading
+from array import array
+from typing import Dict, List, Tuple, Optional
 
 from src.ai.ai_base import AIBase
-from config.ai_config import HARD_TIME_LIMIT, HARD_MAX_CANDIDATES, HARD_SEARCH_DEPTH
+from src.ai.evaluator import PatternEvaluator
+from src.core.patterns import (
+    THREAT_TABLE, CHAIN_BONUS, FIVE, OPEN_FOUR, OPEN_THREE, FOURS, THREES,
+    window_codes, threat_classes, threat_cells, threat_cells_through, open_windows,
+)
+from src.ai.vcf import VCFSolver
+from src.ai.vct import VCTSolver
+from src.ai.pns import ProofNumberSearch, PROVEN, shared_cache
+from src.ai.opening_book import shared_book
+from src.ai.search_control import SearchController
+from src.ai.parallel import ParallelSearch, create_parallel
+from src.core.constants import SYMBOL_X, SYMBOL_O
+from src.ai.transposition import TranspositionTable, TT_EXACT, TT_LOWER, TT_UPPER, NO_MOVE
+from config.ai_config import (
+    HARD_MAX_CANDIDATES, HARD_SEARCH_DEPTH, HARD_MOVE_TIME, HARD_TT_BITS, HARD_ASPIRATION_WINDOW,
+    HARD_FORCING_SCORE, HARD_LMR_MIN_DEPTH, HARD_LMR_MIN_MOVES, HARD_LMR_LATE_MOVES,
+    HARD_EXTENSION_FACTOR, HARD_THREE_EXTENSION_DIV,
+    HARD_WORKERS, HARD_PARALLEL_MODE, HARD_PARALLEL_BACKEND, PARALLEL_OFF,
+    HARD_PONDER, HARD_PONDER_MAX_TIME,
+    VCT_TIME_SHARE, PNS_NODE_BUDGET, PNS_TIME_SHARE, PNS_DENSE_THREATS,
+    BOOK_ENABLED, BOOK_MAX_STONES,
+)
 
-DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1)]
 WIN_SCORE = 10_000_000
+SCORE_INF = 2 * WIN_SCORE
+
+# Độ sâu tối đa của bảng PV (kể cả phần kéo dài)
+MAX_PLY = 64
+
+# XOR vào board.hash khi tới lượt "me" → cùng thế cờ nhưng khác lượt là khác key
+TT_SIDE_KEY = 0x9E3779B97F4A7C15
 
 
 class AIHard(AIBase):
     """
     HARD (Game+ Stable)
+    - Sách khai cuộc (ít quân, file dựng offline) trước mọi rule
     - Rule priorities đúng chuẩn:
         1) Win now
         2) Block opponent win now (NO validation)
-        3) Block opponent open-four (NO validation)
-        4) Create open-four
-        5) Block/Make closed-four & double-three (WITH validation)
-        6) Counter-threat (ép ngược)
-        7) Alpha-beta fallback (safe)
+        3) VCF: thắng bằng chuỗi four liên tục
+        4) VCT: thắng bằng chuỗi four / three (ngân sách riêng VCT_TIME_SHARE)
+        5) Proof-number search khi thế cờ nhiều đe doạ (kết quả cache giữa các ván)
+        6) Opponent VCF → nước phá VCF (gồm cả open-four của đối thủ)
+        7) Block opponent open-four (NO validation)
+        8) Create open-four
+        9) Block/Make closed-four & double-three (WITH validation)
+        10) Counter-threat (ép ngược)
+        11) Search fallback: PVS + LMR + extension (safe)
     - Defensive validation: loại nước chặn vô nghĩa (nhưng KHÔNG áp dụng cho win/open4)
     - Không out game: không trả về ±inf
+    - Pondering: tìm trước trong lúc đối thủ nghĩ (ponder / stop_pondering)
     """
 
-    def __init__(self, symbol: str):
+    def __init__(self, symbol: str, move_time: Optional[float] = HARD_MOVE_TIME,
+                 workers: int = HARD_WORKERS, parallel_mode: Optional[str] = HARD_PARALLEL_MODE,
+                 parallel_backend: str = HARD_PARALLEL_BACKEND, ponder: bool = HARD_PONDER):
         super().__init__(symbol)
-        self.start_time: float = 0.0
+        # thời gian nghĩ mong muốn mỗi nước (None = chỉ theo đồng hồ ván / HARD_TIME_LIMIT)
+        self.move_time = move_time
+
+        # tìm kiếm song song: tạo helper (tiến trình / luồng) ở get_move đầu tiên
+        self.workers = max(1, int(workers))
+        self.parallel_mode = parallel_mode if parallel_mode != PARALLEL_OFF else None
+        self.parallel_backend = parallel_backend
+        self.parallel: Optional[ParallelSearch] = None
+        self.control = SearchController()
 
         self.max_depth = max(2, int(HARD_SEARCH_DEPTH))
         self.near_radius = 2
         self.cand_limit = max(10, int(HARD_MAX_CANDIDATES))
 
+        # giữ qua các nước đi, mỗi get_move là một "age" mới
+        self.tt = TranspositionTable(HARD_TT_BITS)
+        self.evaluator = PatternEvaluator()
+
+        # PV (principal variation) theo ply + PV và điểm nước gốc của vòng lặp trước
+        self.pv: List[List[Tuple[int, int]]] = [[] for _ in range(MAX_PLY)]
+        self.prev_pv: List[Tuple[int, int]] = []
+        self.root_scores: Dict[Tuple[int, int], int] = {}
+        self.ply_limit = MAX_PLY - 1
+        self.completed: List[Tuple[int, int, Tuple[int, int]]] = []
+        self.three_ply_limit = 0
+
+        # Heuristic thứ tự nước: killer theo ply, history (ô × bên), counter-move (nước trước → nước đáp)
+        self.killers: List[List[Optional[Tuple[int, int]]]] = [[None, None] for _ in range(MAX_PLY)]
+        self.history: Dict[str, List[int]] = {}
+        self.counter_moves: Dict[str, array] = {}
+        self.vcf = VCFSolver()
+        self.vct = VCTSolver()
+        self.pns: Optional[ProofNumberSearch] = None    # tạo khi cần (cấp phát PNS_MAX_NODES nút)
+        self.use_book = BOOK_ENABLED
+
+        # Pondering: nước đáp đoán trước (PV[1] của lần tìm gần nhất) + luồng nền tìm trên thế cờ đó
+        self.ponder_enabled = ponder
+        self.expected_reply: Optional[Tuple[int, int]] = None
+        self.ponder_thread: Optional[threading.Thread] = None
+        self.ponder_hash: Optional[int] = None
+        # (move, elapsed, final, completed) – final: kết quả không đổi dù tìm thêm (rule / hết độ sâu)
+        self.ponder_result = None
+        self.rules_checked = False      # _think đã qua hết rule → ponder dở dang vẫn dùng được
 
     # PUBLIC
     def get_move(self, board) -> Tuple[int, int]:
-        self.start_time = time.time()
+        pondered = self._take_ponder(board)
+        self.start_workers()
+        self.control.start(*self.control.allocate(self.time_left, board.stone_count(), self.move_time))
+
+        if pondered is not None:
+            # đoán trúng: đã tìm đủ lâu / kết quả cuối → trả ngay, ngược lại tìm tiếp từ độ sâu đã đạt
+            move, elapsed, final, completed = pondered
+            if final or elapsed >= self.control.soft_deadline - self.control.started:
+                return move
+            me, opp = self.symbol, self.get_opponent_symbol()
+            start_depth = completed[-1][0] if completed else 1
+            _, best_move = self.search(board, self._generate_candidates(board, me, opp), me, opp, start_depth)
+            return best_move
+
+        self.tt.new_search()
+        return self._think(board)
+
+    def _think(self, board) -> Tuple[int, int]:
+        #Rule → search trong ngân sách self.control đã start
         me = self.symbol
         opp = self.get_opponent_symbol()
+        self.expected_reply = None
+        self.completed = []
+        self.rules_checked = False
 
-        if not self._has_any_piece(board):
+        if not board.has_pieces():
             return board.rows // 2, board.cols // 2
 
+        # 0) OPENING BOOK
+        if self.use_book and board.stone_count() <= BOOK_MAX_STONES:
+            mv = shared_book().probe(board)
+            if mv:
+                return mv
+
         # 1) RULES
         mv = self._rule_move(board, me, opp)
         if mv:
             return mv
 
         # 2) SEARCH
+        self.rules_checked = True
         root_moves = self._generate_candidates(board, me, opp)
         if not root_moves:
             return self._first_empty(board)
 
-        best_move = root_moves[0]
-        best_score = -math.inf
-
-        for depth in range(1, self.max_depth + 1):
-            if self._time_up():
-                break
-            score, move = self._root_search(board, root_moves, depth, me, opp)
-            if move is not None:
-                best_score, best_move = score, move
-            if best_score >= WIN_SCORE // 2:
-                break
-
+        _, best_move = self.search(board, root_moves, me, opp)
         return best_move
 
+    def search(self, board, root_moves: List[Tuple[int, int]], me: str, opp: str,
+               start_depth: int = 1) -> Tuple[int, Tuple[int, int]]:
+        #Tìm kiếm (đơn hoặc song song) trong ngân sách self.control đã start
+        self.prepare_search(board)
+        if self.parallel is not None:
+            score, move = self.parallel.search(self, board, root_moves, me, opp, start_depth)
+        else:
+            score, move = self._iterate(board, root_moves, me, opp, start_depth)
+
+        # PV của vòng hoàn chỉnh cuối bắt đầu bằng đúng nước trả về → nước kế là nước đáp dự đoán
+        pv = self.prev_pv
+        self.expected_reply = pv[1] if len(pv) >= 2 and pv[0] == move else None
+        return score, move
+
+    def prepare_search(self, board) -> None:
+        self.evaluator.rebuild(board)
+        self.root_scores = {}
+        self._reset_heuristics(board)
+
+    def start_workers(self) -> None:
+        #Bật tìm kiếm song song theo cấu hình (1 lần, TT chuyển sang bảng dùng chung với helper)
+        if self.parallel_mode and self.workers > 1 and self.parallel is None:
+            self.parallel = create_parallel(
+                self.symbol, self.workers, self.parallel_mode, self.parallel_backend, HARD_TT_BITS
+            )
+            self.tt = self.parallel.tt
+
+    def close(self) -> None:
+        #Dừng ponder và các helper (nếu có)
+        self.stop_pondering()
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+            self.tt = TranspositionTable(HARD_TT_BITS)
+
     # RULE MOVE
 
     def _rule_move(self, board, me: str, opp: str) -> Optional[Tuple[int, int]]:
@@ -81,17 +205,40 @@ class AIHard(AIBase):
         if b:
             return b
 
-        # 3) Block opponent OPEN-FOUR
+        # 3) VCF
+        line = self.vcf.solve(board, me, self.control.expired)
+        if line:
+            return line[0]
+
+        # 4) VCT
+        line = self.vct.solve(board, me, self.control.stage(VCT_TIME_SHARE))
+        if line:
+            return line[0]
+
+        # 5) Proof-number search
+        if self._threats_dense(board, me):
+            if self.pns is None:
+                self.pns = ProofNumberSearch(cache=shared_cache(board.cols))
+            result, line = self.pns.solve(board, me, PNS_NODE_BUDGET, self.control.stage(PNS_TIME_SHARE))
+            if result == PROVEN and line:
+                return line[0]
+
+        # 6) Opponent VCF
+        stop = self._vcf_defense(board, me, opp)
+        if stop:
+            return stop
+
+        # 7) Block opponent OPEN-FOUR
         block_open4 = self._find_open_four_move(board, opp)
         if block_open4:
             return block_open4
 
-        # 4) Create OPEN-FOUR
+        # 8) Create OPEN-FOUR
         make_open4 = self._find_open_four_move(board, me)
         if make_open4:
             return make_open4
 
-        # 5) Block opponent CLOSED-FOUR / DOUBLE-THREE with validation
+        # 9) Block opponent CLOSED-FOUR / DOUBLE-THREE with validation
         block_cf = self._find_closed_four_move(board, opp)
         if block_cf and self._defense_valid(board, block_cf, me, opp):
             return block_cf
@@ -100,7 +247,7 @@ class AIHard(AIBase):
         if block_d3 and self._defense_valid(board, block_d3, me, opp):
             return block_d3
 
-        # 6) Create CLOSED-FOUR / DOUBLE-THREE
+        # 10) Create CLOSED-FOUR / DOUBLE-THREE
         make_cf = self._find_closed_four_move(board, me)
         if make_cf:
             return make_cf
@@ -109,41 +256,63 @@ class AIHard(AIBase):
         if make_d3:
             return make_d3
 
-        # 7) Counter-threat
+        # 11) Counter-threat
         ct = self._best_counter_threat(board, me, opp)
         if ct:
             return ct
 
         return None
 
+    @staticmethod
+    def _threats_dense(board, sym: str) -> bool:
+        #Số ô tạo four + số cửa sổ tạo three đủ nhiều → đáng chạy PNS
+        fours = len(threat_cells(board, sym, 3))
+        if fours >= PNS_DENSE_THREATS:
+            return True
+        return fours + len(open_windows(board, sym, 2)) >= PNS_DENSE_THREATS
+
+    # VCF DEFENSE
+    def _vcf_defense(self, board, me: str, opp: str) -> Optional[Tuple[int, int]]:
+        #Đối thủ có VCF → tìm nước làm VCF đó thất bại
+        line = self.vcf.solve(board, opp, self.control.expired)
+        if not line:
+            return None
+
+        # ô trong chuỗi VCF của đối thủ, rồi các nước four của mình (ép ngược)
+        cands: List[Tuple[int, int]] = []
+        for mv in line + sorted(threat_cells(board, me, 3)):
+            if mv not in cands and board.grid[mv[0]][mv[1]] is None:
+                cands.append(mv)
+
+        for r, c in self._order_moves(board, cands, me, opp):
+            if self.control.expired():
+                break
+            board.place(r, c, me)
+            refuted = self.vcf.solve(board, opp, self.control.expired) is None and not self.vcf.aborted
+            board.remove(r, c)
+            if refuted:
+                return (r, c)
+
+        return None
+
     # DEFENSIVE VALIDATION
     def _defense_valid(self, board, move: Tuple[int, int], me: str, opp: str) -> bool:
 
         #Dùng cho các nước block mơ hồ
         r, c = move
-        if board.grid[r][c] is not None:
+        if not board.place(r, c, me):
             return False
 
-        board.grid[r][c] = me
-
         # Opponent win immediately?
         if self._find_winning_move(board, opp):
-            board.grid[r][c] = None
+            board.remove(r, c)
             return False
 
         # Opponent has open-four or double-three immediately?
-        for rr, cc in self._near_candidates(board, radius=2):
-            if board.grid[rr][cc] is not None:
-                continue
-            board.grid[rr][cc] = opp
-            danger = self._is_open_four(board, rr, cc, opp) or (self._count_open_three_dirs(board, rr, cc, opp) >= 2)
-            board.grid[rr][cc] = None
-            if danger:
-                board.grid[r][c] = None
-                return False
-
-        board.grid[r][c] = None
-        return True
+        threats = board.threats()
+        danger = threats.open_four(opp) or threats.double_three(opp)
+        board.remove(r, c)
+        return not danger
 
 
     # COUNTER THREAT
@@ -157,14 +326,13 @@ class AIHard(AIBase):
             if board.grid[r][c] is not None:
                 continue
 
-            board.grid[r][c] = me
-
             score = 0
+            threats = threat_classes(board, r, c, me)
             # tạo open-four
-            if self._is_open_four(board, r, c, me):
+            if OPEN_FOUR in threats:
                 score += 1000
             # double open-three
-            d3 = self._count_open_three_dirs(board, r, c, me)
+            d3 = self._three_count(threats)
             if d3 >= 2:
                 score += 400
             # open-three
@@ -172,146 +340,254 @@ class AIHard(AIBase):
 
             score += self._center_bonus(board, r, c)
 
-            board.grid[r][c] = None
-
             if score > best_score:
                 best_score = score
                 best = (r, c)
 
         return best if best_score >= 200 else None
 
-    # SEARCH
-    def _root_search(self, board, moves: List[Tuple[int, int]], depth: int, me: str, opp: str) -> Tuple[int, Optional[Tuple[int, int]]]:
-        alpha = -math.inf
-        beta = math.inf
+    # SEARCH (PVS / NegaScout, negamax: score luôn theo góc nhìn bên tới lượt)
+    def _iterate(self, board, moves: List[Tuple[int, int]], me: str, opp: str, start_depth: int = 1) -> Tuple[int, Tuple[int, int]]:
+        """
+        Iterative deepening + aspiration window.
+        - vòng d >= 2 mở cửa sổ (prev ± HARD_ASPIRATION_WINDOW), fail thì nới rộng và tìm lại
+        - PV vòng trước được thử đầu tiên ở mọi ply (self.prev_pv)
+        - nước gốc được xếp lại theo điểm của vòng trước
+        Các vòng hoàn chỉnh được ghi vào self.completed = [(depth, score, move)] và báo qua _report (analyse / stream).
+        """
+        moves = list(moves)    # đã xếp theo điểm tĩnh trong _generate_candidates
+        best_move, best_score = moves[0], -SCORE_INF
+        prev: Optional[int] = None
+        self.prev_pv = []
+        self.completed = []
+
+        for depth in range(start_depth, self.max_depth + 1):
+            if self.control.soft_expired():
+                break
+
+            # extension không kéo 1 nhánh quá HARD_EXTENSION_FACTOR lần độ sâu danh nghĩa
+            self.ply_limit = min(MAX_PLY - 1, depth * HARD_EXTENSION_FACTOR)
+            self.three_ply_limit = depth // HARD_THREE_EXTENSION_DIV
 
-        ordered = self._order_moves(board, moves, me, opp)
+            delta = HARD_ASPIRATION_WINDOW
+            if prev is None:
+                alpha, beta = -SCORE_INF, SCORE_INF
+            else:
+                alpha, beta = prev - delta, prev + delta
 
-        best_score = -math.inf
+            while True:
+                score, move = self._root_search(board, moves, depth, alpha, beta, me, opp)
+                if self.control.stopped or alpha < score < beta:
+                    break
+                # fail-low / fail-high → nới cửa sổ về phía bị vượt
+                delta *= 4
+                if score <= alpha:
+                    alpha = max(-SCORE_INF, score - delta)
+                else:
+                    beta = min(SCORE_INF, score + delta)
+
+            if self.control.stopped:
+                # vòng dở dang: chỉ nhận nước đã chứng minh tốt hơn cận dưới
+                if move is not None and score > alpha:
+                    best_score, best_move = score, move
+                break
+
+            best_score, best_move = score, move
+            prev = score
+            self.completed.append((depth, score, move))
+            self.prev_pv = list(self.pv[0])
+            moves.sort(key=lambda m: -self.root_scores.get(m, -SCORE_INF))
+            self._report(depth, best_move, best_score, self.prev_pv or [best_move], self.control.nodes)
+
+            if best_score >= WIN_SCORE // 2:
+                break
+            if self.control.iteration_done(best_move):
+                break
+
+        return best_score, best_move
+
+    def _root_search(self, board, moves: List[Tuple[int, int]], depth: int, alpha: int, beta: int, me: str, opp: str) -> Tuple[int, Optional[Tuple[int, int]]]:
+        best_score = -SCORE_INF
         best_move = None
+        self.pv[0] = []
 
-        for r, c in ordered:
-            if self._time_up():
+        for r, c in moves:
+            if self.control.stopped:
                 break
-            if board.grid[r][c] is not None:
+            ext = self._extension(board, r, c, me, 0)
+            if not self._make(board, r, c, me):
                 continue
 
-            board.grid[r][c] = me
-            score = self._alphabeta(board, depth - 1, alpha, beta, False, me, opp)
-            board.grid[r][c] = None
-
-            # safety
-            if score == math.inf:
-                score = WIN_SCORE
-            elif score == -math.inf:
-                score = -WIN_SCORE
+            idx = r * board.cols + c
+            on_pv = bool(self.prev_pv) and self.prev_pv[0] == (r, c)
+            new_depth = depth - 1 + ext
+            if best_move is None:
+                score = -self._pvs(board, new_depth, -beta, -alpha, opp, me, 1, on_pv, idx)
+            else:
+                score = -self._pvs(board, new_depth, -alpha - 1, -alpha, opp, me, 1, False, idx)
+                if alpha < score < beta:
+                    score = -self._pvs(board, new_depth, -beta, -alpha, opp, me, 1, False, idx)
+            self._unmake(board, r, c)
+
+            # kết quả của nhánh bị cắt ngang không đáng tin
+            if self.control.stopped:
+                break
 
+            self.root_scores[(r, c)] = score
             if score > best_score:
                 best_score = score
                 best_move = (r, c)
+                if score > alpha:
+                    alpha = score
+                    self.pv[0] = [(r, c)] + self.pv[1]
+                    if alpha >= beta:
+                        break
 
-            alpha = max(alpha, best_score)
-            if beta <= alpha:
-                break
-
-        return int(best_score), best_move
+        return best_score, best_move
 
-    def _alphabeta(self, board, depth: int, alpha: float, beta: float, maximizing: bool, me: str, opp: str) -> int:
-        if self._time_up():
-            return self._evaluate(board, me, opp)
+    def _pvs(self, board, depth: int, alpha: int, beta: int, side: str, other: str, ply: int, on_pv: bool, last: int) -> int:
+        self.pv[ply] = []
+        if self.control.tick():
+            return self._evaluate(board, side, other)
 
-        # terminal
-        if self._check_win_board(board, me):
-            return WIN_SCORE
-        if self._check_win_board(board, opp):
+        # terminal (chỉ bên vừa đi mới có thể vừa tạo five)
+        if self._check_win_board(board, other):
             return -WIN_SCORE
+        if self._check_win_board(board, side):
+            return WIN_SCORE
 
-        if depth <= 0:
-            return self._evaluate(board, me, opp)
+        # transposition table
+        key = board.hash ^ (TT_SIDE_KEY if side == self.symbol else 0)
+        tt_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            e_depth, e_score, e_flag, e_move = entry
+            if e_depth >= depth and (
+                e_flag == TT_EXACT
+                or (e_flag == TT_LOWER and e_score >= beta)
+                or (e_flag == TT_UPPER and e_score <= alpha)
+            ):
+                self.tt.record_cutoff()
+                return e_score
+            if e_move != NO_MOVE:
+                tt_move = divmod(e_move, board.cols)
+
+        # đối thủ vừa tạo four → chỉ còn nước chặn (hoặc tự thắng trước)
+        blocks = None
+        if last >= 0:
+            lr, lc = divmod(last, board.cols)
+            blocks = threat_cells_through(board, lr, lc, other, 4)
+            if blocks:
+                if threat_cells(board, side, 4):
+                    return WIN_SCORE
+                if len(blocks) >= 2:
+                    return -WIN_SCORE
+                # extension: nước đỡ four ở chân trời vẫn được đọc
+                if depth <= 0 and ply < self.ply_limit:
+                    depth = 1
+
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            v = self._evaluate(board, side, other)
+            self.tt.store(key, 0, v, TT_EXACT)
+            return v
+
+        pv_move = self.prev_pv[ply] if on_pv and ply < len(self.prev_pv) else None
+        forcing: set = set()
+        if blocks:
+            moves = list(blocks)
+        else:
+            moves = self._staged_moves(board, side, other, ply, last, [pv_move, tt_move], forcing)
 
-        moves = self._generate_candidates(board, me, opp)
-        if not moves:
-            return self._evaluate(board, me, opp)
+        alpha_orig = alpha
+        best = -SCORE_INF
+        best_move = None
+        searched = 0
 
-        moves = self._order_moves(board, moves, me, opp)
+        for r, c in moves:
+            if self.control.stopped:
+                break
+            ext = self._extension(board, r, c, side, ply)
+            if not self._make(board, r, c, side):
+                continue
 
-        if maximizing:
-            v = -math.inf
-            for r, c in moves:
-                if self._time_up():
-                    break
-                if board.grid[r][c] is not None:
-                    continue
-                board.grid[r][c] = me
-                score = self._alphabeta(board, depth - 1, alpha, beta, False, me, opp)
-                board.grid[r][c] = None
-                v = max(v, score)
-                alpha = max(alpha, v)
-                if beta <= alpha:
-                    break
+            idx = r * board.cols + c
+            new_depth = depth - 1 + ext
+            searched += 1
+            if best_move is None:
+                child_pv = on_pv and (r, c) == pv_move
+                score = -self._pvs(board, new_depth, -beta, -alpha, other, side, ply + 1, child_pv, idx)
+            else:
+                score = alpha + 1
+                # LMR: nước yên lặng xếp cuối đọc nông hơn, chỉ đọc lại khi vượt alpha
+                if (
+                    not ext and not blocks
+                    and depth >= HARD_LMR_MIN_DEPTH
+                    and searched > HARD_LMR_MIN_MOVES
+                    and (r, c) not in forcing
+                ):
+                    reduce = 2 if searched > HARD_LMR_LATE_MOVES else 1
+                    score = -self._pvs(board, new_depth - reduce, -alpha - 1, -alpha, other, side, ply + 1, False, idx)
+                if score > alpha:
+                    # null window: chỉ cần biết có vượt alpha hay không
+                    score = -self._pvs(board, new_depth, -alpha - 1, -alpha, other, side, ply + 1, False, idx)
+                    if alpha < score < beta:
+                        score = -self._pvs(board, new_depth, -beta, -alpha, other, side, ply + 1, False, idx)
+            self._unmake(board, r, c)
+
+            if score > best:
+                best = score
+                best_move = (r, c)
+                if score > alpha:
+                    alpha = score
+                    self.pv[ply] = [(r, c)] + self.pv[ply + 1]
+                    if alpha >= beta:
+                        if (r, c) not in forcing:
+                            self._record_cutoff(board, (r, c), side, ply, last, depth)
+                        break
+
+        if best_move is None:
+            return self._evaluate(board, side, other)
+
+        # kết quả dở dang do hết giờ thì không lưu
+        if not self.control.stopped:
+            if best <= alpha_orig:
+                flag = TT_UPPER
+            elif best >= beta:
+                flag = TT_LOWER
+            else:
+                flag = TT_EXACT
+            self.tt.store(key, depth, best, flag, best_move[0] * board.cols + best_move[1])
 
-            if v == math.inf or v == -math.inf:
-                return self._evaluate(board, me, opp)
-            return int(v)
+        return best
 
-        else:
-            v = math.inf
-            for r, c in moves:
-                if self._time_up():
-                    break
-                if board.grid[r][c] is not None:
-                    continue
-                board.grid[r][c] = opp
-                score = self._alphabeta(board, depth - 1, alpha, beta, True, me, opp)
-                board.grid[r][c] = None
-                v = min(v, score)
-                beta = min(beta, v)
-                if beta <= alpha:
-                    break
+    # MAKE / UNMAKE (search)
+    def _make(self, board, r: int, c: int, sym: str) -> bool:
+        if not board.place(r, c, sym):
+            return False
+        self.evaluator.update(board, r, c)
+        return True
 
-            if v == math.inf or v == -math.inf:
-                return self._evaluate(board, me, opp)
-            return int(v)
+    def _unmake(self, board, r: int, c: int) -> None:
+        board.remove(r, c)
+        self.evaluator.update(board, r, c)
 
     # EVALUATION
     def _evaluate(self, board, me: str, opp: str) -> int:
 
         #ưu tiên đúng threat:mpen4 > closed4 > double3 > open3 > open2...
-        return self._pattern_score(board, me) - self._pattern_score(board, opp)
-
-    def _pattern_score(self, board, sym: str) -> int:
-        total = 0
-        for r in range(board.rows):
-            for c in range(board.cols):
-                if board.grid[r][c] != sym:
-                    continue
-                for dr, dc in DIRECTIONS:
-                    # chỉ tính nếu là đầu chuỗi theo hướng
-                    pr, pc = r - dr, c - dc
-                    if board.is_inside(pr, pc) and board.grid[pr][pc] == sym:
-                        continue
-
-                    cnt, open_ends = self._count_chain_forward(board, r, c, dr, dc, sym)
-
-                    if cnt >= 5:
-                        total += 200_000
-                    elif cnt == 4 and open_ends == 2:
-                        total += 35_000
-                    elif cnt == 4 and open_ends == 1:
-                        total += 8_000
-                    elif cnt == 3 and open_ends == 2:
-                        total += 2_500
-                    elif cnt == 3 and open_ends == 1:
-                        total += 700
-                    elif cnt == 2 and open_ends == 2:
-                        total += 250
-        return total
+        # điểm từng đường được cập nhật dần trong _make/_unmake → O(1)
+        return self.evaluator.score(me, opp)
 
     # MOVE GENERATION + ORDER
     def _generate_candidates(self, board, me: str, opp: str) -> List[Tuple[int, int]]:
+        return [(r, c) for _, r, c in self._scored_candidates(board, me, opp)]
+
+    def _scored_candidates(self, board, me: str, opp: str) -> List[Tuple[int, int, int]]:
+        #[(quick_score, r, c)] giảm dần, tối đa cand_limit ô – lần chấm tĩnh duy nhất mỗi nút
         cands = self._near_candidates(board, radius=self.near_radius)
         if not cands:
-            return [self._first_empty(board)]
+            r, c = self._first_empty(board)
+            return [(0, r, c)]
 
         scored = []
         for r, c in cands:
@@ -320,7 +596,81 @@ class AIHard(AIBase):
             scored.append((self._quick_score(board, r, c, me, opp), r, c))
 
         scored.sort(reverse=True, key=lambda x: x[0])
-        return [(r, c) for _, r, c in scored[: self.cand_limit]]
+        return scored[: self.cand_limit]
+
+    def _staged_moves(self, board, side: str, other: str, ply: int, last: int,
+                      first: List[Optional[Tuple[int, int]]], forcing: set):
+        """
+        Sinh nước theo từng đợt, chỉ chấm tĩnh khi các heuristic đã hết nước để đề xuất:
+        1) first (PV, TT)  2) killer của ply, counter-move của nước vừa đi
+        3) _scored_candidates: nước ép (điểm >= HARD_FORCING_SCORE, giữ thứ tự tĩnh,
+           ghi vào forcing) rồi nước yên lặng theo history (hoà thì giữ thứ tự tĩnh).
+        Cắt beta ở đợt 1-2 → không tốn lần chấm tĩnh nào.
+        """
+        cols = board.cols
+        tried: List[Tuple[int, int]] = []
+        for m in first:
+            if m is not None and m not in tried and board.grid[m[0]][m[1]] is None:
+                tried.append(m)
+                yield m
+
+        counter = self.counter_moves[side][last] if last >= 0 else NO_MOVE
+        hints = self.killers[ply] + [divmod(counter, cols) if counter != NO_MOVE else None]
+        for m in hints:
+            if m is not None and m not in tried and board.is_near(m[0], m[1], self.near_radius):
+                tried.append(m)
+                yield m
+
+        quiet: List[Tuple[int, int]] = []
+        for sc, r, c in self._scored_candidates(board, side, other):
+            if sc < HARD_FORCING_SCORE:
+                quiet.append((r, c))
+                continue
+            forcing.add((r, c))
+            if (r, c) not in tried:
+                yield (r, c)
+
+        hist = self.history[side]
+        quiet.sort(key=lambda m: -hist[m[0] * cols + m[1]])
+        for m in quiet:
+            if m not in tried:
+                yield m
+
+    def _extension(self, board, r: int, c: int, side: str, ply: int) -> int:
+        #Nước ép (tạo four / open-four / open-three) được đọc sâu thêm 1 ply
+        if ply >= self.ply_limit:
+            return 0
+        threats = threat_classes(board, r, c, side)
+        if OPEN_FOUR in threats or self._has_four(threats):
+            return 1
+        # open-three: double-three luôn kéo dài, three đơn chỉ ở phần đầu cây
+        if self._three_count(threats) >= 2 or (OPEN_THREE in threats and ply < self.three_ply_limit):
+            return 1
+        return 0
+
+    def _record_cutoff(self, board, move: Tuple[int, int], side: str, ply: int, last: int, depth: int) -> None:
+        #Nước không ép gây beta cutoff → killer, history, counter-move
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+        idx = move[0] * board.cols + move[1]
+        self.history[side][idx] += depth * depth
+        if last >= 0:
+            self.counter_moves[side][last] = idx
+
+    def _reset_heuristics(self, board) -> None:
+        #Đầu mỗi get_move: killer theo ply không còn đúng, history giảm một nửa (vẫn còn giá trị)
+        cells = board.rows * board.cols
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        for sym in (SYMBOL_X, SYMBOL_O):
+            hist = self.history.get(sym)
+            if hist is None or len(hist) != cells:
+                self.history[sym] = [0] * cells
+                self.counter_moves[sym] = array("h", [NO_MOVE]) * cells
+            else:
+                self.history[sym] = [v >> 1 for v in hist]
 
     def _order_moves(self, board, moves: List[Tuple[int, int]], me: str, opp: str) -> List[Tuple[int, int]]:
         scored = []
@@ -335,199 +685,66 @@ class AIHard(AIBase):
         score = 0
         score += self._center_bonus(board, r, c)
 
-        # thử me
-        board.grid[r][c] = me
-        if self._check_win_from(board, r, c, me):
-            board.grid[r][c] = None
+        # thử me: 4 cửa sổ → 4 lần tra bảng (coi (r, c) như đã đặt quân)
+        codes = window_codes(board, r, c, me)
+        threats = [THREAT_TABLE[x] for x in codes]
+        if FIVE in threats:
             return 9_000_000
-        if self._is_open_four(board, r, c, me):
+        if OPEN_FOUR in threats:
             score += 600_000
-        if self._is_closed_four(board, r, c, me):
+        if self._has_four(threats):
             score += 120_000
-        if self._count_open_three_dirs(board, r, c, me) >= 2:
+        if self._three_count(threats) >= 2:
             score += 80_000
-        score += self._local_chain_bonus(board, r, c, me) * 10
-        board.grid[r][c] = None
+        score += sum(CHAIN_BONUS[x] for x in codes) * 10
 
         # thử opp (để ưu tiên chặn)
-        board.grid[r][c] = opp
-        if self._check_win_from(board, r, c, opp):
-            board.grid[r][c] = None
+        codes = window_codes(board, r, c, opp)
+        threats = [THREAT_TABLE[x] for x in codes]
+        if FIVE in threats:
             return 8_500_000
-        if self._is_open_four(board, r, c, opp):
+        if OPEN_FOUR in threats:
             score += 550_000
-        if self._is_closed_four(board, r, c, opp):
+        if self._has_four(threats):
             score += 110_000
-        if self._count_open_three_dirs(board, r, c, opp) >= 2:
+        if self._three_count(threats) >= 2:
             score += 70_000
-        score += self._local_chain_bonus(board, r, c, opp) * 8
-        board.grid[r][c] = None
+        score += sum(CHAIN_BONUS[x] for x in codes) * 8
 
         return int(score)
 
-    def _local_chain_bonus(self, board, r: int, c: int, sym: str) -> int:
-        b = 0
-        for dr, dc in DIRECTIONS:
-            cnt, oe = self._count_chain_around(board, r, c, dr, dc, sym)
-            b += cnt * cnt * (3 if oe == 2 else 1)
-        return b
-
-    # THREAT FINDERS (rules)
+    # THREAT FINDERS (rules) – tra board.threats(), cập nhật dần theo các đường qua ô vừa đổi
     def _find_winning_move(self, board, sym: str) -> Optional[Tuple[int, int]]:
-        # chỉ thử vùng gần để nhanh
-        cands = self._near_candidates(board, radius=2)
-        if not cands:
-            cands = [(r, c) for r in range(board.rows) for c in range(board.cols) if board.grid[r][c] is None]
-
-        for r, c in cands:
-            if board.grid[r][c] is not None:
-                continue
-            board.grid[r][c] = sym
-            ok = self._check_win_from(board, r, c, sym)
-            board.grid[r][c] = None
-            if ok:
-                return (r, c)
-        return None
+        return board.threats().five(sym)
 
     def _find_open_four_move(self, board, sym: str) -> Optional[Tuple[int, int]]:
-        for r, c in self._near_candidates(board, radius=2):
-            if board.grid[r][c] is not None:
-                continue
-            board.grid[r][c] = sym
-            ok = self._is_open_four(board, r, c, sym)
-            board.grid[r][c] = None
-            if ok:
-                return (r, c)
-        return None
+        return board.threats().open_four(sym)
 
     def _find_closed_four_move(self, board, sym: str) -> Optional[Tuple[int, int]]:
-        for r, c in self._near_candidates(board, radius=2):
-            if board.grid[r][c] is not None:
-                continue
-            board.grid[r][c] = sym
-            ok = self._is_closed_four(board, r, c, sym)
-            board.grid[r][c] = None
-            if ok:
-                return (r, c)
-        return None
+        # gồm cả four gãy: XX_XX, X_XXX
+        return board.threats().four(sym)
 
     def _find_double_open_three_move(self, board, sym: str) -> Optional[Tuple[int, int]]:
-        best = None
-        best_k = 0
-        for r, c in self._near_candidates(board, radius=2):
-            if board.grid[r][c] is not None:
-                continue
-            board.grid[r][c] = sym
-            k = self._count_open_three_dirs(board, r, c, sym)
-            board.grid[r][c] = None
-            if k >= 2 and k > best_k:
-                best_k = k
-                best = (r, c)
-        return best
+        return board.threats().double_three(sym)
 
-    # PATTERN CHECKS
-    def _is_open_four(self, board, r: int, c: int, sym: str) -> bool:
-        for dr, dc in DIRECTIONS:
-            cnt, oe = self._count_chain_around(board, r, c, dr, dc, sym)
-            if cnt == 4 and oe == 2:
-                return True
-        return False
-
-    def _is_closed_four(self, board, r: int, c: int, sym: str) -> bool:
-        for dr, dc in DIRECTIONS:
-            cnt, oe = self._count_chain_around(board, r, c, dr, dc, sym)
-            if cnt == 4 and oe == 1:
-                return True
-        return False
-
-    def _count_open_three_dirs(self, board, r: int, c: int, sym: str) -> int:
-        k = 0
-        for dr, dc in DIRECTIONS:
-            cnt, oe = self._count_chain_around(board, r, c, dr, dc, sym)
-            if cnt == 3 and oe == 2:
-                k += 1
-        return k
+    # PATTERN CHECKS (tra bảng – xem src/core/patterns.py)
+    @staticmethod
+    def _has_four(threats: List[int]) -> bool:
+        return any(t in FOURS for t in threats)
+
+    @staticmethod
+    def _three_count(threats: List[int]) -> int:
+        return sum(1 for t in threats if t in THREES)
 
 
     # WIN CHECKS
     def _check_win_board(self, board, sym: str) -> bool:
-        for r in range(board.rows):
-            for c in range(board.cols):
-                if board.grid[r][c] == sym and self._check_win_from(board, r, c, sym):
-                    return True
-        return False
-
-    def _check_win_from(self, board, r: int, c: int, sym: str) -> bool:
-        for dr, dc in DIRECTIONS:
-            cnt = 1
-            cnt += self._count_dir(board, r, c, dr, dc, sym)
-            cnt += self._count_dir(board, r, c, -dr, -dc, sym)
-            if cnt >= 5:
-                return True
-        return False
-
-    def _count_dir(self, board, r: int, c: int, dr: int, dc: int, sym: str) -> int:
-        cnt = 0
-        rr, cc = r + dr, c + dc
-        while board.is_inside(rr, cc) and board.grid[rr][cc] == sym:
-            cnt += 1
-            rr += dr
-            cc += dc
-        return cnt
-
-    # CHAIN COUNTS
-    def _count_chain_around(self, board, r: int, c: int, dr: int, dc: int, sym: str) -> Tuple[int, int]:
-        cnt = 1
-
-        rr, cc = r + dr, c + dc
-        while board.is_inside(rr, cc) and board.grid[rr][cc] == sym:
-            cnt += 1
-            rr += dr
-            cc += dc
-        end1 = board.is_inside(rr, cc) and board.grid[rr][cc] is None
-
-        rr, cc = r - dr, c - dc
-        while board.is_inside(rr, cc) and board.grid[rr][cc] == sym:
-            cnt += 1
-            rr -= dr
-            cc -= dc
-        end2 = board.is_inside(rr, cc) and board.grid[rr][cc] is None
-
-        oe = (1 if end1 else 0) + (1 if end2 else 0)
-        return cnt, oe
-
-    def _count_chain_forward(self, board, r: int, c: int, dr: int, dc: int, sym: str) -> Tuple[int, int]:
-        # assumes (r,c) is sym and is "start" for this direction
-        cnt = 0
-        rr, cc = r, c
-        while board.is_inside(rr, cc) and board.grid[rr][cc] == sym:
-            cnt += 1
-            rr += dr
-            cc += dc
-
-        open_ends = 0
-        if board.is_inside(rr, cc) and board.grid[rr][cc] is None:
-            open_ends += 1
-
-        pr, pc = r - dr, c - dc
-        if board.is_inside(pr, pc) and board.grid[pr][pc] is None:
-            open_ends += 1
-
-        return cnt, open_ends
+        return board.has_five(sym)
 
     # CANDIDATES
     def _near_candidates(self, board, radius: int = 2) -> List[Tuple[int, int]]:
-        s: Set[Tuple[int, int]] = set()
-        for r in range(board.rows):
-            for c in range(board.cols):
-                if board.grid[r][c] is None:
-                    continue
-                for dr in range(-radius, radius + 1):
-                    for dc in range(-radius, radius + 1):
-                        rr, cc = r + dr, c + dc
-                        if board.is_inside(rr, cc) and board.grid[rr][cc] is None:
-                            s.add((rr, cc))
-        return list(s)
+        # Board tự duy trì frontier trong place/remove → O(frontier) thay vì quét cả bàn
+        return list(board.frontier(radius))
 
     def _center_bonus(self, board, r: int, c: int) -> int:
         cr, cc = board.rows // 2, board.cols // 2
@@ -540,14 +757,69 @@ class AIHard(AIBase):
                     return (r, c)
         return (0, 0)
 
-    @staticmethod
-    def _has_any_piece(board) -> bool:
-        for r in range(board.rows):
-            for c in range(board.cols):
-                if board.grid[r][c] is not None:
-                    return True
-        return False
-
-    # TIME
-    def _time_up(self) -> bool:
-        return (time.time() - self.start_time) >= float(HARD_TIME_LIMIT)
+    # PONDER
+    def ponder(self, board) -> None:
+        """
+        Gọi ngay sau khi nước của AI đã đặt lên board (lượt đối thủ).
+        Luồng nền đặt nước đáp dự đoán lên 1 bản sao bàn cờ rồi chạy _think như get_move,
+        tối đa HARD_PONDER_MAX_TIME giây; TT, killer, history nóng sẵn cho nước sau.
+        """
+        self.stop_pondering()
+        if not self.ponder_enabled:
+            return
+
+        me, opp = self.symbol, self.get_opponent_symbol()
+        reply = self.expected_reply
+        if reply is None or board.grid[reply[0]][reply[1]] is not None:
+            cands = self._generate_candidates(board, opp, me)
+            if not cands or board.grid[cands[0][0]][cands[0][1]] is not None:
+                return
+            reply = cands[0]
+
+        position = board.copy()
+        position.place(reply[0], reply[1], opp)
+        if position.is_win(reply[0], reply[1], opp) or position.is_full():
+            return
+
+        self.ponder_hash = position.hash
+        self.ponder_result = None
+        self.start_workers()
+        # start trước khi chạy luồng → stop_pondering luôn huỷ được, kể cả khi luồng chưa kịp chạy
+        self.control.start(HARD_PONDER_MAX_TIME, HARD_PONDER_MAX_TIME)
+        self.tt.new_search()
+        self.ponder_thread = threading.Thread(
+            target=self._ponder_main, args=(position,), name="AIHard-ponder", daemon=True
+        )
+        self.ponder_thread.start()
+
+    def _ponder_main(self, board) -> None:
+        move = self._think(board)
+        final = not self.control.stopped
+        # bị huỷ giữa các rule → chưa có gì dùng lại được ngoài TT
+        if final or self.rules_checked:
+            self.ponder_result = (move, self.control.elapsed(), final, list(self.completed))
+
+    def stop_pondering(self) -> None:
+        #Huỷ ponder đang chạy (Undo / Redo / Restart / Home, hoặc đầu get_move) và chờ luồng dừng
+        thread = self.ponder_thread
+        if thread is None:
+            return
+        self.control.cancel()
+        thread.join()
+        self.ponder_thread = None
+
+    def _take_ponder(self, board):
+        #Kết quả ponder nếu thế cờ hiện tại đúng là thế đã ponder, ngược lại None
+        self.stop_pondering()
+        result, self.ponder_result = self.ponder_result, None
+        if result is None or board.hash != self.ponder_hash:
+            return None
+        move = result[0]
+        if board.grid[move[0]][move[1]] is not None:
+            return None
+        return result
+
+    # CONTROL
+    def cancel(self) -> None:
+        #Huỷ lượt tìm kiếm đang chạy (gọi từ luồng khác), get_move trả về nước tốt nhất đã có
+        self.control.cancel()
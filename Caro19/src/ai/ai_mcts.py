@@ -0,0 +1,372 @@
+"""
+MCTS AI cho Caro19
+Monte Carlo Tree Search (UCT) – so sánh với alpha-beta của AIHard ở cùng thời gian.
+
+- Cây lưu trong các mảng `array` cấp phát sẵn (capacity nút), con của 1 nút nằm liền nhau
+- Mở rộng: ứng viên quanh frontier, xếp theo prior từ bảng pattern (THREAT_TABLE);
+  có ô thắng ngay / phải chặn thì chỉ giữ các ô đó
+- Progressive widening: nút có n lượt thăm chỉ xét WIDEN_BASE + WIDEN_FACTOR * n^WIDEN_POWER con đầu
+- Playout có hướng dẫn: thắng / chặn five theo tập ô five (gốc lấy từ board.threats(),
+  sau đó cập nhật dần bằng threat_cells_through),
+  còn lại chọn ô tốt nhất trong vài ô lấy mẫu quanh 2 nước cuối; playout dài quá thì chấm
+  bằng PatternEvaluator
+- Giữ cây giữa 2 nước: cây con của (nước mình, nước đáp của đối thủ) thành gốc mới
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.ai.ai_base import AIBase
+from src.ai.evaluator import PatternEvaluator
+from src.core.patterns import THREAT_TABLE, window_codes, threat_cells_through
+from src.ai.search_control import SearchController
+from config.ai_config import (
+    MCTS_MOVE_TIME,
+    MCTS_ITERATIONS,
+    MCTS_MAX_NODES,
+    MCTS_MAX_CHILDREN,
+    MCTS_RADIUS,
+    MCTS_EXPLORATION,
+    MCTS_PRIOR_WEIGHT,
+    MCTS_WIDEN_BASE,
+    MCTS_WIDEN_FACTOR,
+    MCTS_WIDEN_POWER,
+    MCTS_PLAYOUT_DEPTH,
+    MCTS_PLAYOUT_SAMPLES,
+    MCTS_EVAL_SCALE,
+    MCTS_CHECK_ITERATIONS,
+)
+
+Move = Tuple[int, int]
+
+NO_MOVE = -1
+
+# Trọng số theo threat class (NONE … FIVE) khi chấm ô: tấn công / phòng thủ
+ATTACK_WEIGHTS = (0, 1, 4, 10, 30, 40, 120, 2000)
+DEFENSE_WEIGHTS = (0, 1, 3, 8, 24, 30, 100, 1500)
+
+# Ô lấy mẫu cho playout: bán kính 2 quanh nước vừa đi
+NEIGHBOURS = [(dr, dc) for dr in range(-2, 3) for dc in range(-2, 3) if dr or dc]
+
+
+class AIMcts(AIBase):
+    """
+    MCTS (UCT + progressive widening + prior)
+    get_move: tìm tới khi hết MCTS_ITERATIONS lượt hoặc hết ngân sách thời gian,
+    chọn nước gốc được thăm nhiều nhất (robust child).
+    """
+
+    def __init__(self, symbol: str, move_time: Optional[float] = MCTS_MOVE_TIME,
+                 iterations: int = MCTS_ITERATIONS, capacity: int = MCTS_MAX_NODES):
+        super().__init__(symbol)
+        self.move_time = move_time
+        self.iterations = max(1, int(iterations))
+        self.capacity = max(2, int(capacity))
+        self.control = SearchController(check_every=MCTS_CHECK_ITERATIONS)
+        self.evaluator = PatternEvaluator()
+
+        # NODE STORE: value = tổng kết quả theo góc nhìn bên vừa đi nước move của nút
+        cap = self.capacity
+        self.parent = array("i", bytes(4 * cap))
+        self.first = array("i", bytes(4 * cap))
+        self.count = array("i", bytes(4 * cap))
+        self.move = array("i", bytes(4 * cap))
+        self.visits = array("i", bytes(4 * cap))
+        self.value = array("d", bytes(8 * cap))
+        self.prior = array("d", bytes(8 * cap))
+        self.terminal = array("b", bytes(cap))     # 1 = nước move của nút tạo five
+        self.size = 0
+
+        # giữ cây: thế cờ ở gốc + nước đã chọn
+        self.root_hash: Optional[int] = None
+        self.played = NO_MOVE
+        self.fives: Dict[str, Set[int]] = {}
+        self.iterations_done = 0
+
+    # PUBLIC
+    def get_move(self, board) -> Move:
+        stones = board.stone_count()
+        # MCTS dừng được bất cứ lúc nào → chỉ cần 1 hạn (soft), không có vòng lặp dở dang
+        soft, _ = self.control.allocate(self.time_left, stones, self.move_time)
+        self.control.start(soft, soft)
+        me, opp = self.symbol, self.get_opponent_symbol()
+
+        if not stones:
+            return board.rows // 2, board.cols // 2
+
+        if not self._reuse_tree(board, me, opp):
+            self._new_tree()
+        cols = board.cols
+        threats = board.threats()
+        self.fives = {sym: {r * cols + c for r, c in threats.fives[sym]} for sym in (me, opp)}
+        if not self.count[0]:
+            self._expand(board, 0, me, opp, self.fives)
+        if not self.count[0]:
+            return self._first_empty(board)
+
+        self.evaluator.rebuild(board)
+        self.iterations_done = 0
+        if self.count[0] > 1:
+            while self.iterations_done < self.iterations and not self.control.tick():
+                self._iterate(board, me, opp)
+                self.iterations_done += 1
+
+        best = self._best_child(0)
+        self.root_hash = board.hash
+        self.played = self.move[best]
+        return divmod(self.move[best], board.cols)
+
+    @property
+    def nodes(self) -> int:
+        return self.size
+
+    def cancel(self) -> None:
+        #Dừng vòng lặp ở lần kiểm tra kế tiếp, get_move trả về con tốt nhất hiện có
+        self.control.cancel()
+
+    # TREE
+    def _new_tree(self) -> None:
+        self.size = 0
+        self._alloc(1, NO_MOVE)
+
+    def _alloc(self, n: int, parent: int) -> int:
+        #Cấp n nút liền nhau, trả về chỉ số đầu (hoặc -1 nếu hết chỗ)
+        start = self.size
+        if start + n > self.capacity:
+            return -1
+        for i in range(start, start + n):
+            self.parent[i] = parent
+            self.first[i] = 0
+            self.count[i] = 0
+            self.move[i] = NO_MOVE
+            self.visits[i] = 0
+            self.value[i] = 0.0
+            self.prior[i] = 0.0
+            self.terminal[i] = 0
+        self.size = start + n
+        return start
+
+    def _reuse_tree(self, board, me: str, opp: str) -> bool:
+        #Gốc mới = cháu của gốc cũ theo (nước mình đã đi, nước đối thủ vừa đáp)
+        if self.root_hash is None or not self.size or self.played == NO_MOVE:
+            return False
+        zobrist = board.zobrist
+        mine = self._find_child(0, self.played)
+        if mine < 0:
+            return False
+        expected = self.root_hash ^ zobrist[me][self.played]
+        for g in range(self.first[mine], self.first[mine] + self.count[mine]):
+            if expected ^ zobrist[opp][self.move[g]] == board.hash:
+                self._reroot(g)
+                return True
+        return False
+
+    def _find_child(self, node: int, move: int) -> int:
+        for c in range(self.first[node], self.first[node] + self.count[node]):
+            if self.move[c] == move:
+                return c
+        return -1
+
+    def _reroot(self, root: int) -> None:
+        #Chép cây con của root lên đầu mảng (duyệt BFS → con vẫn nằm liền nhau), bỏ phần còn lại
+        fields = (self.move, self.visits, self.value, self.prior, self.terminal, self.first, self.count)
+        queue = [root]
+        parents = [NO_MOVE]
+        i = 0
+        while i < len(queue):
+            node = queue[i]
+            for c in range(self.first[node], self.first[node] + self.count[node]):
+                queue.append(c)
+                parents.append(i)
+            i += 1
+
+        # đọc hết trước khi ghi: chỉ số mới có thể trùng chỉ số cũ của nút khác
+        rows = [tuple(f[old] for f in fields) for old in queue]
+        index = {old: new for new, old in enumerate(queue)}
+        for new, row in enumerate(rows):
+            for f, v in zip(fields, row):
+                f[new] = v
+            self.first[new] = index[row[5]] if row[6] else 0
+            self.parent[new] = parents[new]
+        self.size = len(queue)
+
+    def _expand(self, board, node: int, side: str, other: str, fives: Dict[str, Set[int]]) -> None:
+        """
+        Sinh con cho node (lượt side), xếp prior giảm dần, tối đa MCTS_MAX_CHILDREN con.
+        Có ô five của mình → chỉ ô đó; đối thủ có ô five → chỉ các ô chặn.
+        """
+        cols = board.cols
+        if fives[side]:
+            cands = [(1.0, min(fives[side]))]
+        elif fives[other]:
+            cands = [(1.0, idx) for idx in sorted(fives[other])]
+        else:
+            scored = [
+                (self._cell_score(board, r, c, side, other), r * cols + c)
+                for r, c in board.frontier(MCTS_RADIUS)
+            ]
+            if not scored:
+                return
+            scored.sort(reverse=True)
+            top = scored[0][0] or 1
+            cands = [(s / top, idx) for s, idx in scored[:MCTS_MAX_CHILDREN]]
+
+        start = self._alloc(len(cands), node)
+        if start < 0:
+            return
+        for i, (p, idx) in enumerate(cands):
+            self.move[start + i] = idx
+            self.prior[start + i] = p
+            self.terminal[start + i] = 1 if idx in fives[side] else 0
+        self.first[node] = start
+        self.count[node] = len(cands)
+
+    def _select(self, node: int) -> int:
+        #UCT + prior bias trên các con đã mở (progressive widening)
+        n = self.visits[node]
+        allowed = min(self.count[node], MCTS_WIDEN_BASE + int(MCTS_WIDEN_FACTOR * n ** MCTS_WIDEN_POWER))
+        log_n = math.log(n + 1)
+        best, best_score = -1, -math.inf
+        for c in range(self.first[node], self.first[node] + allowed):
+            if self.terminal[c]:
+                return c
+            v = self.visits[c]
+            if v == 0:
+                score = 1e9 + self.prior[c]
+            else:
+                score = (
+                    self.value[c] / v
+                    + MCTS_EXPLORATION * math.sqrt(log_n / v)
+                    + MCTS_PRIOR_WEIGHT * self.prior[c] / (1 + v)
+                )
+            if score > best_score:
+                best, best_score = c, score
+        return best
+
+    def _best_child(self, node: int) -> int:
+        best = self.first[node]
+        for c in range(self.first[node], self.first[node] + self.count[node]):
+            if self.terminal[c]:
+                return c
+            if (self.visits[c], self.prior[c]) > (self.visits[best], self.prior[best]):
+                best = c
+        return best
+
+    # ITERATION
+    def _iterate(self, board, me: str, opp: str) -> None:
+        fives = {me: set(self.fives[me]), opp: set(self.fives[opp])}
+        placed: List[int] = []
+        path = [0]
+        node, side, other = 0, me, opp
+        winner = None
+
+        # 1) SELECTION (+ 2) EXPANSION khi tới lá đã được thăm)
+        while True:
+            if not self.count[node]:
+                if self.visits[node] == 0 and node != 0:
+                    break
+                self._expand(board, node, side, other, fives)
+                if not self.count[node]:
+                    break
+            node = self._select(node)
+            path.append(node)
+            self._play(board, self.move[node], side, other, fives, placed)
+            if self.terminal[node]:
+                winner = side
+                break
+            side, other = other, side
+
+        # 3) PLAYOUT
+        if winner is None:
+            result = self._playout(board, side, other, me, opp, fives, placed)
+        else:
+            result = 1.0 if winner == me else 0.0
+
+        # 4) BACKPROPAGATION – nút ở độ sâu lẻ là nước của me
+        self.visits[0] += 1
+        for depth in range(1, len(path)):
+            n = path[depth]
+            self.visits[n] += 1
+            self.value[n] += result if depth % 2 else 1.0 - result
+
+        for idx in reversed(placed):
+            r, c = divmod(idx, board.cols)
+            board.remove(r, c)
+            self.evaluator.update(board, r, c)
+
+    def _play(self, board, idx: int, side: str, other: str, fives: Dict[str, Set[int]], placed: List[int]) -> None:
+        #Đặt quân + cập nhật tập ô five của 2 bên (chỉ các đường qua ô vừa đặt)
+        r, c = divmod(idx, board.cols)
+        board.place(r, c, side)
+        self.evaluator.update(board, r, c)
+        placed.append(idx)
+        fives[side].discard(idx)
+        fives[other].discard(idx)
+        for (fr, fc) in threat_cells_through(board, r, c, side, 4):
+            fives[side].add(fr * board.cols + fc)
+
+    def _playout(self, board, side: str, other: str, me: str, opp: str,
+                 fives: Dict[str, Set[int]], placed: List[int]) -> float:
+        #Kết quả theo góc nhìn me: 1 thắng, 0 thua, giữa = chấm tĩnh khi dừng sớm
+        cols = board.cols
+        recent = [divmod(idx, cols) for idx in placed[-2:]]
+        for _ in range(MCTS_PLAYOUT_DEPTH):
+            if fives[side]:
+                return 1.0 if side == me else 0.0
+            if len(fives[other]) >= 2:
+                return 1.0 if other == me else 0.0
+
+            if fives[other]:
+                idx = next(iter(fives[other]))
+            else:
+                move = self._policy_move(board, side, other, recent)
+                if move is None:
+                    return 0.5
+                idx = move[0] * cols + move[1]
+
+            self._play(board, idx, side, other, fives, placed)
+            recent = [recent[-1], divmod(idx, cols)] if recent else [divmod(idx, cols)]
+            side, other = other, side
+
+        score = self.evaluator.score(me, opp)
+        return 1.0 / (1.0 + math.exp(-max(-50.0, min(50.0, score / MCTS_EVAL_SCALE))))
+
+    def _policy_move(self, board, side: str, other: str, recent: List[Move]) -> Optional[Move]:
+        #Ô tốt nhất trong MCTS_PLAYOUT_SAMPLES ô lấy mẫu quanh các nước cuối
+        grid = board.grid
+        best, best_score = None, -1.0
+        if recent:
+            for _ in range(MCTS_PLAYOUT_SAMPLES):
+                r0, c0 = random.choice(recent)
+                dr, dc = random.choice(NEIGHBOURS)
+                r, c = r0 + dr, c0 + dc
+                if not (0 <= r < board.rows and 0 <= c < board.cols) or grid[r][c] is not None:
+                    continue
+                score = self._cell_score(board, r, c, side, other) + random.random()
+                if score > best_score:
+                    best, best_score = (r, c), score
+        if best is None:
+            cells = list(board.frontier(1))
+            if not cells:
+                return None
+            best = random.choice(cells)
+        return best
+
+    # HELPERS
+    @staticmethod
+    def _cell_score(board, r: int, c: int, side: str, other: str) -> float:
+        attack = sum(ATTACK_WEIGHTS[THREAT_TABLE[x]] for x in window_codes(board, r, c, side))
+        defense = sum(DEFENSE_WEIGHTS[THREAT_TABLE[x]] for x in window_codes(board, r, c, other))
+        return float(attack + defense)
+
+    @staticmethod
+    def _first_empty(board) -> Move:
+        for r in range(board.rows):
+            for c in range(board.cols):
+                if board.grid[r][c] is None:
+                    return r, c
+        return 0, 0
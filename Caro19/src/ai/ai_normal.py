@@ -1,11 +1,13 @@
 
 import random
 from src.ai.ai_base import AIBase
+from src.ai import vector_eval
 
 from config.ai_config import (
     NORMAL_ATTACK_WEIGHT,
     NORMAL_DEFENSE_WEIGHT,
-    NORMAL_RANDOM_RATE
+    NORMAL_RANDOM_RATE,
+    NORMAL_USE_NUMPY
 )
 
 
@@ -21,6 +23,9 @@ class AINormal(AIBase):
 
         opponent = self.get_opponent_symbol()
 
+        if NORMAL_USE_NUMPY and vector_eval.HAS_NUMPY:
+            return self._vector_move(board, opponent)
+
         #  Thắng ngay nếu có thể
         win_move = self._find_winning_move(board, self.symbol)
         if win_move:
@@ -42,15 +47,8 @@ class AINormal(AIBase):
 
     # WIN / BLOCK
     def _find_winning_move(self, board, symbol):
-        for row in range(board.rows):
-            for col in range(board.cols):
-                if board.is_empty(row, col):
-                    board.grid[row][col] = symbol
-                    if board.check_win(row, col, symbol):
-                        board.grid[row][col] = None
-                        return row, col
-                    board.grid[row][col] = None
-        return None
+        # ô tạo five do board.threats() giữ sẵn (ô đầu tiên theo hàng → cột)
+        return board.threats().five(symbol)
 
     # HEURISTIC
     def _heuristic_move(self, board):
@@ -69,7 +67,9 @@ class AINormal(AIBase):
                         best_moves.append((row, col))
 
         if best_moves:
-            return random.choice(best_moves)
+            move = random.choice(best_moves)
+            self._report(1, move, best_score, [move], board.rows * board.cols - board.stone_count())
+            return move
 
         return self._random_move(board)
 
@@ -85,41 +85,46 @@ class AINormal(AIBase):
 
     def _count_max_chain(self, board, row, col, symbol):
         #Đếm chuỗi dài nhất nếu đặt symbol tại (row, col)
-        directions = [
-            (0, 1),
-            (1, 0),
-            (1, 1),
-            (1, -1),
-        ]
-
         max_count = 0
-        board.grid[row][col] = symbol
-
-        for dr, dc in directions:
-            count = 1
-            count += self._count_direction(board, row, col, dr, dc, symbol)
-            count += self._count_direction(board, row, col, -dr, -dc, symbol)
+        for d in range(4):
+            count, _ = board.chain_around(row, col, d, symbol)
             max_count = max(max_count, count)
 
-        board.grid[row][col] = None
         return max_count
 
-    def _count_direction(self, board, row, col, dr, dc, symbol):
-        r = row + dr
-        c = col + dc
-        count = 0
 
-        while (
-            0 <= r < board.rows
-            and 0 <= c < board.cols
-            and board.grid[r][c] == symbol
-        ):
-            count += 1
-            r += dr
-            c += dc
+    # NUMPY
+    def _vector_move(self, board, opponent):
+        """
+        Cùng chiến lược và cùng kết quả với đường vòng lặp,
+        nhưng độ dài chuỗi của mọi ô được tính 1 lần cho mỗi bên (vector_eval.chain_lengths)
+        """
+        np = vector_eval.np
+
+        #  Thắng ngay / chặn
+        for symbol in (self.symbol, opponent):
+            move = self._find_winning_move(board, symbol)
+            if move:
+                return move
+
+        empty = (vector_eval.stone_mask(board, None) == 1)
+        attack = vector_eval.chain_lengths(vector_eval.stone_mask(board, self.symbol))
+        defense = vector_eval.chain_lengths(vector_eval.stone_mask(board, opponent))
+        if not empty.any():
+            return self._random_move(board)
 
-        return count
+        # Đánh theo heuristic: arg-max 1 lượt, hoà điểm thì chọn ngẫu nhiên
+        score = attack * NORMAL_ATTACK_WEIGHT + defense * NORMAL_DEFENSE_WEIGHT
+        score = np.where(empty, score, -np.inf)
+        best_moves = np.flatnonzero(score == score.max())
+        best_move = divmod(int(random.choice(best_moves)), board.cols)
+        self._report(1, best_move, float(score.max()), [best_move], int(empty.sum()))
 
+        # Random nhẹ
+        if random.random() < NORMAL_RANDOM_RATE:
+            return self._random_move(board)
+
+        return best_move
 
     # RANDOM
     def _random_move(self, board):
@@ -0,0 +1,89 @@
+"""
+Incremental pattern evaluator cho AIHard
+Giữ điểm của từng đường (hàng / cột / 2 đường chéo) cho cả 2 bên.
+Sau mỗi make/unmake chỉ chấm lại 4 đường đi qua ô vừa đổi
+→ đánh giá ở lá là O(1) thay vì quét cả bàn.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from src.core.constants import SYMBOL_X, SYMBOL_O
+
+# RUN_SCORE[độ dài chuỗi][số đầu trống] (giống _pattern_score cũ)
+RUN_SCORE = [
+    [0, 0, 0],
+    [0, 0, 0],
+    [0, 0, 250],
+    [0, 700, 2_500],
+    [0, 8_000, 35_000],
+    [200_000, 200_000, 200_000],
+]
+
+
+def line_score(own: int, other: int, valid: int) -> int:
+    """
+    Tổng điểm các chuỗi liên tiếp của own trên một đường.
+    own / other / valid là mặt nạ bit theo pos trên đường.
+    """
+    empty = valid & ~(own | other)
+    total = 0
+    x = own
+    while x:
+        start = (x & -x).bit_length() - 1
+        y = x >> start
+        n = (y ^ (y + 1)).bit_length() - 1
+        end = start + n
+
+        open_ends = (empty >> end) & 1
+        if start:
+            open_ends += (empty >> (start - 1)) & 1
+
+        total += RUN_SCORE[n if n < 5 else 5][open_ends]
+        x &= ~(((1 << n) - 1) << start)
+    return total
+
+
+class PatternEvaluator:
+    """
+    Cách dùng:
+        ev.rebuild(board)                  # 1 lần trước khi tìm kiếm
+        board.place(r, c, sym); ev.update(board, r, c)
+        board.remove(r, c);     ev.update(board, r, c)
+        ev.score(me, opp)                  # O(1)
+    """
+
+    def __init__(self):
+        self.line_scores: Dict[str, List[List[int]]] = {}
+        self.totals: Dict[str, int] = {SYMBOL_X: 0, SYMBOL_O: 0}
+
+    def rebuild(self, board) -> None:
+        self.line_scores = {
+            sym: [[0] * n for n in board.line_counts]
+            for sym in (SYMBOL_X, SYMBOL_O)
+        }
+        self.totals = {SYMBOL_X: 0, SYMBOL_O: 0}
+
+        for d, n in enumerate(board.line_counts):
+            for line in range(n):
+                self._rescore(board, d, line)
+
+    def update(self, board, row: int, col: int) -> None:
+        #Gọi sau khi (row, col) vừa được đặt / gỡ quân
+        for d, (line, _) in enumerate(board.cell_lines[row * board.cols + col]):
+            self._rescore(board, d, line)
+
+    def _rescore(self, board, d: int, line: int) -> None:
+        x = board.line_mask(d, line, SYMBOL_X)
+        o = board.line_mask(d, line, SYMBOL_O)
+        valid = board.line_valid[d][line]
+
+        for sym, own, other in ((SYMBOL_X, x, o), (SYMBOL_O, o, x)):
+            scores = self.line_scores[sym][d]
+            new = line_score(own, other, valid) if own else 0
+            self.totals[sym] += new - scores[line]
+            scores[line] = new
+
+    def score(self, me: str, opp: str) -> int:
+        return self.totals[me] - self.totals[opp]
@@ -0,0 +1,290 @@
+"""
+Sách khai cuộc cho AIHard
+Khoá = hash của thế cờ chuẩn hoá (canonical): bất biến qua 8 phép đối xứng của bàn cờ
+và phép tịnh tiến → 1 entry dùng cho mọi vị trí / hướng của cùng 1 thế khai cuộc.
+
+- Quân được đổi sang màu tương đối (bên tới lượt / bên kia) → 1 sách cho cả X và O
+- File: bản ghi sắp theo khoá, đọc qua mmap + tìm nhị phân (không nạp cả file vào bộ nhớ)
+- File thiếu / hỏng → sách rỗng, AIHard chạy như bình thường
+
+Dựng offline bằng AIHard (tìm sâu trên từng thế, mở rộng các nước ứng viên tốt nhất):
+    python -m src.ai.opening_book [--plies N] [--branch K] [--time S] [--out FILE]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from src.core.constants import SYMBOL_X, SYMBOL_O
+from config.ai_config import BOOK_PATH, BOOK_MAX_STONES, BOOK_EDGE_MARGIN
+
+Move = Tuple[int, int]
+
+# 8 phép đối xứng của lưới vuông (quay 90° × lật), áp dụng trên toạ độ nguyên không giới hạn
+TRANSFORMS = [
+    lambda r, c: (r, c),
+    lambda r, c: (r, -c),
+    lambda r, c: (-r, c),
+    lambda r, c: (-r, -c),
+    lambda r, c: (c, r),
+    lambda r, c: (c, -r),
+    lambda r, c: (-c, r),
+    lambda r, c: (-c, -r),
+]
+
+
+def _inverse_index(t) -> int:
+    for i, u in enumerate(TRANSFORMS):
+        if u(*t(1, 2)) == (1, 2):
+            return i
+    raise ValueError("không có phép biến đổi ngược")
+
+
+INVERSE = [_inverse_index(t) for t in TRANSFORMS]
+
+
+def side_to_move(stones: List[Tuple[int, int, str]]) -> str:
+    #X đi trước: số quân bằng nhau → lượt X
+    x = sum(1 for _, _, sym in stones if sym == SYMBOL_X)
+    return SYMBOL_X if x == len(stones) - x else SYMBOL_O
+
+
+def canonical(stones: List[Tuple[int, int, str]]) -> Tuple[int, int, int, int]:
+    """
+    (key, t, dr, dc): key của dạng chuẩn, dạng chuẩn = TRANSFORMS[t] rồi trừ (dr, dc).
+    Dạng chuẩn = bộ (r, c, màu) sắp xếp nhỏ nhất theo thứ tự từ điển trong 8 phép đối xứng,
+    mỗi phép tịnh tiến về góc (min hàng, min cột) = (0, 0); màu 0 = bên tới lượt.
+    """
+    mover = side_to_move(stones)
+    best = None
+    for t, f in enumerate(TRANSFORMS):
+        pts = [(*f(r, c), 0 if sym == mover else 1) for r, c, sym in stones]
+        dr = min((p[0] for p in pts), default=0)
+        dc = min((p[1] for p in pts), default=0)
+        form = sorted((r - dr, c - dc, color) for r, c, color in pts)
+        if best is None or form < best[0]:
+            best = (form, t, dr, dc)
+
+    form, t, dr, dc = best
+    data = bytes(v & 0xFF for cell in form for v in cell)
+    key = int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+    return key, t, dr, dc
+
+
+def to_canonical(move: Move, t: int, dr: int, dc: int) -> Move:
+    r, c = TRANSFORMS[t](*move)
+    return r - dr, c - dc
+
+
+def from_canonical(move: Move, t: int, dr: int, dc: int) -> Move:
+    return TRANSFORMS[INVERSE[t]](move[0] + dr, move[1] + dc)
+
+
+def board_stones(board) -> List[Tuple[int, int, str]]:
+    return [
+        (r, c, board.grid[r][c])
+        for r in range(board.rows)
+        for c in range(board.cols)
+        if board.grid[r][c] is not None
+    ]
+
+
+class OpeningBook:
+    """
+    probe(board) → nước trong sách cho bên tới lượt, hoặc None.
+    Chỉ tra khi số quân <= BOOK_MAX_STONES và mọi quân cách mép >= BOOK_EDGE_MARGIN ô
+    (ngoài vùng đó phép tịnh tiến không còn giữ nguyên giá trị thế cờ).
+
+    File: MAGIC, số entry (I), rồi các bản ghi <Qbb (key, nước chuẩn hoá) sắp theo key.
+    """
+
+    MAGIC = b"OBK1"
+    HEADER = struct.Struct("<4sI")
+    RECORD = struct.Struct("<Qbb")
+
+    def __init__(self, path: Optional[str] = BOOK_PATH):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._map = None
+        self.hits = 0
+        self.lookups = 0
+        if path is not None:
+            self._open(path)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _open(self, path: str) -> None:
+        #File thiếu / hỏng → sách rỗng
+        if not os.path.exists(path):
+            return
+        try:
+            self._file = open(path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count = self.HEADER.unpack_from(self._map, 0)
+        except (OSError, ValueError, struct.error):
+            self.close()
+            return
+        if magic != self.MAGIC or len(self._map) < self.HEADER.size + count * self.RECORD.size:
+            self.close()
+            return
+        self.count = count
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self._map = self._file = None
+        self.count = 0
+
+    # LOOKUP
+    def find(self, key: int) -> Optional[Move]:
+        #Tìm nhị phân trên mmap → nước chuẩn hoá
+        lo, hi = 0, self.count
+        size, base = self.RECORD.size, self.HEADER.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            k, mr, mc = self.RECORD.unpack_from(self._map, base + mid * size)
+            if k == key:
+                return mr, mc
+            if k < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def probe(self, board) -> Optional[Move]:
+        if not self.count:
+            return None
+        stones = board_stones(board)
+        if not stones or len(stones) > BOOK_MAX_STONES:
+            return None
+        m = BOOK_EDGE_MARGIN
+        if any(r < m or c < m or r >= board.rows - m or c >= board.cols - m for r, c, _ in stones):
+            return None
+
+        self.lookups += 1
+        key, t, dr, dc = canonical(stones)
+        move = self.find(key)
+        if move is None:
+            return None
+        r, c = from_canonical(move, t, dr, dc)
+        if not board.is_empty(r, c):
+            return None
+        self.hits += 1
+        return r, c
+
+    # FILE
+    def entries(self) -> Dict[int, Move]:
+        result = {}
+        for i in range(self.count):
+            key, mr, mc = self.RECORD.unpack_from(self._map, self.HEADER.size + i * self.RECORD.size)
+            result[key] = (mr, mc)
+        return result
+
+    @classmethod
+    def save(cls, path: str, entries: Dict[int, Move]) -> None:
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(entries)))
+            for key in sorted(entries):
+                f.write(cls.RECORD.pack(key, *entries[key]))
+
+
+_SHARED_BOOK: Optional[OpeningBook] = None
+
+
+def shared_book() -> OpeningBook:
+    #Sách dùng chung trong tiến trình, mở BOOK_PATH lần đầu
+    global _SHARED_BOOK
+    if _SHARED_BOOK is None:
+        _SHARED_BOOK = OpeningBook(BOOK_PATH)
+    return _SHARED_BOOK
+
+
+# OFFLINE BUILDER
+def build(entries: Dict[int, Move], plies: int, branch: int, move_time: float, log=print) -> int:
+    """
+    Duyệt từ bàn trống: mỗi thế (chưa có trong sách) cho AIHard của bên tới lượt tìm nước tốt nhất,
+    rồi mở rộng branch nước ứng viên tốt nhất (gồm cả nước đó) tới độ sâu plies.
+    Thế đối xứng / tịnh tiến của nhau chỉ tìm 1 lần. Trả về số entry mới.
+    """
+    from src.ai.ai_hard import AIHard
+    from src.core.board import Board
+
+    ais = {}
+    for sym in (SYMBOL_X, SYMBOL_O):
+        ai = AIHard(sym, move_time=move_time, parallel_mode=None, ponder=False)
+        ai.use_book = False
+        ais[sym] = ai
+
+    board = Board()
+    seen = set()
+    added = 0
+
+    def visit(ply: int) -> None:
+        nonlocal added
+        stones = board_stones(board)
+        key, t, dr, dc = canonical(stones)
+        if key in seen:
+            return
+        seen.add(key)
+
+        mover = side_to_move(stones)
+        ai = ais[mover]
+        if key in entries:
+            best = from_canonical(entries[key], t, dr, dc)
+        else:
+            ai.time_left = None
+            best = ai.get_move(board)
+            entries[key] = to_canonical(best, t, dr, dc)
+            added += 1
+            log(f"[{len(stones)}] {mover} {' '.join(f'{s}{r},{c}' for r, c, s in stones)} → {best[0]},{best[1]}")
+
+        if ply + 1 >= plies:
+            return
+        other = SYMBOL_O if mover == SYMBOL_X else SYMBOL_X
+        children = [best] + [m for m in ai._generate_candidates(board, mover, other) if m != best]
+        for r, c in children[:branch]:
+            if board.place(r, c, mover):
+                if not board.is_win(r, c, mover):
+                    visit(ply + 1)
+                board.remove(r, c)
+
+    visit(0)
+    for ai in ais.values():
+        ai.close()
+    return added
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dựng sách khai cuộc cho AIHard")
+    parser.add_argument("--plies", type=int, default=min(6, BOOK_MAX_STONES + 1), help="số nước tính từ bàn trống")
+    parser.add_argument("--branch", type=int, default=3, help="số nước ứng viên mở rộng ở mỗi thế")
+    parser.add_argument("--time", type=float, default=2.0, help="giây tìm kiếm mỗi thế")
+    parser.add_argument("--out", default=BOOK_PATH, help="file sách (gộp với entry đã có)")
+    args = parser.parse_args(argv)
+
+    book = OpeningBook(args.out)
+    entries = book.entries()
+    book.close()
+    before = len(entries)
+
+    added = build(entries, min(args.plies, BOOK_MAX_STONES + 1), args.branch, args.time)
+    OpeningBook.save(args.out, entries)
+    print(f"book: {len(entries)} entries (+{added}, trước đó {before}) → {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,348 @@
+"""
+Tìm kiếm song song cho AIHard
+Tiến trình chính + (workers - 1) helper sống suốt ván, dùng chung
+1 transposition table (ghi không khoá, xem transposition.py).
+
+2 backend (HARD_PARALLEL_BACKEND):
+- "process": helper là tiến trình, TT nằm trong shared memory (ParallelSearch)
+- "thread":  helper là luồng trong cùng tiến trình, TT dùng chung bộ nhớ (ThreadedSearch);
+             chỉ chạy song song thật trên bản CPython free-threaded (3.14t, không GIL)
+  "auto" chọn thread khi GIL tắt, ngược lại process; "thread" khi còn GIL → lùi về process.
+
+2 chế độ (HARD_PARALLEL_MODE):
+- "root":     chia nước gốc xoay vòng cho các tiến trình, mỗi bên tự sâu dần;
+              gộp kết quả ở độ sâu hoàn chỉnh chung lớn nhất
+- "lazy_smp": mọi tiến trình cùng tìm toàn bộ cây (helper lệch độ sâu bắt đầu
+              và thứ tự nước gốc), chỉ chia sẻ qua TT; lấy kết quả sâu nhất
+
+Tiến trình chính quyết định khi nào dừng (cùng deadline với tìm kiếm đơn luồng)
+rồi bật stop_event cho các helper.
+"""
+
+from __future__ import annotations
+
+import atexit
+import multiprocessing as mp
+import queue
+import sys
+import threading
+from typing import List, Optional, Tuple
+
+from src.ai.transposition import TranspositionTable
+from config.ai_config import (
+    PARALLEL_ROOT,
+    PARALLEL_BACKEND_AUTO,
+    PARALLEL_BACKEND_THREAD,
+    HARD_TT_BITS,
+    HARD_PARALLEL_START_METHOD,
+    HARD_PARALLEL_JOIN_MARGIN,
+)
+
+Move = Tuple[int, int]
+Completed = List[Tuple[int, int, Move]]    # [(depth, score, move)] các vòng hoàn chỉnh
+
+
+def gil_enabled() -> bool:
+    #CPython < 3.13 không có sys._is_gil_enabled → luôn có GIL
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else check()
+
+
+def create_parallel(symbol: str, workers: int, mode: str, backend: str = PARALLEL_BACKEND_AUTO,
+                    tt_bits: int = HARD_TT_BITS) -> "ParallelSearch":
+    #Chọn backend: luồng chỉ khi không có GIL (có GIL thì luồng chạy lần lượt, không nhanh hơn)
+    if backend in (PARALLEL_BACKEND_AUTO, PARALLEL_BACKEND_THREAD) and not gil_enabled():
+        return ThreadedSearch(symbol, workers, mode, tt_bits)
+    return ParallelSearch(symbol, workers, mode, tt_bits)
+
+
+def _new_helper(symbol: str, tt: TranspositionTable, stop_event):
+    from src.ai.ai_hard import AIHard
+    from src.ai.search_control import SearchController
+
+    ai = AIHard(symbol, parallel_mode=None)
+    ai.tt = tt
+    ai.control = SearchController(stop_event=stop_event)
+    return ai
+
+
+def _run_job(ai, board, job) -> Tuple[int, Completed, int]:
+    #1 job của helper: dựng lại bàn cờ riêng → sâu dần → các vòng hoàn chỉnh
+    job_id, stones, moves, soft, hard, age, start_depth, max_depth = job
+
+    board.reset()
+    for r, c, sym in stones:
+        board.place(r, c, sym)
+
+    ai.tt.age = age
+    ai.tt.reset_stats()
+    ai.max_depth = max_depth
+    ai.control.start(soft, hard)
+    ai.prepare_search(board)
+    ai._iterate(board, moves, ai.symbol, ai.get_opponent_symbol(), start_depth)
+    return job_id, list(ai.completed), ai.control.nodes
+
+
+def _worker_main(conn, tt_name: str, tt_bits: int, stop_event, symbol: str) -> None:
+    #Vòng lặp của 1 tiến trình helper
+    from src.core.board import Board
+
+    ai = _new_helper(symbol, TranspositionTable.attach(tt_name, tt_bits), stop_event)
+    board = Board()
+
+    try:
+        while True:
+            job = conn.recv()
+            if job is None:
+                break
+            conn.send(_run_job(ai, board, job))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        ai.tt.close()
+
+
+def _thread_main(jobs: queue.SimpleQueue, results: queue.SimpleQueue, ai) -> None:
+    #Vòng lặp của 1 luồng helper (bàn cờ, PV, killer, history… riêng của luồng)
+    from src.core.board import Board
+
+    board = Board()
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        try:
+            results.put(_run_job(ai, board, job))
+        except Exception:
+            # không để tiến trình chính chờ tới hết margin ở mọi nước sau
+            results.put((job[0], [], 0))
+            raise
+
+
+class ParallelSearch:
+    """
+    Helper là tiến trình, TT trong shared memory.
+    Cách dùng (trong AIHard):
+        par = create_parallel(symbol, workers, mode, backend)
+        ai.tt = par.tt                                  # TT chung với helper
+        score, move = par.search(ai, board, moves, me, opp)
+        par.close()
+    """
+
+    def __init__(self, symbol: str, workers: int, mode: str, tt_bits: int = HARD_TT_BITS):
+        self.mode = mode
+        self.tt_bits = tt_bits
+        self.tt = TranspositionTable.shared(tt_bits)
+
+        ctx = mp.get_context(HARD_PARALLEL_START_METHOD)
+        self.stop_event = ctx.Event()
+        self.procs = []
+        self.conns = []
+        for _ in range(max(0, workers - 1)):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(
+                target=_worker_main,
+                args=(child, self.tt.shm.name, tt_bits, self.stop_event, symbol),
+                daemon=True,
+            )
+            proc.start()
+            child.close()
+            self.procs.append(proc)
+            self.conns.append(parent)
+
+        self.job_id = 0
+        self.nodes = 0          # tổng số nút (mọi tiến trình) của lần search gần nhất
+        self.depths: List[int] = []
+        atexit.register(self.close)
+
+    @property
+    def workers(self) -> int:
+        return len(self.conns) + 1
+
+    # SEARCH
+    def search(self, ai, board, moves: List[Move], me: str, opp: str, start_depth: int = 1) -> Tuple[int, Move]:
+        self.job_id += 1
+        ctl = ai.control
+        now = ctl.clock()
+        soft = max(0.0, ctl.soft_deadline - now)
+        hard = max(0.0, ctl.hard_deadline - now)
+        stones = [
+            (r, c, board.grid[r][c])
+            for r in range(board.rows)
+            for c in range(board.cols)
+            if board.grid[r][c] is not None
+        ]
+
+        # phần việc của tiến trình chính + job cho từng helper
+        n = self.workers
+        if self.mode == PARALLEL_ROOT:
+            parts = [moves[i::n] for i in range(n)]
+            main_moves = parts[0]
+            jobs = [(part, 1, soft) for part in parts[1:]]
+        else:
+            main_moves = moves
+            # helper lệch độ sâu bắt đầu và nước gốc đầu tiên → cây khác nhau, TT bổ sung cho nhau
+            jobs = [
+                (moves[i % len(moves):] + moves[:i % len(moves)], 1 + i % 2, hard)
+                for i in range(1, n)
+            ]
+
+        self.stop_event.clear()
+        active = []
+        for i, (part, helper_depth, helper_soft) in enumerate(jobs):
+            job = (self.job_id, stones, part, helper_soft, hard, ai.tt.age, helper_depth, ai.max_depth)
+            if part and self._send(i, job):
+                active.append(i)
+
+        if main_moves:
+            ai._iterate(board, main_moves, me, opp, start_depth)
+            results = [(list(ai.completed), ctl.nodes)]
+        else:
+            results = []
+        self.stop_event.set()
+
+        # helper dừng ở lần đọc đồng hồ kế tiếp; chờ thêm tối đa HARD_PARALLEL_JOIN_MARGIN
+        results += self._collect(active, ctl.clock() + HARD_PARALLEL_JOIN_MARGIN, ctl.clock)
+
+        self.nodes = sum(nodes for _, nodes in results)
+        self.depths = [completed[-1][0] if completed else 0 for completed, _ in results]
+        return self._combine([completed for completed, _ in results if completed], moves)
+
+    def _send(self, i: int, job) -> bool:
+        try:
+            self.conns[i].send(job)
+            return True
+        except (BrokenPipeError, OSError):
+            return False
+
+    def _collect(self, active: List[int], deadline: float, clock) -> List[Tuple[Completed, int]]:
+        results = []
+        for i in active:
+            got = self._receive(self.conns[i], deadline, clock)
+            if got is not None:
+                results.append(got)
+        return results
+
+    def _receive(self, conn, deadline: float, clock) -> Optional[Tuple[Completed, int]]:
+        #Bỏ qua kết quả trễ của job cũ (job_id khác)
+        try:
+            while conn.poll(max(0.0, deadline - clock())):
+                job_id, completed, nodes = conn.recv()
+                if job_id == self.job_id:
+                    return completed, nodes
+        except (EOFError, OSError):
+            pass
+        return None
+
+    def _combine(self, results: List[Completed], moves: List[Move]) -> Tuple[int, Move]:
+        if not results:
+            return 0, moves[0]
+
+        if self.mode == PARALLEL_ROOT:
+            # điểm chỉ so sánh được ở cùng độ sâu → độ sâu hoàn chỉnh chung lớn nhất
+            depth = min(completed[-1][0] for completed in results)
+            best = None
+            for completed in results:
+                for d, score, move in completed:
+                    if d == depth and (best is None or score > best[0]):
+                        best = (score, move)
+            return best
+
+        # lazy SMP: kết quả sâu nhất, hoà thì ưu tiên tiến trình chính (đứng đầu danh sách)
+        best = results[0][-1]
+        for completed in results[1:]:
+            if completed[-1][0] > best[0]:
+                best = completed[-1]
+        return best[1], best[2]
+
+    # LIFECYCLE
+    def close(self) -> None:
+        if self.tt is None:
+            return
+        self.stop_event.set()
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self.procs:
+            proc.join(timeout=1.0)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self.conns:
+            conn.close()
+        self.procs, self.conns = [], []
+
+        self.tt.close(unlink=True)
+        self.tt = None
+        atexit.unregister(self.close)
+
+
+class ThreadedSearch(ParallelSearch):
+    """
+    Cùng chế độ root / lazy_smp với ParallelSearch nhưng helper là luồng:
+    không fork / pickle, job chỉ là 1 tuple đưa qua queue → hợp với ngân sách < 1 giây.
+    Mỗi luồng có AIHard riêng (bàn cờ, PV, killer, history, evaluator);
+    TT là các view trên cùng 1 vùng nhớ (ghi không khoá), cờ dừng là threading.Event chung.
+    """
+
+    def __init__(self, symbol: str, workers: int, mode: str, tt_bits: int = HARD_TT_BITS):
+        self.mode = mode
+        self.tt_bits = tt_bits
+        self.tt = TranspositionTable(tt_bits)
+
+        self.stop_event = threading.Event()
+        self.results: queue.SimpleQueue = queue.SimpleQueue()
+        self.jobs: List[queue.SimpleQueue] = []
+        self.threads: List[threading.Thread] = []
+        for i in range(max(0, workers - 1)):
+            # view riêng trên cùng buffer → thống kê probe / hit riêng từng luồng
+            helper = _new_helper(symbol, TranspositionTable(tt_bits, self.tt.raw), self.stop_event)
+            jobs = queue.SimpleQueue()
+            thread = threading.Thread(
+                target=_thread_main, args=(jobs, self.results, helper),
+                name=f"AIHard-helper-{i + 1}", daemon=True,
+            )
+            thread.start()
+            self.jobs.append(jobs)
+            self.threads.append(thread)
+
+        self.job_id = 0
+        self.nodes = 0
+        self.depths: List[int] = []
+        atexit.register(self.close)
+
+    @property
+    def workers(self) -> int:
+        return len(self.jobs) + 1
+
+    def _send(self, i: int, job) -> bool:
+        if not self.threads[i].is_alive():
+            return False
+        self.jobs[i].put(job)
+        return True
+
+    def _collect(self, active: List[int], deadline: float, clock) -> List[Tuple[Completed, int]]:
+        results = []
+        pending = len(active)
+        while pending:
+            try:
+                job_id, completed, nodes = self.results.get(timeout=max(0.0, deadline - clock()))
+            except queue.Empty:
+                break
+            if job_id == self.job_id:
+                results.append((completed, nodes))
+                pending -= 1
+        return results
+
+    def close(self) -> None:
+        if self.tt is None:
+            return
+        self.stop_event.set()
+        for jobs in self.jobs:
+            jobs.put(None)
+        for thread in self.threads:
+            thread.join(timeout=1.0)
+        self.jobs, self.threads = [], []
+        self.tt = None
+        atexit.unregister(self.close)
@@ -0,0 +1,430 @@
+"""
+Proof-number search cho các thế cờ nhiều đe doạ
+Cùng không gian nước với VCT (bên tấn công: four / three, bên thủ: mọi cách đỡ)
+nhưng tìm best-first theo proof / disproof number thay vì depth-first
+→ không cần giới hạn độ sâu, tự dồn sức vào nhánh dễ chứng minh nhất.
+
+- Cây lưu trong các mảng `array` cấp phát sẵn (capacity nút) → bộ nhớ cố định
+- Ngân sách nút cho mỗi lần solve, time_up() kiểm tra mỗi 64 lần mở rộng
+- Thế cờ đã giải (PROVEN / DISPROVEN) được lưu vào SolvedCache,
+  có thể ghi ra file để các ván sau dùng lại (xem CLI cuối file)
+
+Chạy offline:
+    python -m src.ai.pns positions.txt [--nodes N] [--time S] [--cache FILE]
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.core.patterns import threat_cells, threat_cells_through
+from src.ai.vct import threat_moves, defense_replies
+from src.core.constants import SYMBOL_X, SYMBOL_O
+from config.ai_config import PNS_MAX_NODES, PNS_NODE_BUDGET, PNS_CACHE_MAX, PNS_CACHE_PATH
+
+Move = Tuple[int, int]
+
+UNKNOWN = 0
+PROVEN = 1       # bên tấn công thắng bằng chuỗi đe doạ
+DISPROVEN = 2    # không có chuỗi đe doạ nào thắng (trong không gian four / three)
+
+INF = 1 << 30
+NO_MOVE = -1
+
+ATTACKER_KEYS = {
+    SYMBOL_X: 0x3C6EF372FE94F82B,
+    SYMBOL_O: 0xA54FF53A5F1D36F1,
+}
+
+
+# SOLVED CACHE
+class SolvedCache:
+    """
+    {key: (result, move)} – key = board.hash ^ ATTACKER_KEYS[attacker],
+    move = chỉ số ô của nước thắng (NO_MOVE nếu DISPROVEN).
+    Giới hạn max_entries, đầy thì bỏ entry cũ nhất.
+
+    File: MAGIC, cols (H), số entry (I), rồi các bản ghi <QBh sắp theo key.
+    """
+
+    MAGIC = b"PNS1"
+    HEADER = struct.Struct("<4sHI")
+    RECORD = struct.Struct("<QBh")
+
+    def __init__(self, max_entries: int = PNS_CACHE_MAX):
+        self.max_entries = max_entries
+        self.entries: Dict[int, Tuple[int, int]] = {}
+        self.hits = 0
+        self.lookups = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: int) -> Optional[Tuple[int, int]]:
+        self.lookups += 1
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def put(self, key: int, result: int, move: int = NO_MOVE) -> None:
+        if key not in self.entries and len(self.entries) >= self.max_entries:
+            del self.entries[next(iter(self.entries))]
+        self.entries[key] = (result, move)
+
+    # FILE
+    def load(self, path: str, cols: int) -> bool:
+        #File thiếu / hỏng / khác kích thước bàn → bỏ qua
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, file_cols, count = self.HEADER.unpack_from(data, 0)
+        except (OSError, struct.error):
+            return False
+        if magic != self.MAGIC or file_cols != cols:
+            return False
+
+        offset = self.HEADER.size
+        if len(data) < offset + count * self.RECORD.size:
+            return False
+        for key, result, move in self.RECORD.iter_unpack(data[offset:offset + count * self.RECORD.size]):
+            self.put(key, result, move)
+        return True
+
+    def save(self, path: str, cols: int) -> None:
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, cols, len(self.entries)))
+            for key in sorted(self.entries):
+                result, move = self.entries[key]
+                f.write(self.RECORD.pack(key, result, move))
+
+
+_SHARED_CACHE: Dict[int, SolvedCache] = {}
+
+
+def shared_cache(cols: int) -> SolvedCache:
+    #Cache dùng chung cho mọi ván trong tiến trình, nạp từ PNS_CACHE_PATH lần đầu
+    cache = _SHARED_CACHE.get(cols)
+    if cache is None:
+        cache = SolvedCache()
+        cache.load(PNS_CACHE_PATH, cols)
+        _SHARED_CACHE[cols] = cache
+    return cache
+
+
+# SEARCH
+class ProofNumberSearch:
+    """
+    solve(board, attacker) → (result, line)
+    - result: PROVEN / DISPROVEN / UNKNOWN (hết ngân sách, hết bộ nhớ, hết giờ)
+    - line: [a1, d1, a2, ...] theo cách đỡ đầu tiên ở mỗi bước (chỉ khi PROVEN)
+
+    OR node = lượt bên tấn công, AND node = lượt bên thủ.
+    Nút con của 1 nút nằm liền nhau trong mảng: [first, first + count).
+    """
+
+    def __init__(self, capacity: int = PNS_MAX_NODES, cache: Optional[SolvedCache] = None):
+        self.capacity = capacity
+        self.cache = cache
+
+        self.pn = array("i", bytes(4 * capacity))
+        self.dn = array("i", bytes(4 * capacity))
+        self.parent = array("i", bytes(4 * capacity))
+        self.first = array("i", [-1]) * capacity    # -1 = chưa mở rộng
+        self.count = array("H", bytes(2 * capacity))
+        self.move = array("h", bytes(2 * capacity))
+        self.key = array("Q", bytes(8 * capacity))
+        self.size = 0
+
+        self.nodes = 0
+        self.aborted = False
+
+    # PUBLIC
+    def solve(self, board, attacker: str, budget: int = PNS_NODE_BUDGET,
+              time_up: Optional[Callable[[], bool]] = None) -> Tuple[int, List[Move]]:
+        #attacker đang tới lượt
+        defender = SYMBOL_O if attacker == SYMBOL_X else SYMBOL_X
+        self.size = 0
+        self.nodes = 0
+        self.aborted = False
+
+        wins = threat_cells(board, attacker, 4)
+        if wins:
+            return PROVEN, [next(iter(wins))]
+
+        key = board.hash ^ ATTACKER_KEYS[attacker]
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                result, move = entry
+                line = [divmod(move, board.cols)] if move != NO_MOVE else []
+                return result, line
+
+        root = self._new_node(-1, NO_MOVE, key)
+        limit = min(budget, self.capacity)
+
+        path: List[Move] = []
+        node, is_or = root, True
+        expansions = 0
+
+        while self.pn[root] and self.dn[root]:
+            expansions += 1
+            if time_up is not None and expansions & 63 == 0 and time_up():
+                self.aborted = True
+                break
+
+            # 1) đi xuống nút cần chứng minh nhất
+            while self.first[node] >= 0:
+                node = self._select(node, is_or)
+                r, c = divmod(self.move[node], board.cols)
+                board.place(r, c, attacker if is_or else defender)
+                path.append((r, c))
+                is_or = not is_or
+
+            # 2) mở rộng
+            old_pn, old_dn = self.pn[node], self.dn[node]
+            if not self._expand(board, node, is_or, attacker, defender, limit):
+                self.aborted = True
+                break
+
+            # 3) cập nhật ngược, dừng sớm khi số không đổi
+            while node != root and (self.pn[node] != old_pn or self.dn[node] != old_dn):
+                board.remove(*path.pop())
+                node = self.parent[node]
+                is_or = not is_or
+                old_pn, old_dn = self.pn[node], self.dn[node]
+                self._set_numbers(node, is_or)
+
+        for r, c in reversed(path):
+            board.remove(r, c)
+        self.nodes = self.size
+
+        if self.pn[root] == 0:
+            result = PROVEN
+        elif self.dn[root] == 0:
+            result = DISPROVEN
+        else:
+            return UNKNOWN, []
+
+        self._store_solved(board)
+        return result, self._proof_line(board) if result == PROVEN else []
+
+    # TREE
+    def _new_node(self, parent: int, move: int, key: int) -> int:
+        n = self.size
+        self.size += 1
+        self.pn[n] = 1
+        self.dn[n] = 1
+        self.parent[n] = parent
+        self.first[n] = -1
+        self.count[n] = 0
+        self.move[n] = move
+        self.key[n] = key
+        return n
+
+    def _select(self, node: int, is_or: bool) -> int:
+        #OR → con có pn nhỏ nhất, AND → con có dn nhỏ nhất
+        nums = self.pn if is_or else self.dn
+        start = self.first[node]
+        best, best_val = start, nums[start]
+        for child in range(start + 1, start + self.count[node]):
+            if nums[child] < best_val:
+                best, best_val = child, nums[child]
+        return best
+
+    def _set_numbers(self, node: int, is_or: bool) -> None:
+        start = self.first[node]
+        end = start + self.count[node]
+        if is_or:
+            self.pn[node] = min(self.pn[start:end])
+            self.dn[node] = min(INF, sum(self.dn[start:end]))
+        else:
+            self.pn[node] = min(INF, sum(self.pn[start:end]))
+            self.dn[node] = min(self.dn[start:end])
+
+    def _mark(self, node: int, result: int) -> None:
+        if result == PROVEN:
+            self.pn[node], self.dn[node] = 0, INF
+        else:
+            self.pn[node], self.dn[node] = INF, 0
+
+    def _expand(self, board, node: int, is_or: bool, attacker: str, defender: str, limit: int) -> bool:
+        #False → hết chỗ / hết ngân sách
+        cols = board.cols
+
+        if is_or:
+            if self.cache is not None and node:
+                entry = self.cache.get(self.key[node])
+                if entry is not None:
+                    self._mark(node, entry[0])
+                    return True
+
+            if threat_cells(board, attacker, 4):
+                self._mark(node, PROVEN)
+                return True
+            threats = threat_cells(board, defender, 4)
+            if len(threats) >= 2:
+                self._mark(node, DISPROVEN)
+                return True
+            moves = list(threats) if threats else threat_moves(board, attacker)
+            if not moves:
+                self._mark(node, DISPROVEN)
+                return True
+            sym = attacker
+        else:
+            last = divmod(self.move[node], cols)
+            moves = defense_replies(board, attacker, defender, last)
+            if moves is None:
+                self._mark(node, DISPROVEN)
+                return True
+            if not moves:
+                self._mark(node, PROVEN)
+                return True
+            sym = defender
+
+        if self.size + len(moves) > limit:
+            return False
+
+        keys = board.zobrist[sym]
+        base = self.key[node]
+        self.first[node] = self.size
+        self.count[node] = len(moves)
+
+        for r, c in moves:
+            idx = r * cols + c
+            child = self._new_node(node, idx, base ^ keys[idx])
+
+            # kết luận rẻ ngay khi sinh nút
+            board.place(r, c, sym)
+            if is_or:
+                if len(threat_cells_through(board, r, c, attacker, 4)) >= 2:
+                    self._mark(child, PROVEN)
+            elif len(threat_cells_through(board, r, c, defender, 4)) >= 2:
+                self._mark(child, DISPROVEN)
+            board.remove(r, c)
+
+        self._set_numbers(node, is_or)
+        return True
+
+    # RESULT
+    def _proof_line(self, board) -> List[Move]:
+        line: List[Move] = []
+        node, is_or = 0, True
+        while self.first[node] >= 0:
+            start = self.first[node]
+            end = start + self.count[node]
+            if is_or:
+                node = next(ch for ch in range(start, end) if self.pn[ch] == 0)
+            else:
+                node = start
+            line.append(divmod(self.move[node], board.cols))
+            is_or = not is_or
+        return line
+
+    def _store_solved(self, board) -> None:
+        #Lưu mọi OR node đã giải và đã mở rộng (nút lá kết luận lại rất rẻ)
+        if self.cache is None:
+            return
+
+        stack = [(0, True)]
+        while stack:
+            node, is_or = stack.pop()
+            start = self.first[node]
+            if start < 0:
+                continue
+            end = start + self.count[node]
+
+            if is_or and not self.dn[node]:
+                self.cache.put(self.key[node], DISPROVEN)
+            elif is_or and not self.pn[node]:
+                win = next(ch for ch in range(start, end) if self.pn[ch] == 0)
+                self.cache.put(self.key[node], PROVEN, self.move[win])
+
+            stack.extend((ch, not is_or) for ch in range(start, end))
+
+
+# OFFLINE CLI
+def parse_position(text: str):
+    """
+    "<bên tấn công> <quân><hàng>,<cột> ..." – vd: "O X9,9 O9,10 X10,10"
+    Trả về (board, attacker) hoặc None nếu dòng trống / chú thích (#).
+    """
+    from src.core.board import Board
+
+    text = text.split("#", 1)[0].strip()
+    if not text:
+        return None
+
+    parts = text.split()
+    attacker = parts[0].upper()
+    if attacker not in (SYMBOL_X, SYMBOL_O):
+        raise ValueError(f"bên tấn công không hợp lệ: {parts[0]}")
+
+    board = Board()
+    for token in parts[1:]:
+        sym = token[0].upper()
+        r, c = (int(v) for v in token[1:].split(","))
+        if sym not in (SYMBOL_X, SYMBOL_O) or not board.place(r, c, sym):
+            raise ValueError(f"nước không hợp lệ: {token}")
+    return board, attacker
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import time
+
+    from config.game_config import BOARD_COLS
+
+    parser = argparse.ArgumentParser(description="Giải hàng loạt thế cờ bằng proof-number search")
+    parser.add_argument("files", nargs="+", help="file thế cờ, mỗi dòng 1 thế")
+    parser.add_argument("--nodes", type=int, default=PNS_MAX_NODES, help="ngân sách nút mỗi thế")
+    parser.add_argument("--time", type=float, default=0.0, help="giới hạn giây mỗi thế (0 = không giới hạn)")
+    parser.add_argument("--cache", default=PNS_CACHE_PATH, help="file cache thế đã giải")
+    parser.add_argument("--no-save", action="store_true", help="không ghi lại cache")
+    args = parser.parse_args(argv)
+
+    cache = SolvedCache()
+    cache.load(args.cache, BOARD_COLS)
+    before = len(cache)
+    solver = ProofNumberSearch(max(args.nodes, 1), cache)
+    names = {PROVEN: "PROVEN", DISPROVEN: "DISPROVEN", UNKNOWN: "UNKNOWN"}
+
+    for path in args.files:
+        with open(path, encoding="utf-8") as f:
+            for lineno, text in enumerate(f, 1):
+                try:
+                    pos = parse_position(text)
+                except ValueError as e:
+                    print(f"{path}:{lineno}: {e}")
+                    continue
+                if pos is None:
+                    continue
+
+                board, attacker = pos
+                time_up = None
+                if args.time > 0:
+                    deadline = time.time() + args.time
+                    time_up = lambda: time.time() >= deadline
+
+                t0 = time.time()
+                result, line = solver.solve(board, attacker, args.nodes, time_up)
+                moves = " ".join(f"{r},{c}" for r, c in line)
+                print(f"{path}:{lineno}: {attacker} {names[result]} "
+                      f"nodes={solver.nodes} {time.time() - t0:.2f}s {moves}")
+
+    if not args.no_save:
+        cache.save(args.cache, BOARD_COLS)
+        print(f"cache: {len(cache)} entries (+{len(cache) - before}) → {args.cache}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,155 @@
+"""
+Search controller cho AIHard
+Gom mọi quyết định "dừng hay tìm tiếp" vào 1 chỗ:
+- đồng hồ monotonic, chỉ đọc mỗi check_every nút (tick) → không syscall ở mọi nút
+- soft deadline: không bắt đầu vòng lặp sâu mới; hard deadline: cắt ngang tìm kiếm
+- ngân sách mỗi nước lấy từ đồng hồ ván cờ (Game.time_left) và giai đoạn ván
+- dừng sớm khi nước tốt nhất đã ổn định qua nhiều vòng lặp sâu dần
+- cancel(): huỷ hợp tác (gọi từ luồng khác / UI), có hiệu lực ở lần đọc đồng hồ kế tiếp
+- stop_event: cờ dừng dùng chung giữa các tiến trình / luồng tìm kiếm song song
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional, Tuple
+
+from config.ai_config import (
+    HARD_TIME_LIMIT,
+    SEARCH_CHECK_NODES,
+    SEARCH_SOFT_SHARE,
+    SEARCH_MOVES_TO_GO,
+    SEARCH_MIN_MOVES_TO_GO,
+    SEARCH_OPENING_STONES,
+    SEARCH_OPENING_FACTOR,
+    SEARCH_HARD_FACTOR,
+    SEARCH_MAX_CLOCK_SHARE,
+    SEARCH_CLOCK_RESERVE,
+    SEARCH_STABLE_ITERATIONS,
+    SEARCH_NEXT_ITERATION_SHARE,
+)
+
+
+class SearchController:
+    """
+    Cách dùng (mỗi get_move):
+        ctl.start(*ctl.allocate(time_left, stones, move_time))
+        ... if ctl.tick(): dừng ...              # trong vòng tìm kiếm
+        ... if ctl.soft_expired(): break ...     # giữa các vòng lặp sâu dần
+        ... if ctl.iteration_done(move): break   # nước tốt nhất đã ổn định
+    """
+
+    def __init__(self, check_every: int = SEARCH_CHECK_NODES, clock: Callable[[], float] = time.monotonic, stop_event=None):
+        # làm tròn lên lũy thừa của 2 → kiểm tra bằng phép AND
+        self.check_mask = (1 << max(0, int(check_every) - 1).bit_length()) - 1
+        self.clock = clock
+        self.stop_event = stop_event    # threading / multiprocessing Event, đọc cùng lúc với đồng hồ
+
+        self.started = 0.0
+        self.soft_deadline = 0.0
+        self.hard_deadline = 0.0
+
+        self.nodes = 0
+        self.stopped = False
+        self.cancelled = False
+
+        self._best_move = None
+        self._stable = 0
+
+    # BUDGET
+    @staticmethod
+    def allocate(time_left: Optional[float], stones: int, move_time: Optional[float] = None) -> Tuple[float, float]:
+        """
+        (soft, hard) giây cho nước này.
+        time_left=None (không bấm giờ) → dùng HARD_TIME_LIMIT.
+        Đầu ván đi nhanh (sách / ít đe doạ), giữa ván chia đều cho số nước còn lại ước lượng.
+        move_time: trần của soft (thời gian nghĩ mong muốn mỗi nước).
+        """
+        limit = float(HARD_TIME_LIMIT)
+        if time_left is None:
+            soft = limit * SEARCH_SOFT_SHARE
+            if move_time is not None:
+                soft = min(soft, move_time)
+            return soft, min(limit, soft * SEARCH_HARD_FACTOR)
+
+        usable = max(0.0, time_left - SEARCH_CLOCK_RESERVE)
+        moves_to_go = max(SEARCH_MIN_MOVES_TO_GO, SEARCH_MOVES_TO_GO - stones // 4)
+        soft = usable / moves_to_go
+        if stones < SEARCH_OPENING_STONES:
+            soft *= SEARCH_OPENING_FACTOR
+        if move_time is not None:
+            soft = min(soft, move_time)
+
+        hard = min(soft * SEARCH_HARD_FACTOR, usable * SEARCH_MAX_CLOCK_SHARE, limit)
+        return min(soft, hard), hard
+
+    # LIFECYCLE
+    def start(self, soft: float, hard: float) -> None:
+        now = self.clock()
+        self.started = now
+        self.soft_deadline = now + soft
+        self.hard_deadline = now + hard
+
+        self.nodes = 0
+        self.stopped = False
+        self.cancelled = False
+        self._best_move = None
+        self._stable = 0
+
+    def cancel(self) -> None:
+        #Chỉ ghi 1 cờ → an toàn khi gọi từ luồng khác
+        self.cancelled = True
+
+    # CHECKS
+    def tick(self) -> bool:
+        #Gọi mỗi nút; True → dừng tìm kiếm ngay
+        if self.stopped:
+            return True
+        self.nodes += 1
+        if self.nodes & self.check_mask == 0:
+            self.stopped = self._must_stop()
+        return self.stopped
+
+    def expired(self) -> bool:
+        #Đọc đồng hồ ngay (cho các solver tự giãn lần kiểm tra)
+        if not self.stopped:
+            self.stopped = self._must_stop()
+        return self.stopped
+
+    def _must_stop(self) -> bool:
+        if self.cancelled or self.clock() >= self.hard_deadline:
+            return True
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def soft_expired(self) -> bool:
+        return self.expired() or self.clock() >= self.soft_deadline
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def stage(self, share: float) -> Callable[[], bool]:
+        #Hạn riêng cho 1 giai đoạn: share * ngân sách hard, tính từ bây giờ
+        deadline = self.clock() + share * (self.hard_deadline - self.started)
+        return lambda: self.expired() or self.clock() >= deadline
+
+    # ITERATIVE DEEPENING
+    def iteration_done(self, best_move) -> bool:
+        """
+        Gọi sau mỗi vòng lặp sâu dần hoàn chỉnh.
+        True → nên dừng: hết soft deadline, không kịp cho vòng sau
+        (đã dùng quá SEARCH_NEXT_ITERATION_SHARE của soft), hoặc nước tốt nhất
+        giữ nguyên SEARCH_STABLE_ITERATIONS vòng liền và đã dùng quá 1/4 soft.
+        """
+        if best_move == self._best_move:
+            self._stable += 1
+        else:
+            self._best_move = best_move
+            self._stable = 1
+
+        if self.soft_expired():
+            return True
+        soft = self.soft_deadline - self.started
+        elapsed = self.elapsed()
+        if elapsed >= soft * SEARCH_NEXT_ITERATION_SHARE:
+            return True
+        return self._stable >= SEARCH_STABLE_ITERATIONS and elapsed >= soft / 4
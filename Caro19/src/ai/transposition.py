@@ -0,0 +1,174 @@
+"""
+Transposition table cho AIHard
+Bảng băm kích thước cố định (2^bits ô), lưu trong 2 cột 64-bit
+thay vì dict của tuple → bộ nhớ cố định, không sinh object mỗi lần store.
+
+Mỗi slot gồm 2 số 64-bit:
+- data = depth, score, flag, best move (chỉ số ô), age nén chung 1 số
+- check = key ^ data
+Ghi không khoá (lockless, kiểu Hyatt): nhiều tiến trình cùng ghi 1 slot có thể để lại
+check / data lệch nhau, nhưng khi đó check ^ data != key nên probe coi như miss.
+Vì vậy bảng có thể nằm trong shared memory cho tìm kiếm song song (xem shared / attach).
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+# Loại cận của score đã lưu
+TT_EXACT = 0
+TT_LOWER = 1   # score >= giá trị thật (fail-high)
+TT_UPPER = 2   # score <= giá trị thật (fail-low)
+
+NO_MOVE = -1
+
+# Bố cục data (bit thấp → cao): move+1 (16) | flag+1 (2) | depth+128 (8) | age (6) | score+2^31 (32)
+# flag+1 >= 1 → data của slot đã dùng luôn khác 0
+_MOVE_BITS, _FLAG_SHIFT, _DEPTH_SHIFT, _AGE_SHIFT, _SCORE_SHIFT = 16, 16, 18, 26, 32
+_AGE_MASK = 0x3F
+_SCORE_BIAS = 1 << 31
+
+SLOT_BYTES = 16
+
+
+def _pack(depth: int, score: int, flag: int, move: int, age: int) -> int:
+    return (
+        ((move + 1) & 0xFFFF)
+        | ((flag + 1) << _FLAG_SHIFT)
+        | (((depth + 128) & 0xFF) << _DEPTH_SHIFT)
+        | ((age & _AGE_MASK) << _AGE_SHIFT)
+        | (((score + _SCORE_BIAS) & 0xFFFFFFFF) << _SCORE_SHIFT)
+    )
+
+
+class TranspositionTable:
+    """
+    Chính sách thay thế (1 slot / index, index = key & mask):
+    - slot trống hoặc cùng key → ghi đè
+    - entry của lần tìm kiếm cũ (age khác) → ghi đè
+    - cùng lần tìm kiếm → chỉ ghi đè nếu depth mới >= depth cũ
+
+    buffer: vùng nhớ 16 * 2^bits byte có sẵn (vd shared memory), None → tự cấp phát.
+    """
+
+    def __init__(self, bits: int = 18, buffer=None):
+        self.bits = bits
+        self.size = 1 << bits
+        self.mask = self.size - 1
+
+        if buffer is None:
+            buffer = bytearray(SLOT_BYTES * self.size)
+        self.raw = memoryview(buffer)[:SLOT_BYTES * self.size]
+        self.checks = self.raw[:8 * self.size].cast("Q")
+        self.data = self.raw[8 * self.size:].cast("Q")
+
+        self.shm = None     # SharedMemory nếu bảng nằm trong shared memory
+        self.age = 0
+        self.reset_stats()
+
+    # SHARED MEMORY
+    @classmethod
+    def shared(cls, bits: int = 18) -> "TranspositionTable":
+        #Tạo bảng trong shared memory; tiến trình khác gắn vào bằng attach(tt.shm.name, bits)
+        from multiprocessing import shared_memory
+
+        shm = shared_memory.SharedMemory(create=True, size=SLOT_BYTES << bits)
+        shm.buf[:SLOT_BYTES << bits] = bytes(SLOT_BYTES << bits)
+        tt = cls(bits, shm.buf)
+        tt.shm = shm
+        return tt
+
+    @classmethod
+    def attach(cls, name: str, bits: int = 18) -> "TranspositionTable":
+        from multiprocessing import shared_memory
+
+        shm = shared_memory.SharedMemory(name=name)
+        tt = cls(bits, shm.buf)
+        tt.shm = shm
+        return tt
+
+    def close(self, unlink: bool = False) -> None:
+        #Nhả shared memory (unlink=True ở tiến trình đã tạo bảng)
+        if self.shm is None:
+            return
+        self.checks.release()
+        self.data.release()
+        self.raw.release()
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+        self.shm = None
+
+    # LIFECYCLE
+    def new_search(self) -> None:
+        #Gọi đầu mỗi get_move: entry cũ vẫn dùng được nhưng ưu tiên bị thay
+        self.age = (self.age + 1) & _AGE_MASK
+        self.reset_stats()
+
+    def clear(self) -> None:
+        self.raw[:] = bytes(len(self.raw))
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.probes = 0
+        self.hits = 0
+        self.cutoffs = 0
+        self.stores = 0
+
+    # ACCESS
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        #Trả về (depth, score, flag, move) hoặc None
+        self.probes += 1
+        i = key & self.mask
+        d = self.data[i]
+        if not d or self.checks[i] ^ d != key:
+            return None
+        self.hits += 1
+        return (
+            ((d >> _DEPTH_SHIFT) & 0xFF) - 128,
+            (d >> _SCORE_SHIFT) - _SCORE_BIAS,
+            ((d >> _FLAG_SHIFT) & 3) - 1,
+            (d & 0xFFFF) - 1 if d & 0xFFFF else NO_MOVE,
+        )
+
+    def store(self, key: int, depth: int, score: int, flag: int, move: int = NO_MOVE) -> None:
+        i = key & self.mask
+        old = self.data[i]
+        if old:
+            same = self.checks[i] ^ old == key
+            if (
+                not same
+                and (old >> _AGE_SHIFT) & _AGE_MASK == self.age
+                and depth < ((old >> _DEPTH_SHIFT) & 0xFF) - 128
+            ):
+                return
+            # cùng thế cờ nhưng không có nước tốt mới → giữ nước cũ
+            if same and move == NO_MOVE:
+                move = (old & 0xFFFF) - 1
+
+        d = _pack(depth, score, flag, move, self.age)
+        self.data[i] = d
+        self.checks[i] = key ^ d
+        self.stores += 1
+
+    def record_cutoff(self) -> None:
+        self.cutoffs += 1
+
+    # STATS
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def cutoff_rate(self) -> float:
+        return self.cutoffs / self.probes if self.probes else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "cutoffs": self.cutoffs,
+            "stores": self.stores,
+            "hit_rate": self.hit_rate,
+            "cutoff_rate": self.cutoff_rate,
+        }
@@ -0,0 +1,128 @@
+"""
+VCF solver (Victory by Continuous Fours) cho AIHard
+Bên tấn công chỉ đánh các nước tạo four, bên thủ chỉ có đúng 1 nước chặn
+→ nhánh rất hẹp, đọc được 20+ nước trong vài chục ms.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.core.patterns import threat_cells, threat_cells_through
+from src.ai.transposition import TranspositionTable, TT_EXACT, NO_MOVE
+from src.core.constants import SYMBOL_X, SYMBOL_O
+from config.ai_config import VCF_MAX_DEPTH, VCF_MAX_NODES, VCF_TT_BITS
+
+Move = Tuple[int, int]
+
+PROVEN = 1
+FAILED = 0
+
+# XOR vào board.hash theo bên tấn công → 1 bảng dùng cho cả tấn công lẫn phòng thủ
+ATTACKER_KEYS = {
+    SYMBOL_X: 0x5851F42D4C957F2D,
+    SYMBOL_O: 0x14057B7EF767814F,
+}
+
+
+class VCFSolver:
+    """
+    solve(board, attacker) → [a1, d1, a2, d2, ..., aN] hoặc None
+    - a_i: nước four của bên tấn công, d_i: nước chặn bắt buộc
+    - aN tạo five hoặc 2 ô thắng cùng lúc (open four / double four)
+    Giới hạn: max_depth nước four, max_nodes nút, time_up() kiểm tra mỗi 64 nút.
+    """
+
+    def __init__(self, max_depth: int = VCF_MAX_DEPTH, max_nodes: int = VCF_MAX_NODES, tt_bits: int = VCF_TT_BITS):
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.tt = TranspositionTable(tt_bits)
+
+        self.nodes = 0
+        self.aborted = False
+        self._time_up: Optional[Callable[[], bool]] = None
+
+    # PUBLIC
+    def solve(self, board, attacker: str, time_up: Optional[Callable[[], bool]] = None) -> Optional[List[Move]]:
+        #attacker đang tới lượt
+        self.tt.new_search()
+        self.nodes = 0
+        self.aborted = False
+        self._time_up = time_up
+
+        defender = SYMBOL_O if attacker == SYMBOL_X else SYMBOL_X
+
+        wins = threat_cells(board, attacker, 4)
+        if wins:
+            return [next(iter(wins))]
+
+        # four sẵn có của bên thủ → bên tấn công buộc phải chặn
+        threats = list(threat_cells(board, defender, 4))
+        return self._attack(board, attacker, defender, self.max_depth, threats)
+
+    # SEARCH
+    def _attack(self, board, attacker: str, defender: str, depth: int, threats: List[Move]) -> Optional[List[Move]]:
+        if depth <= 0 or len(threats) >= 2:
+            return None
+
+        self.nodes += 1
+        if self.nodes > self.max_nodes or (
+            self._time_up is not None and self.nodes & 63 == 0 and self._time_up()
+        ):
+            self.aborted = True
+            return None
+
+        key = board.hash ^ ATTACKER_KEYS[attacker]
+        first = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            e_depth, e_result, _, e_move = entry
+            if e_result == FAILED and e_depth >= depth:
+                self.tt.record_cutoff()
+                return None
+            if e_result == PROVEN and e_move != NO_MOVE:
+                first = divmod(e_move, board.cols)
+
+        moves = self._four_moves(board, attacker, threats)
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+
+        for move in moves:
+            r, c = move
+            board.place(r, c, attacker)
+
+            wins = threat_cells_through(board, r, c, attacker, 4)
+            if len(wins) >= 2:
+                board.remove(r, c)
+                self.tt.store(key, depth, PROVEN, TT_EXACT, r * board.cols + c)
+                return [move]
+            if not wins:
+                board.remove(r, c)
+                continue
+
+            block = next(iter(wins))
+            board.place(block[0], block[1], defender)
+            counter = list(threat_cells_through(board, block[0], block[1], defender, 4))
+
+            line = self._attack(board, attacker, defender, depth - 1, counter)
+
+            board.remove(block[0], block[1])
+            board.remove(r, c)
+
+            if line is not None:
+                self.tt.store(key, depth, PROVEN, TT_EXACT, r * board.cols + c)
+                return [move, block] + line
+            if self.aborted:
+                return None
+
+        self.tt.store(key, depth, FAILED, TT_EXACT)
+        return None
+
+    def _four_moves(self, board, attacker: str, threats: List[Move]) -> List[Move]:
+        fours: Dict[Move, int] = threat_cells(board, attacker, 3)
+        if threats:
+            # chỉ được đánh vào ô chặn, và ô đó phải tạo four
+            return [m for m in threats if m in fours]
+        # ô nằm trong nhiều cửa sổ trước (double-four / four-three)
+        return sorted(fours, key=lambda m: -fours[m])
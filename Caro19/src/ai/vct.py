@@ -0,0 +1,189 @@
+"""
+VCT solver (Victory by Continuous Threats) cho AIHard
+Như VCF nhưng bên tấn công được đánh cả three (đe doạ tạo open-four).
+Với mỗi three, bên thủ có đủ các cách đỡ:
+- các ô chặn three (ô nằm trong mọi cửa sổ _XXX_ đang sống)
+- mọi nước tạo four của bên thủ (phản công)
+Nước tấn công chỉ được coi là thắng khi MỌI cách đỡ đều thua.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.core.patterns import (
+    THREES,
+    open_windows,
+    threat_cells,
+    threat_cells_through,
+    threat_classes,
+)
+from src.ai.transposition import TranspositionTable, TT_EXACT, NO_MOVE
+from src.core.constants import SYMBOL_X, SYMBOL_O
+from config.ai_config import VCT_MAX_DEPTH, VCT_MAX_NODES, VCT_TT_BITS
+
+Move = Tuple[int, int]
+
+PROVEN = 1
+FAILED = 0
+
+ATTACKER_KEYS = {
+    SYMBOL_X: 0x2545F4914F6CDD1D,
+    SYMBOL_O: 0x61C8864680B583EB,
+}
+
+
+class VCTSolver:
+    """
+    solve(board, attacker) → [a1, d1, a2, d2, ...] hoặc None
+    Chuỗi trả về đi theo cách đỡ đầu tiên của bên thủ ở mỗi bước;
+    nước a1 thắng với mọi cách đỡ.
+    """
+
+    def __init__(self, max_depth: int = VCT_MAX_DEPTH, max_nodes: int = VCT_MAX_NODES, tt_bits: int = VCT_TT_BITS):
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.tt = TranspositionTable(tt_bits)
+
+        self.nodes = 0
+        self.aborted = False
+        self._time_up: Optional[Callable[[], bool]] = None
+
+    # PUBLIC
+    def solve(self, board, attacker: str, time_up: Optional[Callable[[], bool]] = None) -> Optional[List[Move]]:
+        #attacker đang tới lượt
+        self.tt.new_search()
+        self.nodes = 0
+        self.aborted = False
+        self._time_up = time_up
+
+        defender = SYMBOL_O if attacker == SYMBOL_X else SYMBOL_X
+
+        wins = threat_cells(board, attacker, 4)
+        if wins:
+            return [next(iter(wins))]
+
+        threats = list(threat_cells(board, defender, 4))
+        return self._attack(board, attacker, defender, self.max_depth, threats)
+
+    # SEARCH
+    def _budget_out(self) -> bool:
+        self.nodes += 1
+        if self.nodes > self.max_nodes or (
+            self._time_up is not None and self.nodes & 63 == 0 and self._time_up()
+        ):
+            self.aborted = True
+        return self.aborted
+
+    def _attack(self, board, attacker: str, defender: str, depth: int, threats: List[Move]) -> Optional[List[Move]]:
+        #Lượt bên tấn công (OR node). threats = ô five của bên thủ, phải chặn
+        if depth <= 0 or len(threats) >= 2 or self._budget_out():
+            return None
+
+        key = board.hash ^ ATTACKER_KEYS[attacker]
+        first = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            e_depth, e_result, _, e_move = entry
+            if e_result == FAILED and e_depth >= depth:
+                self.tt.record_cutoff()
+                return None
+            if e_result == PROVEN and e_move != NO_MOVE:
+                first = divmod(e_move, board.cols)
+
+        moves = threats if threats else threat_moves(board, attacker)
+        if first in moves:
+            moves = [first] + [m for m in moves if m != first]
+
+        for move in moves:
+            r, c = move
+            board.place(r, c, attacker)
+            line = self._defend(board, attacker, defender, depth, move, forced=bool(threats))
+            board.remove(r, c)
+
+            if line is not None:
+                self.tt.store(key, depth, PROVEN, TT_EXACT, r * board.cols + c)
+                return [move] + line
+            if self.aborted:
+                return None
+
+        self.tt.store(key, depth, FAILED, TT_EXACT)
+        return None
+
+    def _defend(self, board, attacker: str, defender: str, depth: int, last: Move, forced: bool) -> Optional[List[Move]]:
+        """
+        Lượt bên thủ (AND node) ngay sau nước last của bên tấn công.
+        forced: last là nước chặn four của bên thủ → three cũ ở chỗ khác
+        có thể vẫn sống nên phải quét cả bàn; ngược lại chỉ cần 4 đường qua last
+        (bỏ sót three cũ chỉ làm kết luận thận trọng hơn, không sai).
+        """
+        if self._budget_out():
+            return None
+
+        replies = defense_replies(board, attacker, defender, last, local=not forced)
+        if replies is None:
+            # nước vừa đi không còn ép → mất quyền tấn công
+            return None
+
+        best: Optional[List[Move]] = None
+        for reply in replies:
+            r, c = reply
+            board.place(r, c, defender)
+            threats = list(threat_cells_through(board, r, c, defender, 4))
+            line = self._attack(board, attacker, defender, depth - 1, threats)
+            board.remove(r, c)
+
+            if line is None:
+                return None
+            if best is None:
+                best = [reply] + line
+
+        return best if best is not None else []
+
+
+# THREAT SPACE (dùng chung cho VCT và proof-number search)
+def threat_moves(board, attacker: str) -> List[Move]:
+    #Four trước (ép mạnh nhất), rồi three – ưu tiên ô tạo nhiều three cùng lúc
+    fours: Dict[Move, int] = threat_cells(board, attacker, 3)
+    moves = sorted(fours, key=lambda m: -fours[m])
+
+    threes: Dict[Move, int] = {}
+    for w in open_windows(board, attacker, 2):
+        for m in w[:2]:
+            if m not in fours:
+                threes[m] = threes.get(m, 0) + 1
+
+    def three_rank(m: Move) -> int:
+        k = sum(1 for t in threat_classes(board, m[0], m[1], attacker) if t in THREES)
+        return -(k * 10 + threes[m])
+
+    return moves + sorted(threes, key=three_rank)
+
+
+def defense_replies(board, attacker: str, defender: str, last: Optional[Move] = None, local: bool = False) -> Optional[List[Move]]:
+    """
+    Các cách đỡ của bên thủ sau nước last của bên tấn công.
+    - None: bên tấn công không còn đe doạ (không ép được)
+    - []:   bên tấn công thắng bất kể bên thủ đi gì
+    local=True → chỉ tìm three trên 4 đường qua last.
+    """
+    if last is not None:
+        wins = threat_cells_through(board, last[0], last[1], attacker, 4)
+    else:
+        wins = threat_cells(board, attacker, 4)
+
+    if len(wins) >= 2:
+        return []
+    if wins:
+        return list(wins)
+
+    windows = open_windows(board, attacker, 3, last if local else None)
+    if not windows:
+        return None
+
+    blocks = set(windows[0])
+    for w in windows[1:]:
+        blocks.intersection_update(w)
+
+    counter = threat_cells(board, defender, 3)
+    return sorted(blocks) + sorted(m for m in counter if m not in blocks)
@@ -0,0 +1,56 @@
+"""
+Chấm điểm toàn bàn bằng NumPy cho AINormal
+Thay vì đặt thử quân vào từng ô trống rồi đi 4 hướng (chain_around),
+tính 1 lần cho cả bàn: độ dài chuỗi qua mọi ô theo 4 hướng bằng các mảng dịch chuyển.
+
+NumPy là tuỳ chọn: không cài được thì HAS_NUMPY = False và AINormal dùng vòng lặp cũ.
+"""
+
+from __future__ import annotations
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from config.game_config import WIN_CONDITION
+
+HAS_NUMPY = np is not None
+
+# Chuỗi >= WIN_CONDITION là thắng → mỗi phía chỉ cần đếm tối đa WIN_CONDITION - 1 quân liên tiếp
+REACH = WIN_CONDITION - 1
+
+# (dr, dc) giống LINE_DIRECTIONS của Board
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def stone_mask(board, symbol):
+    #Mảng int8 rows × cols: 1 = quân symbol
+    return np.array([[cell == symbol for cell in row] for row in board.grid], dtype=np.int8)
+
+
+def chain_lengths(own):
+    """
+    Với mọi ô: độ dài chuỗi dài nhất qua ô đó (trong 4 hướng) nếu đặt quân vào ô
+    = 1 + số quân liên tiếp phía trước + phía sau, mỗi phía tối đa REACH.
+    Giống max(chain_around(r, c, d)[0]) của Board ở các ô trống.
+    """
+    rows, cols = own.shape
+    padded = np.zeros((rows + 2 * REACH, cols + 2 * REACH), dtype=np.int8)
+    padded[REACH:REACH + rows, REACH:REACH + cols] = own
+
+    def shifted(k, dr, dc):
+        r0, c0 = REACH + k * dr, REACH + k * dc
+        return padded[r0:r0 + rows, c0:c0 + cols]
+
+    best = np.zeros((rows, cols), dtype=np.int8)
+    for dr, dc in DIRECTIONS:
+        total = np.ones((rows, cols), dtype=np.int8)
+        for sign in (1, -1):
+            run = np.ones((rows, cols), dtype=np.int8)
+            for k in range(1, REACH + 1):
+                run &= shifted(sign * k, dr, dc)
+                total += run
+        np.maximum(best, total, out=best)
+    return best
+
@@ -0,0 +1,85 @@
+"""
+AIWorker: chạy ai.get_move trên luồng nền → GameScreen vẫn vẽ / nhận sự kiện trong lúc AI nghĩ
+- start(board, time_left): tìm trên bản sao bàn cờ (ván có thể Undo / Restart trong lúc AI nghĩ)
+- poll(): gọi mỗi frame, trả về (move, think_time) khi AI xong, ngược lại None
+- cancel(): huỷ lượt đang nghĩ và chờ luồng dừng, kết quả muộn bị bỏ
+- notify (tuỳ chọn): gọi từ luồng AI khi có kết quả → UI đang chờ sự kiện thức dậy ngay
+
+Dùng luồng chứ không dùng tiến trình: AI giữ trạng thái giữa các nước (TT, ponder, cây MCTS)
+và AIHard vẫn tự tìm song song bằng tiến trình phụ của nó nếu được bật.
+"""
+
+import queue
+import threading
+import time
+
+
+class AIWorker:
+    def __init__(self, ai, notify=None):
+        self.ai = ai
+        self.notify = notify
+        self.results = queue.SimpleQueue()
+        self.thread = None
+        # Mã lượt nghĩ hiện tại; kết quả mang mã cũ (lượt đã huỷ) bị bỏ
+        self.job = 0
+
+    @property
+    def busy(self):
+        return self.thread is not None
+
+    def start(self, board, time_left=None):
+        self.cancel()
+        self.job += 1
+        self.ai.time_left = time_left
+        self.thread = threading.Thread(
+            target=self._run,
+            args=(self.job, board.copy()),
+            name="caro-ai",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def _run(self, job, board):
+        start = time.time()
+        try:
+            move, error = self.ai.get_move(board), None
+        except Exception as exc:
+            # đưa lỗi về luồng UI thay vì để UI chờ mãi
+            move, error = None, exc
+        self.results.put((job, move, time.time() - start, error))
+        if self.notify is not None:
+            self.notify()
+
+    def poll(self):
+        if self.thread is None:
+            return None
+        while True:
+            try:
+                job, move, think_time, error = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            if job == self.job:
+                break
+
+        self.thread.join()
+        self.thread = None
+        if error is not None:
+            raise error
+        return move, think_time
+
+    def cancel(self):
+        thread = self.thread
+        if thread is None:
+            return
+        self.job += 1
+        # cancel lặp lại: lần gọi trước khi get_move kịp control.start() sẽ bị start() xoá
+        while thread.is_alive():
+            self.ai.cancel()
+            thread.join(0.01)
+        self.thread = None
+
+        while True:
+            try:
+                self.results.get_nowait()
+            except queue.Empty:
+                break
@@ -1,8 +1,48 @@
-from config.game_config import BOARD_ROWS, BOARD_COLS, WIN_CONDITION
+import random
+
+from config.game_config import (
+    BOARD_ROWS,
+    BOARD_COLS,
+    WIN_CONDITION,
+    BOARD_STORAGE,
+    STORAGE_BITBOARD,
+)
+from src.core.constants import SYMBOL_X, SYMBOL_O
+from src.core.threat_tracker import ThreatTracker
+
+
+# Bán kính lớn nhất của vùng ứng viên (frontier) quanh quân đã đặt
+FRONTIER_RADIUS = 2
+
+# Seed cố định → mọi Board (và mọi tiến trình) dùng chung một bộ khoá Zobrist
+ZOBRIST_SEED = 0xCA2019
+_ZOBRIST_CACHE = {}
+
+
+def zobrist_keys(size):
+    #Khoá 64-bit ngẫu nhiên cho từng (quân, ô)
+    keys = _ZOBRIST_CACHE.get(size)
+    if keys is None:
+        rng = random.Random(ZOBRIST_SEED)
+        keys = {
+            sym: [rng.getrandbits(64) for _ in range(size)]
+            for sym in (SYMBOL_X, SYMBOL_O)
+        }
+        _ZOBRIST_CACHE[size] = keys
+    return keys
+
+
+# Thứ tự hướng dùng chung cho check_win / chain_around
+LINE_DIRECTIONS = [
+    (0, 1),    # ngang
+    (1, 0),    # dọc
+    (1, 1),    # chéo ↘
+    (1, -1),   # chéo ↗
+]
 
 
 class Board:
-    def __init__(self):
+    def __init__(self, storage=BOARD_STORAGE):
         self.rows = BOARD_ROWS
         self.cols = BOARD_COLS
         self.grid = [
@@ -10,6 +50,25 @@ class Board:
             for _ in range(self.rows)
         ]
 
+        self._init_lines()
+        self._init_frontier()
+
+        # Zobrist hash của thế cờ, cập nhật XOR trong place/remove
+        self.zobrist = zobrist_keys(self.rows * self.cols)
+        self.hash = 0
+
+        self.storage = storage
+        self.use_bitboard = storage == STORAGE_BITBOARD
+        if self.use_bitboard:
+            self._init_bitboards()
+
+        # ThreatTracker, tạo ở lần gọi threats() đầu tiên
+        self._threats = None
+
+        # Số quân trên bàn (tổng và theo bên), cập nhật trong place/remove
+        self.stones = 0
+        self.counts = {SYMBOL_X: 0, SYMBOL_O: 0}
+
     # BASIC
     def reset(self):
         #Reset toàn bộ bàn cờ
@@ -17,6 +76,15 @@ class Board:
             for c in range(self.cols):
                 self.grid[r][c] = None
 
+        self._clear_frontier()
+        self.hash = 0
+        self.stones = 0
+        self.counts = {SYMBOL_X: 0, SYMBOL_O: 0}
+        if self.use_bitboard:
+            self._clear_bitboards()
+        if self._threats is not None:
+            self._threats.rebuild()
+
     def is_inside(self, row, col):
         #Kiểm tra ô có nằm trong bàn không
         return 0 <= row < self.rows and 0 <= col < self.cols
@@ -32,6 +100,14 @@ class Board:
             return False
 
         self.grid[row][col] = symbol
+        self.hash ^= self.zobrist[symbol][row * self.cols + col]
+        self.stones += 1
+        self.counts[symbol] += 1
+        self._frontier_place(row, col)
+        if self.use_bitboard:
+            self._toggle_bits(row, col, symbol)
+        if self._threats is not None:
+            self._threats.touch(row * self.cols + col)
         return True
 
     def remove(self, row, col):
@@ -40,48 +116,410 @@ class Board:
         if not self.is_inside(row, col):
             return False
 
+        symbol = self.grid[row][col]
+        if symbol is None:
+            return True
+
         self.grid[row][col] = None
+        self.hash ^= self.zobrist[symbol][row * self.cols + col]
+        self.stones -= 1
+        self.counts[symbol] -= 1
+        self._frontier_remove(row, col)
+        if self.use_bitboard:
+            self._toggle_bits(row, col, symbol)
+        if self._threats is not None:
+            self._threats.touch(row * self.cols + col)
         return True
 
-    # WIN CHECK
-    def check_win(self, row, col, symbol):
-        if not self.is_inside(row, col):
-            return None
+    def copy(self):
+        #Bản sao độc lập (cho luồng tìm kiếm nền không đụng bàn cờ của ván)
+        other = Board(self.storage)
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if self.grid[r][c] is not None:
+                    other.place(r, c, self.grid[r][c])
+        return other
 
-        directions = [
-            (0, 1),    # ngang
-            (1, 0),    # dọc
-            (1, 1),    # chéo
-            (1, -1),   # chéo
+    # THREATS
+    def threats(self):
+        """
+        ThreatTracker của bàn cờ (src/core/threat_tracker.py), đã sync với thế cờ hiện tại.
+        Chỉ bàn nào được hỏi mới phải theo dõi threat.
+        """
+        if self._threats is None:
+            self._threats = ThreatTracker(self)
+        else:
+            self._threats.sync()
+        return self._threats
+
+    # FRONTIER
+    def _init_frontier(self):
+        """
+        near[radius][ô] = số quân nằm trong ô vuông bán kính radius quanh ô.
+        frontier[radius] = các ô trống có near > 0, cập nhật trong place/remove.
+        """
+        cols = self.cols
+        # ring[radius][ô] = [((r, c), idx)] các ô lân cận (không gồm chính ô đó)
+        self._rings = {}
+        for radius in range(1, FRONTIER_RADIUS + 1):
+            rings = []
+            for r in range(self.rows):
+                for c in range(cols):
+                    cells = []
+                    for dr in range(-radius, radius + 1):
+                        for dc in range(-radius, radius + 1):
+                            rr, cc = r + dr, c + dc
+                            if (dr or dc) and self.is_inside(rr, cc):
+                                cells.append(((rr, cc), rr * cols + cc))
+                    rings.append(cells)
+            self._rings[radius] = rings
+
+        self._clear_frontier()
+
+    def _clear_frontier(self):
+        size = self.rows * self.cols
+        self._near = {
+            radius: [0] * size
+            for radius in range(1, FRONTIER_RADIUS + 1)
+        }
+        self._frontier = {
+            radius: set()
+            for radius in range(1, FRONTIER_RADIUS + 1)
+        }
+
+    def _frontier_place(self, row, col):
+        #O(radius²): gọi sau khi đã ghi quân vào grid
+        idx = row * self.cols + col
+        grid = self.grid
+
+        for radius, front in self._frontier.items():
+            near = self._near[radius]
+            near[idx] += 1
+            front.discard((row, col))
+
+            for cell, i in self._rings[radius][idx]:
+                near[i] += 1
+                # ô vừa lọt vào vùng ảnh hưởng
+                if near[i] == 1 and grid[cell[0]][cell[1]] is None:
+                    front.add(cell)
+
+    def _frontier_remove(self, row, col):
+        #O(radius²): gọi sau khi đã xoá quân khỏi grid
+        idx = row * self.cols + col
+
+        for radius, front in self._frontier.items():
+            near = self._near[radius]
+            near[idx] -= 1
+            if near[idx] > 0:
+                front.add((row, col))
+
+            for cell, i in self._rings[radius][idx]:
+                near[i] -= 1
+                if near[i] == 0:
+                    front.discard(cell)
+
+    def frontier(self, radius=FRONTIER_RADIUS):
+        #Duyệt các ô trống cách quân gần nhất không quá radius ô (1..FRONTIER_RADIUS)
+        return iter(self._frontier[radius])
+
+    def is_near(self, row, col, radius=FRONTIER_RADIUS):
+        #Ô trống thuộc frontier bán kính radius
+        return (row, col) in self._frontier[radius]
+
+    def frontier_size(self, radius=FRONTIER_RADIUS):
+        return len(self._frontier[radius])
+
+    # LINES
+    def _init_lines(self):
+        """
+        Đánh số các đường: hướng d (theo LINE_DIRECTIONS), chỉ số line, vị trí pos.
+        - cell_lines[ô][d] = (line, pos)
+        - line_cells[d][line] = [(r, c)] theo thứ tự pos
+        - line_valid[d][line] = mặt nạ các pos có thật (đường chéo ngắn hơn)
+        """
+        rows, cols = self.rows, self.cols
+        self.line_counts = (rows, cols, rows + cols - 1, rows + cols - 1)
+
+        # ô -> [(line, pos)] cho 4 hướng
+        self.cell_lines = []
+        for r in range(rows):
+            for c in range(cols):
+                self.cell_lines.append((
+                    (r, c),
+                    (c, r),
+                    (c - r + rows - 1, r),
+                    (r + c, r),
+                ))
+
+        self.line_valid = [[0] * n for n in self.line_counts]
+        self.line_cells = [[[] for _ in range(n)] for n in self.line_counts]
+        for idx, lines in enumerate(self.cell_lines):
+            for d, (line, pos) in enumerate(lines):
+                self.line_valid[d][line] |= 1 << pos
+                self.line_cells[d][line].append(divmod(idx, cols))
+
+    def cell_on_line(self, d, line, pos):
+        #Ngược với cell_lines: (d, line, pos) -> (row, col)
+        if d == 0:
+            return line, pos
+        if d == 1:
+            return pos, line
+        if d == 2:
+            return pos, line - (self.rows - 1) + pos
+        return pos, line - pos
+
+    def line_mask(self, d, line, symbol):
+        #Mặt nạ quân symbol trên đường (d, line), dùng được ở cả 2 chế độ
+        if self.use_bitboard:
+            return self.line_bits[symbol][d][line]
+
+        mask = 0
+        for r, c in self.line_cells[d][line]:
+            if self.grid[r][c] == symbol:
+                mask |= 1 << self.cell_lines[r * self.cols + c][d][1]
+        return mask
+
+    def line_masks(self, symbol):
+        #line_masks(symbol)[d][line] – bitboard: tham chiếu trực tiếp, không được sửa
+        if self.use_bitboard:
+            return self.line_bits[symbol]
+        return [
+            [self.line_mask(d, line, symbol) for line in range(n)]
+            for d, n in enumerate(self.line_counts)
         ]
 
-        for dr, dc in directions:
-            cells = [(row, col)]
+    # BITBOARD
+    def _init_bitboards(self):
+        """
+        Mỗi bên có:
+        - bits[symbol]: 1 số nguyên cho cả bàn, ô (r, c) ở bit r * stride + c.
+          stride = cols + 1 → thêm 1 cột đệm luôn = 0 để phép dịch không
+          tràn sang hàng kế tiếp.
+        - line_bits[symbol][d][line]: mặt nạ theo từng hàng / cột / đường chéo,
+          bit thứ pos là ô thứ pos trên đường đó (đi theo LINE_DIRECTIONS[d]).
+        """
+        self.stride = self.cols + 1
+        self.shifts = (1, self.stride, self.stride + 1, self.stride - 1)
 
-            # Đi xuôi
-            r, c = row + dr, col + dc
+        self._clear_bitboards()
+
+    def _clear_bitboards(self):
+        self.bits = {SYMBOL_X: 0, SYMBOL_O: 0}
+        self.line_bits = {
+            sym: [[0] * n for n in self.line_counts]
+            for sym in (SYMBOL_X, SYMBOL_O)
+        }
+
+    def _toggle_bits(self, row, col, symbol):
+        #Bật / tắt bit của ô (gọi sau khi grid đã đổi)
+        self.bits[symbol] ^= 1 << (row * self.stride + col)
+        lines = self.line_bits[symbol]
+        for d, (line, pos) in enumerate(self.cell_lines[row * self.cols + col]):
+            lines[d][line] ^= 1 << pos
+
+    def _run_on_line(self, row, col, d, symbol):
+        """
+        Chuỗi liên tiếp của symbol đi qua (row, col) theo hướng d,
+        coi như (row, col) đã là symbol.
+        Trả về (line, start, end, own) – start/end là pos đầu/cuối chuỗi.
+        """
+        line, pos = self.cell_lines[row * self.cols + col][d]
+        own = self.line_bits[symbol][d][line] | (1 << pos)
+
+        # đếm số bit 1 liên tiếp từ pos đi lên
+        x = own >> pos
+        fwd = (x ^ (x + 1)).bit_length() - 1
+
+        # đếm số bit 1 liên tiếp ngay dưới pos
+        below = (1 << pos) - 1
+        holes = ~own & below
+        back = pos - holes.bit_length() if holes else pos
+
+        return line, pos - back, pos + fwd - 1, own
+
+    # PATTERN CHECK
+    def chain_around(self, row, col, d, symbol):
+        """
+        Độ dài chuỗi qua (row, col) theo LINE_DIRECTIONS[d] và số đầu trống,
+        coi như (row, col) đã là symbol. Trả về (count, open_ends).
+        """
+        if not self.use_bitboard:
+            return self._chain_around_grid(row, col, d, symbol)
+
+        line, start, end, own = self._run_on_line(row, col, d, symbol)
+
+        other = SYMBOL_O if symbol == SYMBOL_X else SYMBOL_X
+        empty = (
+            self.line_valid[d][line]
+            & ~own
+            & ~self.line_bits[other][d][line]
+        )
+
+        open_ends = (empty >> (end + 1)) & 1
+        if start > 0:
+            open_ends += (empty >> (start - 1)) & 1
+
+        return end - start + 1, open_ends
+
+    def line_window(self, row, col, d, symbol, half=4):
+        """
+        Cửa sổ 2*half+1 ô quanh (row, col) theo hướng d, coi (row, col) là symbol.
+        Trả về (own, empty): bit k ứng với ô thứ k - half tính từ (row, col);
+        ô của đối thủ hoặc ngoài bàn có cả 2 bit = 0.
+        """
+        width = 2 * half + 1
+
+        if not self.use_bitboard:
+            dr, dc = LINE_DIRECTIONS[d]
+            own = empty = 0
+            for k in range(width):
+                r, c = row + (k - half) * dr, col + (k - half) * dc
+                if not self.is_inside(r, c):
+                    continue
+                cell = self.grid[r][c]
+                if k == half or cell == symbol:
+                    own |= 1 << k
+                elif cell is None:
+                    empty |= 1 << k
+            return own, empty
+
+        line, pos = self.cell_lines[row * self.cols + col][d]
+        other = SYMBOL_O if symbol == SYMBOL_X else SYMBOL_X
+        own = self.line_bits[symbol][d][line] | (1 << pos)
+        empty = (
+            self.line_valid[d][line]
+            & ~own
+            & ~self.line_bits[other][d][line]
+        )
+
+        mask = (1 << width) - 1
+        shift = pos - half
+        if shift >= 0:
+            return (own >> shift) & mask, (empty >> shift) & mask
+        return (own << -shift) & mask, (empty << -shift) & mask
+
+    def _chain_around_grid(self, row, col, d, symbol):
+        dr, dc = LINE_DIRECTIONS[d]
+        cnt = 1
+        open_ends = 0
+
+        for sr, sc in ((dr, dc), (-dr, -dc)):
+            r, c = row + sr, col + sc
             while self.is_inside(r, c) and self.grid[r][c] == symbol:
-                cells.append((r, c))
+                cnt += 1
+                r += sr
+                c += sc
+            if self.is_inside(r, c) and self.grid[r][c] is None:
+                open_ends += 1
+
+        return cnt, open_ends
+
+    def has_five(self, symbol):
+        #Bên symbol đã có WIN_CONDITION quân liên tiếp ở đâu đó chưa
+        if not self.use_bitboard:
+            for r in range(self.rows):
+                for c in range(self.cols):
+                    if self.grid[r][c] == symbol and self.is_win(r, c, symbol):
+                        return True
+            return False
+
+        b = self.bits[symbol]
+        for s in self.shifts:
+            m = b
+            for k in range(1, WIN_CONDITION):
+                m &= b >> (s * k)
+                if not m:
+                    break
+            if m:
+                return True
+        return False
+
+    # WIN CHECK
+    def is_win(self, row, col, symbol):
+        """
+        Bản chỉ trả lời có / không của check_win: không dựng list ô, không gọi hàm phụ,
+        dùng trong vòng lặp nóng (AI, kiểm tra kết thúc ván).
+        Đi thẳng trên grid ở cả 2 chế độ: phần lớn ô chỉ cần vài phép so sánh là dừng,
+        nhanh hơn dựng mặt nạ đường của bitboard.
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+
+        grid = self.grid
+        rows, cols = self.rows, self.cols
+        for dr, dc in LINE_DIRECTIONS:
+            count = 1
+            r, c = row + dr, col + dc
+            while 0 <= r < rows and 0 <= c < cols and grid[r][c] == symbol:
+                count += 1
                 r += dr
                 c += dc
-
-            # Đi ngược
             r, c = row - dr, col - dc
-            while self.is_inside(r, c) and self.grid[r][c] == symbol:
-                cells.insert(0, (r, c))
+            while 0 <= r < rows and 0 <= c < cols and grid[r][c] == symbol:
+                count += 1
                 r -= dr
                 c -= dc
+            if count >= WIN_CONDITION:
+                return True
+        return False
 
-            if len(cells) >= WIN_CONDITION:
-                return cells[:WIN_CONDITION]
+    def check_win(self, row, col, symbol):
+        #WIN_CONDITION ô thắng qua (row, col), hoặc None – list chỉ dựng khi is_win đã xác nhận thắng
+        if not self.is_win(row, col, symbol):
+            return None
+
+        if self.use_bitboard:
+            return self._check_win_bits(row, col, symbol)
+
+        for d, (dr, dc) in enumerate(LINE_DIRECTIONS):
+            count, back = self._run_length(row, col, d, symbol)
+            if count >= WIN_CONDITION:
+                r, c = row - back * dr, col - back * dc
+                return [(r + k * dr, c + k * dc) for k in range(WIN_CONDITION)]
 
         return None
 
+    def _run_length(self, row, col, d, symbol):
+        #(độ dài chuỗi symbol qua (row, col) theo hướng d, số ô phía ngược) – chỉ đếm, không cấp phát
+        dr, dc = LINE_DIRECTIONS[d]
+        grid = self.grid
+        rows, cols = self.rows, self.cols
+
+        fwd = 0
+        r, c = row + dr, col + dc
+        while 0 <= r < rows and 0 <= c < cols and grid[r][c] == symbol:
+            fwd += 1
+            r += dr
+            c += dc
+
+        back = 0
+        r, c = row - dr, col - dc
+        while 0 <= r < rows and 0 <= c < cols and grid[r][c] == symbol:
+            back += 1
+            r -= dr
+            c -= dc
+
+        return 1 + fwd + back, back
+
+    def _check_win_bits(self, row, col, symbol):
+        for d in range(4):
+            line, start, end, _ = self._run_on_line(row, col, d, symbol)
+            if end - start + 1 >= WIN_CONDITION:
+                return [
+                    self.cell_on_line(d, line, pos)
+                    for pos in range(start, start + WIN_CONDITION)
+                ]
+        return None
+
+
+    # OCCUPANCY (O(1) nhờ bộ đếm trong place/remove)
+    def stone_count(self, symbol=None):
+        if symbol is None:
+            return self.stones
+        return self.counts[symbol]
+
+    def has_pieces(self):
+        return self.stones > 0
 
-    # FULL CHECK
     def is_full(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.grid[r][c] is None:
-                    return False
-        return True
+        return self.stones == self.rows * self.cols
@@ -23,6 +23,7 @@ ACTION_PVE = "PVE"
 ACTION_EASY = "EASY"
 ACTION_NORMAL = "NORMAL"
 ACTION_HARD = "HARD"
+ACTION_MCTS = "MCTS"
 
 ACTION_RESTART = "RESTART"
 ACTION_HOME = "HOME"
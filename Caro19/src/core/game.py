@@ -12,6 +12,8 @@ from src.core.constants import (
 from src.ai.ai_easy import AIEasy
 from src.ai.ai_normal import AINormal
 from src.ai.ai_hard import AIHard
+from src.ai.ai_mcts import AIMcts
+from src.core.ai_worker import AIWorker
 
 from config.game_config import (
     PLAYER_TIME_LIMIT,
@@ -21,7 +23,8 @@ from config.game_config import (
 
 
 class Game:
-    def __init__(self, mode, ai_level=None):
+    def __init__(self, mode, ai_level=None, ai_notify=None):
+        #ai_notify: gọi từ luồng AI khi AIWorker có kết quả (UI dùng để thức dậy)
         self.mode = mode
         self.ai_level = ai_level
 
@@ -30,8 +33,10 @@ class Game:
         self.player_o = Player(SYMBOL_O)
 
         self.ai = None
+        self.worker = None
         if self.mode == MODE_PVE:
             self._init_ai()
+            self.worker = AIWorker(self.ai, ai_notify)
 
         self.reset()
 
@@ -43,11 +48,14 @@ class Game:
             self.ai = AINormal(SYMBOL_O)
         elif self.ai_level == "HARD":
             self.ai = AIHard(SYMBOL_O)
+        elif self.ai_level == "MCTS":
+            self.ai = AIMcts(SYMBOL_O)
         else:
             self.ai = AIEasy(SYMBOL_O)
 
     # RESET GAME
     def reset(self):
+        self._stop_ai()
         self.board.reset()
         self.current_player = SYMBOL_X
         self.game_over = False
@@ -82,8 +90,15 @@ class Game:
 
         if self.time_left[self.current_player] <= 0:
             self.time_left[self.current_player] = 0
-            self.game_over = True
-            self.winner = SYMBOL_O if self.current_player == SYMBOL_X else SYMBOL_X
+            self._finish(SYMBOL_O if self.current_player == SYMBOL_X else SYMBOL_X)
+
+    def _finish(self, winner, win_cells=None):
+        #Kết thúc ván (thắng / hoà / hết giờ) – huỷ luôn ponder / lượt nghĩ của AI cho thế cờ không còn dùng
+        self.game_over = True
+        self.winner = winner
+        self.win_cells = win_cells
+        self._stop_ai()
+
     def _save_state(self, row, col, symbol):
         self.move_history.append({
             "row": row,
@@ -96,7 +111,7 @@ class Game:
 
     # PLAYER MOVE
     def make_move(self, row, col):
-        if self.game_over:
+        if self.game_over or self._ai_turn():
             return False
 
         if not self.board.place(row, col, self.current_player):
@@ -107,39 +122,71 @@ class Game:
 
         win_cells = self.board.check_win(row, col, self.current_player)
         if win_cells:
-            self.game_over = True
-            self.winner = self.current_player
-            self.win_cells = win_cells
+            self._finish(self.current_player, win_cells)
             return True
 
         if self.board.is_full():
-            self.game_over = True
-            self.winner = None
+            self._finish(None)
             return True
 
         self._switch_turn()
         return True
 
 
+    def _ai_turn(self):
+        #PVE: lượt của AI (kể cả lúc AIWorker đang nghĩ) → người chơi không được đặt quân / Redo
+        return self.mode == MODE_PVE and (self.current_player == SYMBOL_O or self.ai_busy)
+
+
     # AI MOVE (REAL TIME)
-    def ai_move(self):
-        if (
+    def _can_ai_move(self):
+        return not (
             self.game_over
             or self.mode != MODE_PVE
             or self.ai is None
             or self.current_player != SYMBOL_O
-        ):
+        )
+
+    def _ai_time_left(self):
+        return self.time_left[SYMBOL_O] if ENABLE_TIME_CONTROL else None
+
+    def ai_move(self):
+        #Chạy AI ngay trên luồng gọi (script / benchmark); UI dùng start_ai_move + poll_ai_move
+        if not self._can_ai_move():
             return False
+        self.ai.time_left = self._ai_time_left()
         start = time.time()
         row, col = self.ai.get_move(self.board)
-        think_time = time.time() - start
+        return self._apply_ai_move(row, col, time.time() - start)
 
+    # AI MOVE (NON-BLOCKING)
+    @property
+    def ai_busy(self):
+        return self.worker is not None and self.worker.busy
+
+    def start_ai_move(self):
+        #AI bắt đầu nghĩ trên luồng nền (AIWorker), bàn cờ của ván không bị đụng tới
+        if not self._can_ai_move() or self.ai_busy:
+            return False
+        self.worker.start(self.board, self._ai_time_left())
+        return True
+
+    def poll_ai_move(self):
+        #Gọi mỗi frame: True khi AI đã xong và nước được đặt lên bàn
+        if not self.ai_busy:
+            return False
+        result = self.worker.poll()
+        if result is None:
+            return False
+        (row, col), think_time = result
+        return self._apply_ai_move(row, col, think_time)
+
+    def _apply_ai_move(self, row, col, think_time):
         if ENABLE_TIME_CONTROL:
             self.time_left[SYMBOL_O] -= think_time
             if self.time_left[SYMBOL_O] <= 0:
                 self.time_left[SYMBOL_O] = 0
-                self.game_over = True
-                self.winner = SYMBOL_X
+                self._finish(SYMBOL_X)
                 return False
 
         if row is None:
@@ -153,17 +200,17 @@ class Game:
 
         win_cells = self.board.check_win(row, col, SYMBOL_O)
         if win_cells:
-            self.game_over = True
-            self.winner = SYMBOL_O
-            self.win_cells = win_cells
+            self._finish(SYMBOL_O, win_cells)
             return True
 
         if self.board.is_full():
-            self.game_over = True
-            self.winner = None
+            self._finish(None)
             return True
 
         self._switch_turn()
+        # AI nghĩ trước trong lúc người chơi nghĩ (ván đã xong thì thôi)
+        if not self.game_over:
+            self.ai.ponder(self.board)
         return True
 
 
@@ -174,15 +221,24 @@ class Game:
         )
         self.last_tick = time.time()
 
+    # PONDER / WORKER
+    def _stop_ai(self):
+        #Huỷ lượt AI đang nghĩ (nếu có) và ponder – thế cờ sắp đổi ngoài ý AI
+        if self.worker is not None:
+            self.worker.cancel()
+        if self.ai is not None:
+            self.ai.stop_pondering()
+
     # UNDO / REDO
     def undo(self):
         if not self.move_history:
             return False
 
+        self._stop_ai()
         state = self.move_history.pop()
         self.redo_stack.append(state)
 
-        self.board.grid[state["row"]][state["col"]] = None
+        self.board.remove(state["row"], state["col"])
         self.current_player = state["symbol"]
         self.last_move = None
         self.last_tick = time.time()
@@ -193,13 +249,14 @@ class Game:
         return True
 
     def redo(self):
-        if not self.redo_stack:
+        if not self.redo_stack or self._ai_turn():
             return False
 
+        self._stop_ai()
         state = self.redo_stack.pop()
         self.move_history.append(state)
 
-        self.board.grid[state["row"]][state["col"]] = state["symbol"]
+        self.board.place(state["row"], state["col"], state["symbol"])
         self.current_player = (
             SYMBOL_O if state["symbol"] == SYMBOL_X else SYMBOL_X
         )
@@ -207,6 +264,14 @@ class Game:
         self.last_tick = time.time()
         return True
 
+    # CLEANUP
+    def close(self):
+        #Gọi khi bỏ ván (Restart / Home / Quit)
+        if self.worker is not None:
+            self.worker.cancel()
+        if self.ai is not None:
+            self.ai.close()
+
     # IN-GAME EXIT
     def can_exit_game(self):
         return ENABLE_IN_GAME_EXIT
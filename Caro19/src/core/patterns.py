@@ -0,0 +1,248 @@
+"""
+Bảng tra pattern cho AIHard
+Mỗi cửa sổ 9 ô (4 ô mỗi bên + ô đang xét) theo một hướng được mã hoá
+thành 1 số nguyên: code = (own << 9) | empty  (xem Board.line_window).
+Bảng được biên dịch 1 lần lúc import, sau đó mọi phép phân loại
+threat chỉ còn là 1 lần index.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+# THREAT CLASSES (số lớn hơn = nguy hiểm hơn)
+NONE = 0
+TWO = 1
+BROKEN_THREE = 2    # _X_XX_
+OPEN_THREE = 3      # _XXX_
+SPLIT_FOUR = 4      # XX_XX, X_XXX (1 cách thành 5)
+FOUR = 5            # OXXXX_ (1 cách thành 5)
+OPEN_FOUR = 6       # _XXXX_ (>= 2 cách thành 5)
+FIVE = 7
+
+THREES = (BROKEN_THREE, OPEN_THREE)
+FOURS = (SPLIT_FOUR, FOUR)
+
+HALF = 4
+WIDTH = 2 * HALF + 1
+CODE_BITS = WIDTH
+
+_EMPTY, _OWN, _BLOCK = 0, 1, 2
+
+
+def _has_five(cells: Tuple[int, ...]) -> bool:
+    #5 quân liên tiếp có chứa ô giữa
+    for start in range(HALF - 4, HALF + 1):
+        if all(cells[i] == _OWN for i in range(start, start + 5)):
+            return True
+    return False
+
+
+def _run_through_center(cells: Tuple[int, ...]) -> Tuple[int, int, int]:
+    #(độ dài chuỗi liên tiếp qua ô giữa, pos đầu, pos cuối)
+    lo = HALF
+    while lo > 0 and cells[lo - 1] == _OWN:
+        lo -= 1
+    hi = HALF
+    while hi < WIDTH - 1 and cells[hi + 1] == _OWN:
+        hi += 1
+    return hi - lo + 1, lo, hi
+
+
+def _with(cells: Tuple[int, ...], i: int) -> Tuple[int, ...]:
+    return cells[:i] + (_OWN,) + cells[i + 1:]
+
+
+def _classify(cells: Tuple[int, ...], memo: Dict[Tuple[int, ...], int]) -> int:
+    cls = memo.get(cells)
+    if cls is not None:
+        return cls
+
+    empties = [i for i in range(WIDTH) if cells[i] == _EMPTY]
+    run, _, _ = _run_through_center(cells)
+
+    if _has_five(cells):
+        cls = FIVE
+    else:
+        wins = [i for i in empties if _has_five(_with(cells, i))]
+        if len(wins) >= 2:
+            cls = OPEN_FOUR
+        elif wins:
+            cls = FOUR if run >= 4 else SPLIT_FOUR
+        else:
+            nexts = [_classify(_with(cells, i), memo) for i in empties]
+            if OPEN_FOUR in nexts:
+                cls = OPEN_THREE if run >= 3 else BROKEN_THREE
+            elif any(n in THREES for n in nexts):
+                cls = TWO
+            else:
+                cls = NONE
+
+    memo[cells] = cls
+    return cls
+
+
+def _chain_bonus(cells: Tuple[int, ...]) -> int:
+    #cnt² * (3 nếu 2 đầu trống) – giống _local_chain_bonus cũ
+    cnt, lo, hi = _run_through_center(cells)
+    open_ends = 0
+    if lo > 0 and cells[lo - 1] == _EMPTY:
+        open_ends += 1
+    if hi < WIDTH - 1 and cells[hi + 1] == _EMPTY:
+        open_ends += 1
+    return cnt * cnt * (3 if open_ends == 2 else 1)
+
+
+def compile_tables() -> Tuple[bytearray, bytearray]:
+    """
+    Duyệt 3^8 cách xếp 8 ô quanh ô giữa (ô giữa luôn là own).
+    Trả về (THREAT_TABLE, CHAIN_BONUS), cùng index theo code.
+    """
+    threat = bytearray(1 << (2 * CODE_BITS))
+    bonus = bytearray(1 << (2 * CODE_BITS))
+    memo: Dict[Tuple[int, ...], int] = {}
+
+    others = WIDTH - 1
+    for n in range(3 ** others):
+        states = []
+        for _ in range(others):
+            n, st = divmod(n, 3)
+            states.append(st)
+        cells = tuple(states[:HALF]) + (_OWN,) + tuple(states[HALF:])
+
+        own = empty = 0
+        for i, st in enumerate(cells):
+            if st == _OWN:
+                own |= 1 << i
+            elif st == _EMPTY:
+                empty |= 1 << i
+
+        code = (own << CODE_BITS) | empty
+        threat[code] = _classify(cells, memo)
+        bonus[code] = _chain_bonus(cells)
+
+    return threat, bonus
+
+
+THREAT_TABLE, CHAIN_BONUS = compile_tables()
+
+
+# LOOKUP
+def window_codes(board, row: int, col: int, sym: str) -> List[int]:
+    #Code của 4 cửa sổ qua (row, col), coi (row, col) là quân sym
+    codes = []
+    for d in range(4):
+        own, empty = board.line_window(row, col, d, sym, HALF)
+        codes.append((own << CODE_BITS) | empty)
+    return codes
+
+
+def threat_classes(board, row: int, col: int, sym: str) -> List[int]:
+    return [THREAT_TABLE[code] for code in window_codes(board, row, col, sym)]
+
+
+# 5-WINDOW SCAN
+# Mọi four là 1 cửa sổ 5 ô liên tiếp có 4 quân + 1 ô trống, không có quân đối thủ.
+# → ô tạo five  = ô trống trong cửa sổ có 4 quân (stones=4)
+# → ô tạo four  = ô trống trong cửa sổ có 3 quân (stones=3)
+def _scan_line(board, d: int, line: int, own: int, other: int, stones: int, out: Dict[Tuple[int, int], int]) -> None:
+    valid = board.line_valid[d][line]
+    free = valid & ~other
+    lo = (valid & -valid).bit_length() - 1
+    hi = valid.bit_length() - 5
+
+    for start in range(lo, hi + 1):
+        if (free >> start) & 31 != 31:
+            continue
+        w = (own >> start) & 31
+        if w.bit_count() != stones:
+            continue
+        holes = ~w & 31
+        while holes:
+            low = holes & -holes
+            cell = board.cell_on_line(d, line, start + low.bit_length() - 1)
+            out[cell] = out.get(cell, 0) + 1
+            holes ^= low
+
+
+def threat_cells(board, sym: str, stones: int) -> Dict[Tuple[int, int], int]:
+    """
+    Các ô trống mà nếu sym đặt vào sẽ có cửa sổ 5 ô chứa stones + 1 quân.
+    Trả về {ô: số cửa sổ} – số cửa sổ lớn → ô tạo nhiều đe doạ cùng lúc.
+    """
+    own_lines = board.line_masks(sym)
+    other_lines = board.line_masks("O" if sym == "X" else "X")
+    out: Dict[Tuple[int, int], int] = {}
+    for d in range(4):
+        others = other_lines[d]
+        for line, own in enumerate(own_lines[d]):
+            if own.bit_count() >= stones:
+                _scan_line(board, d, line, own, others[line], stones, out)
+    return out
+
+
+def threat_cells_through(board, row: int, col: int, sym: str, stones: int) -> Dict[Tuple[int, int], int]:
+    #Như threat_cells nhưng chỉ xét 4 đường đi qua (row, col)
+    other_sym = "O" if sym == "X" else "X"
+    out: Dict[Tuple[int, int], int] = {}
+    for d, (line, _) in enumerate(board.cell_lines[row * board.cols + col]):
+        own = board.line_mask(d, line, sym)
+        if own.bit_count() < stones:
+            continue
+        _scan_line(board, d, line, own, board.line_mask(d, line, other_sym), stones, out)
+    return out
+
+
+# 6-WINDOW SCAN (three)
+# Three = cửa sổ 6 ô, 2 đầu trống, 4 ô giữa có 3 quân + 1 ô trống, không có quân đối thủ
+# → lấp ô trống giữa thành straight four _XXXX_.
+def _open_windows(board, d: int, line: int, own: int, other: int, stones: int, out: List[Tuple[int, int, int]]) -> None:
+    valid = board.line_valid[d][line]
+    free = valid & ~other
+    lo = (valid & -valid).bit_length() - 1
+    hi = valid.bit_length() - 6
+
+    for start in range(lo, hi + 1):
+        if (free >> start) & 63 != 63 or (own >> start) & 33:
+            continue
+        if ((own >> (start + 1)) & 15).bit_count() == stones:
+            out.append((d, line, start))
+
+
+def open_windows(board, sym: str, stones: int, through: Optional[Tuple[int, int]] = None) -> List[List[Tuple[int, int]]]:
+    """
+    Các cửa sổ 6 ô kiểu _????_ có đúng stones quân sym ở 4 ô giữa.
+    Mỗi cửa sổ trả về [ô trống giữa..., đầu trái, đầu phải].
+    stones=3 → three đang sống; stones=2 → ô giữa là nước tạo three.
+    through=(row, col) → chỉ xét 4 đường đi qua ô đó.
+    """
+    own_lines = board.line_masks(sym)
+    other_lines = board.line_masks("O" if sym == "X" else "X")
+    found: List[Tuple[int, int, int]] = []
+
+    if through is not None:
+        lines = enumerate(board.cell_lines[through[0] * board.cols + through[1]])
+        for d, (line, _) in lines:
+            own = own_lines[d][line]
+            if own.bit_count() >= stones:
+                _open_windows(board, d, line, own, other_lines[d][line], stones, found)
+    else:
+        for d in range(4):
+            others = other_lines[d]
+            for line, own in enumerate(own_lines[d]):
+                if own.bit_count() >= stones:
+                    _open_windows(board, d, line, own, others[line], stones, found)
+
+    windows = []
+    for d, line, start in found:
+        own = own_lines[d][line]
+        inner = [
+            board.cell_on_line(d, line, start + k)
+            for k in range(1, 5)
+            if not (own >> (start + k)) & 1
+        ]
+        windows.append(inner + [
+            board.cell_on_line(d, line, start),
+            board.cell_on_line(d, line, start + 5),
+        ])
+    return windows
@@ -0,0 +1,141 @@
+"""
+Threat tracker gắn với Board (board.threats())
+Giữ sẵn, cho từng bên, các ô trống mà nếu đặt quân vào sẽ tạo:
+- five            (thắng ngay)
+- open four       (_XXXX_)
+- four            (four thường / four gãy, 1 cách thành 5)
+- double-three    (>= 2 hướng có three)
+→ các rule "thắng ngay / chặn / open-four / closed-four / double-three" của mọi AI chỉ còn là tra tập.
+
+Lớp threat của 1 ô theo hướng d chỉ phụ thuộc 9 ô quanh nó trên đường d (THREAT_TABLE),
+nên khi 1 ô đổi quân chỉ cần chấm lại tối đa 9 ô trên mỗi đường đi qua nó.
+Board chỉ ghi lại các ô đã đổi (touch); việc chấm lại làm lúc tra (sync) →
+place / remove hàng loạt trong tìm kiếm gần như không tốn thêm gì.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.core.patterns import THREAT_TABLE, CODE_BITS, HALF, FIVE, OPEN_FOUR, FOURS, THREES
+from src.core.constants import SYMBOL_X, SYMBOL_O
+
+Move = Tuple[int, int]
+
+# Nhiều ô đổi hơn ngưỡng này (vd sau 1 lượt tìm kiếm dài) → chấm lại cả bàn rẻ hơn
+REBUILD_TOUCHED = 24
+
+
+class ThreatTracker:
+    """
+    Cách dùng:
+        t = board.threats()        # tự sync với bàn cờ hiện tại
+        t.five(sym)                # ô thắng ngay đầu tiên (theo hàng → cột) hoặc None
+        t.open_four(sym), t.four(sym), t.double_three(sym)
+    """
+
+    def __init__(self, board):
+        self.board = board
+        size = board.rows * board.cols
+        # classes[sym][ô * 4 + d] = threat class nếu sym đặt vào ô (0 với ô đã có quân)
+        self.classes: Dict[str, bytearray] = {sym: bytearray(4 * size) for sym in (SYMBOL_X, SYMBOL_O)}
+        self.fives: Dict[str, Set[Move]] = {}
+        self.open_fours: Dict[str, Set[Move]] = {}
+        self.fours: Dict[str, Set[Move]] = {}
+        self.double_threes: Dict[str, Dict[Move, int]] = {}
+        self.touched: Set[int] = set()
+        self.rebuild()
+
+    # UPDATE
+    def touch(self, idx: int) -> None:
+        #Board gọi sau mỗi place / remove
+        self.touched.add(idx)
+
+    def sync(self) -> None:
+        if not self.touched:
+            return
+        if len(self.touched) > REBUILD_TOUCHED:
+            self.rebuild()
+            return
+
+        board = self.board
+        cols = board.cols
+        dirty: Dict[int, List[int]] = {}
+        for idx in self.touched:
+            for d, (line, pos) in enumerate(board.cell_lines[idx]):
+                valid = board.line_valid[d][line]
+                for p in range(max(0, pos - HALF), pos + HALF + 1):
+                    if (valid >> p) & 1:
+                        r, c = board.cell_on_line(d, line, p)
+                        dirty.setdefault(r * cols + c, []).append(d)
+        self.touched.clear()
+
+        for idx, dirs in dirty.items():
+            r, c = divmod(idx, cols)
+            for d in set(dirs):
+                self._rescore(r, c, d)
+            self._refresh(r, c)
+
+    def rebuild(self) -> None:
+        board = self.board
+        self.touched.clear()
+        for sym in (SYMBOL_X, SYMBOL_O):
+            self.fives[sym] = set()
+            self.open_fours[sym] = set()
+            self.fours[sym] = set()
+            self.double_threes[sym] = {}
+        for r in range(board.rows):
+            for c in range(board.cols):
+                for d in range(4):
+                    self._rescore(r, c, d)
+                self._refresh(r, c)
+
+    def _rescore(self, r: int, c: int, d: int) -> None:
+        board = self.board
+        i = (r * board.cols + c) * 4 + d
+        if board.grid[r][c] is not None:
+            self.classes[SYMBOL_X][i] = self.classes[SYMBOL_O][i] = 0
+            return
+        for sym in (SYMBOL_X, SYMBOL_O):
+            own, empty = board.line_window(r, c, d, sym, HALF)
+            self.classes[sym][i] = THREAT_TABLE[(own << CODE_BITS) | empty]
+
+    def _refresh(self, r: int, c: int) -> None:
+        #Cập nhật tư cách thành viên của ô trong các tập, theo 4 lớp vừa chấm
+        i = (r * self.board.cols + c) * 4
+        cell = (r, c)
+        for sym in (SYMBOL_X, SYMBOL_O):
+            t = self.classes[sym][i:i + 4]
+            _mark(self.fives[sym], cell, FIVE in t)
+            _mark(self.open_fours[sym], cell, OPEN_FOUR in t)
+            _mark(self.fours[sym], cell, any(x in FOURS for x in t))
+
+            threes = sum(1 for x in t if x in THREES)
+            if threes >= 2:
+                self.double_threes[sym][cell] = threes
+            else:
+                self.double_threes[sym].pop(cell, None)
+
+    # QUERIES (ô nhỏ nhất theo hàng → cột: cùng kết quả với vòng for row / for col)
+    def five(self, sym: str) -> Optional[Move]:
+        return min(self.fives[sym], default=None)
+
+    def open_four(self, sym: str) -> Optional[Move]:
+        return min(self.open_fours[sym], default=None)
+
+    def four(self, sym: str) -> Optional[Move]:
+        return min(self.fours[sym], default=None)
+
+    def double_three(self, sym: str) -> Optional[Move]:
+        #Ô có nhiều hướng three nhất
+        cells = self.double_threes[sym]
+        if not cells:
+            return None
+        return min(cells, key=lambda cell: (-cells[cell], cell))
+
+
+def _mark(cells: Set[Move], cell: Move, on: bool) -> None:
+    if on:
+        cells.add(cell)
+    else:
+        cells.discard(cell)
@@ -0,0 +1,72 @@
+"""
+Vòng lặp chờ sự kiện dùng chung cho menu / hướng dẫn / màn chơi
+Thay cho vòng 60 FPS vẽ lại liên tục: chặn ở pygame.event.wait,
+chỉ thức dậy khi có input, timer (CLOCK_TICK 1 Hz cho đồng hồ HUD) hoặc kết quả AI (AI_DONE)
+→ màn hình đứng yên gần như không tốn CPU.
+"""
+
+import pygame
+
+
+# Sự kiện riêng của game
+CLOCK_TICK = pygame.USEREVENT + 1      # 1 Hz: cập nhật đồng hồ HUD
+AI_DONE = pygame.USEREVENT + 2         # AIWorker vừa có kết quả (post từ luồng AI)
+
+CLOCK_TICK_MS = 1000
+
+# Nội dung cửa sổ có thể đã mất → phải vẽ lại toàn bộ
+REDRAW_EVENTS = (
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWSHOWN,
+)
+
+
+def wait_events(timeout=None):
+    #Chờ sự kiện rồi lấy hết hàng đợi. timeout (ms): None = chờ tới khi có, <= 0 = không chờ
+    if timeout is not None and timeout <= 0:
+        return pygame.event.get()
+
+    # pygame.event.wait(0) nghĩa là chờ mãi → không truyền timeout khi None
+    first = pygame.event.wait() if timeout is None else pygame.event.wait(timeout)
+    if first.type == pygame.NOEVENT:
+        return []
+    return [first] + pygame.event.get()
+
+
+def post_ai_done():
+    #Gọi từ luồng AI: pygame.event.post an toàn giữa các luồng
+    if pygame.get_init():
+        pygame.event.post(pygame.event.Event(AI_DONE))
+
+
+def hovered(rects):
+    #Chỉ số nút đang có chuột (-1 nếu không có) – trạng thái quyết định có cần vẽ lại menu không
+    mouse_pos = pygame.mouse.get_pos()
+    for i, rect in enumerate(rects):
+        if rect.collidepoint(mouse_pos):
+            return i
+    return -1
+
+
+def event_loop(draw, handle, state=lambda: None):
+    """
+    Vòng lặp cho màn hình tĩnh (menu, hướng dẫn):
+    - draw(): vẽ cả màn hình, chỉ gọi ở lần đầu, khi state() đổi (vd nút hover) hoặc sau REDRAW_EVENTS
+    - handle(event): trả về khác None → thoát vòng lặp với giá trị đó
+    """
+    shown = object()
+    while True:
+        current = state()
+        if current != shown:
+            draw()
+            pygame.display.flip()
+            shown = current
+
+        for event in wait_events():
+            if event.type in REDRAW_EVENTS:
+                shown = object()
+            result = handle(event)
+            if result is not None:
+                return result
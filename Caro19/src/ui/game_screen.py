@@ -2,9 +2,17 @@ import time
 import pygame
 
 from src.core.game import Game
-from src.core.constants import MODE_PVP, MODE_PVE
+from src.core.constants import MODE_PVP, MODE_PVE, SYMBOL_O
 from config.game_config import BOARD_ROWS, BOARD_COLS
 from config.ui_config import SCREEN_WIDTH, SCREEN_HEIGHT, FONT_NAME
+from src.utils.helpers import get_font, render_text
+from src.ui.event_loop import (
+    wait_events,
+    post_ai_done,
+    CLOCK_TICK,
+    CLOCK_TICK_MS,
+    REDRAW_EVENTS,
+)
 
 
 class GameScreen:
@@ -13,9 +21,8 @@ class GameScreen:
         self.mode = mode
         self.ai_level = ai_level
 
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(FONT_NAME, 22)
-        self.big_font = pygame.font.Font(FONT_NAME, 28)
+        self.font = get_font(FONT_NAME, 22)
+        self.big_font = get_font(FONT_NAME, 28)
 
         self._new_game()
 
@@ -33,13 +40,17 @@ class GameScreen:
         self.PADDING = 30
 
         self._calculate_layout()
+        self._build_surfaces()
 
     # GAME CONTROL
     def _new_game(self):
-        self.game = Game(self.mode, self.ai_level)
+        if getattr(self, "game", None) is not None:
+            self.game.close()
+        self.game = Game(self.mode, self.ai_level, ai_notify=post_ai_done)
         self.last_move = None
         self.ai_thinking = False
         self.player_just_moved = False
+        self.full_redraw = True
 
     # LAYOUT
     def _calculate_layout(self):
@@ -61,22 +72,45 @@ class GameScreen:
 
     # MAIN LOOP
     def run(self):
-        while True:
-            self.clock.tick(60)
-            self.screen.fill((18, 28, 38))
-
-            # ⏱️ CHỈ GỌI – KHÔNG CAN THIỆP
-            self.game.update_time()
-
-            self._create_buttons()
-            result = self._handle_events()
-            if result:
-                return result
-
-            self._ai_move()
-            self._draw()
-
-            pygame.display.flip()
+        # đồng hồ HUD chỉ cần đổi mỗi giây; input / AI_DONE tự đánh thức vòng lặp
+        pygame.time.set_timer(CLOCK_TICK, CLOCK_TICK_MS)
+        try:
+            while True:
+                events = wait_events(self._wait_timeout())
+
+                # ⏱️ CHỈ GỌI – KHÔNG CAN THIỆP
+                self.game.update_time()
+
+                self._create_buttons()
+                result = self._handle_events(events)
+                if result:
+                    self.game.close()
+                    return result
+
+                self._ai_move()
+                # _draw tự đưa lên màn hình: flip khi vẽ lại toàn bộ, còn lại chỉ update các vùng đổi
+                self._draw()
+        finally:
+            pygame.time.set_timer(CLOCK_TICK, 0)
+
+    def _wait_timeout(self):
+        """
+        ms được ngủ trước vòng kế tiếp (None = tới khi có sự kiện):
+        - cần vẽ lại / người vừa đánh / tới lượt AI mà chưa bắt đầu → không chờ
+        - đang trong AI_THINK_DELAY → tới lúc hết delay
+        - AI đang nghĩ hoặc không có gì → chờ sự kiện (AI_DONE, CLOCK_TICK, input)
+        """
+        ai_turn = (
+            self.mode == MODE_PVE
+            and not self.game.game_over
+            and self.game.current_player == SYMBOL_O
+        )
+        if self.full_redraw or self.player_just_moved or (ai_turn and not self.ai_thinking):
+            return 0
+        if self.ai_thinking and not self.game.ai_busy:
+            remaining = self.AI_THINK_DELAY - (time.time() - self.ai_start_time)
+            return max(1, int(remaining * 1000) + 1)
+        return None
 
     # BUTTONS
     def _create_buttons(self):
@@ -100,11 +134,15 @@ class GameScreen:
         )
 
     # EVENTS
-    def _handle_events(self):
-        for event in pygame.event.get():
+    def _handle_events(self, events):
+        for event in events:
             if event.type == pygame.QUIT:
                 return "QUIT"
 
+            # cửa sổ bị che / khôi phục → nội dung cũ không còn, vẽ lại toàn bộ
+            if event.type in REDRAW_EVENTS:
+                self.full_redraw = True
+
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if self.btn_home.collidepoint(event.pos):
                     return "HOME"
@@ -130,8 +168,10 @@ class GameScreen:
     # UNDO
     def _handle_undo(self):
         if self.mode == MODE_PVE:
+            # lùi về lượt người chơi: 2 nước, hoặc 1 nếu AI đang nghĩ (Game huỷ lượt nghĩ đó)
             self.game.undo()
-            self.game.undo()
+            if self.game.current_player == SYMBOL_O:
+                self.game.undo()
         else:
             self.game.undo()
 
@@ -170,125 +210,234 @@ class GameScreen:
             self.ai_start_time = time.time()
             return
 
+        # AI nghĩ trên luồng nền → chỉ hỏi kết quả khi thức dậy (AI_DONE), UI vẫn vẽ và nhận sự kiện
+        if self.game.ai_busy:
+            self.game.poll_ai_move()
+            if not self.game.ai_busy:
+                self.last_move = self.game.last_move
+                self.ai_thinking = False
+            return
+
         if time.time() - self.ai_start_time < self.AI_THINK_DELAY:
             return
 
-        if self.game.ai_move():
-            self.last_move = self.game.last_move
+        if not self.game.start_ai_move():
+            self.ai_thinking = False
 
-        self.ai_thinking = False
+    # CACHED SURFACES
+    def _build_surfaces(self):
+        """
+        Vẽ sẵn 1 lần:
+        - background: nền cửa sổ + bàn cờ + lưới (phần không bao giờ đổi)
+        - sprites: quân X / O, vòng nước cuối, vòng ô thắng – mỗi cái 1 surface trong suốt cỡ ô + lề
+        Vòng ô thắng tràn ra ngoài ô vài pixel → sprite có lề SPRITE_PAD mỗi phía.
+        """
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.background.fill((18, 28, 38))
+
+        pygame.draw.rect(
+            self.background,
+            (24, 40, 56),
+            (self.board_x, self.board_y, self.board_size, self.board_size),
+            border_radius=10
+        )
+
+        for i in range(BOARD_ROWS + 1):
+            pygame.draw.line(
+                self.background,
+                (60, 80, 100),
+                (self.board_x, self.board_y + i * self.cell_size),
+                (self.board_x + self.board_size,
+                 self.board_y + i * self.cell_size)
+            )
+
+        for i in range(BOARD_COLS + 1):
+            pygame.draw.line(
+                self.background,
+                (60, 80, 100),
+                (self.board_x + i * self.cell_size, self.board_y),
+                (self.board_x + i * self.cell_size,
+                 self.board_y + self.board_size)
+            )
+
+        radius = self.cell_size // 2 - 4
+        self.SPRITE_PAD = max(0, radius + 6 - self.cell_size // 2) + 1
+        size = self.cell_size + 2 * self.SPRITE_PAD
+        center = (size // 2, size // 2)
+
+        def sprite(color, r, width=0):
+            surf = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+            pygame.draw.circle(surf, color, center, r, width)
+            return surf
+
+        self.sprites = {
+            "X": sprite((255, 90, 90), radius),
+            "O": sprite((60, 220, 180), radius),
+            "last": sprite((255, 215, 0), radius + 3, 2),
+            "win": sprite((255, 230, 150), radius + 6, 3),
+        }
+
+        self.hud_rect = pygame.Rect(0, 0, SCREEN_WIDTH, self.HUD_HEIGHT)
+        self.panel_rect = pygame.Rect(self.panel_x, self.panel_y, self.SIDE_PANEL_WIDTH, self.panel_h)
+
+        # Trạng thái đang hiển thị, so với trạng thái mới để biết vùng nào phải vẽ lại
+        self.shown_cells = {}
+        self.shown_hud = None
+        self.shown_panel = None
 
     # DRAW
     def _draw(self):
-        self._draw_hud()
-        self._draw_board()
-        self._draw_pieces()
-        self._draw_panel()
+        if self.full_redraw:
+            self.full_redraw = False
+            self.screen.blit(self.background, (0, 0))
+            self.shown_cells = self._cell_states()
+            for cell in self.shown_cells:
+                self._draw_piece(*cell)
+            self._draw_hud()
+            self._draw_panel()
+            pygame.display.flip()
+            return
+
+        rects = self._draw_changed_cells()
+
+        if self._hud_state() != self.shown_hud:
+            self._draw_hud()
+            rects.append(self.hud_rect)
+
+        if self._panel_state() != self.shown_panel:
+            self._draw_panel()
+            rects.append(self.panel_rect)
+
+        if rects:
+            pygame.display.update(rects)
 
     def _format_time(self, seconds):
         seconds = max(0, int(seconds))
         return f"{seconds // 60:02}:{seconds % 60:02}"
 
+    def _hud_state(self):
+        return (
+            self._format_time(self.game.time_left['X']),
+            self.game.current_player,
+            self._format_time(self.game.time_left['O']),
+        )
+
     def _draw_hud(self):
+        self.shown_hud = self._hud_state()
+        time_x, player, time_o = self.shown_hud
+
         pygame.draw.rect(
             self.screen,
             (15, 25, 35),
-            (0, 0, SCREEN_WIDTH, self.HUD_HEIGHT)
+            self.hud_rect
         )
 
         self.screen.blit(
-            self.font.render(
-                f"X ⏱ {self._format_time(self.game.time_left['X'])}",
-                True,
+            render_text(
+                self.font,
+                f"X ⏱ {time_x}",
                 (220, 230, 240)
             ),
             (20, 20)
         )
 
         self.screen.blit(
-            self.big_font.render(
-                f"Lượt: {self.game.current_player}",
-                True,
+            render_text(
+                self.big_font,
+                f"Lượt: {player}",
                 (220, 230, 240)
             ),
             (SCREEN_WIDTH // 2 - 70, 18)
         )
 
         self.screen.blit(
-            self.font.render(
-                f"O ⏱ {self._format_time(self.game.time_left['O'])}",
-                True,
+            render_text(
+                self.font,
+                f"O ⏱ {time_o}",
                 (220, 230, 240)
             ),
             (SCREEN_WIDTH - 200, 20)
         )
 
-    def _draw_board(self):
-        pygame.draw.rect(
-            self.screen,
-            (24, 40, 56),
-            (self.board_x, self.board_y, self.board_size, self.board_size),
-            border_radius=10
-        )
-
-        for i in range(BOARD_ROWS + 1):
-            pygame.draw.line(
-                self.screen,
-                (60, 80, 100),
-                (self.board_x, self.board_y + i * self.cell_size),
-                (self.board_x + self.board_size,
-                 self.board_y + i * self.cell_size)
-            )
-
-        for i in range(BOARD_COLS + 1):
-            pygame.draw.line(
-                self.screen,
-                (60, 80, 100),
-                (self.board_x + i * self.cell_size, self.board_y),
-                (self.board_x + i * self.cell_size,
-                 self.board_y + self.board_size)
-            )
-
-    def _draw_pieces(self):
+    # PIECES
+    def _cell_states(self):
+        #{(r, c): (quân, là nước cuối, thuộc hàng thắng)} cho các ô có quân
         win_cells = set(self.game.win_cells) if self.game.win_cells else set()
+        grid = self.game.board.grid
+        return {
+            (r, c): (grid[r][c], self.last_move == (r, c), (r, c) in win_cells)
+            for r in range(BOARD_ROWS)
+            for c in range(BOARD_COLS)
+            if grid[r][c]
+        }
+
+    def _cell_area(self, r, c):
+        #Vùng màn hình của ô kể cả lề sprite
+        return pygame.Rect(
+            self.board_x + c * self.cell_size - self.SPRITE_PAD,
+            self.board_y + r * self.cell_size - self.SPRITE_PAD,
+            self.cell_size + 2 * self.SPRITE_PAD,
+            self.cell_size + 2 * self.SPRITE_PAD
+        )
 
-        for r in range(BOARD_ROWS):
-            for c in range(BOARD_COLS):
-                piece = self.game.board.grid[r][c]
-                if not piece:
-                    continue
-
-                cx = self.board_x + c * self.cell_size + self.cell_size // 2
-                cy = self.board_y + r * self.cell_size + self.cell_size // 2
-                radius = self.cell_size // 2 - 4
-
-                color = (255, 90, 90) if piece == "X" else (60, 220, 180)
-                pygame.draw.circle(self.screen, color, (cx, cy), radius)
-
-                if self.last_move == (r, c):
-                    pygame.draw.circle(
-                        self.screen,
-                        (255, 215, 0),
-                        (cx, cy),
-                        radius + 3,
-                        2
-                    )
-
-                if (r, c) in win_cells:
-                    pygame.draw.circle(
-                        self.screen,
-                        (255, 230, 150),
-                        (cx, cy),
-                        radius + 6,
-                        3
-                    )
+    def _draw_changed_cells(self):
+        """
+        Chỉ vẽ lại các ô có trạng thái khác frame trước (quân mới / bị Undo / nước cuối / ô thắng):
+        nền từ background, rồi quân của ô đó và các ô kề (sprite tràn sang nhau) trong vùng clip.
+        """
+        states = self._cell_states()
+        shown = self.shown_cells
+        changed = [
+            cell
+            for cell in set(states) | set(shown)
+            if states.get(cell) != shown.get(cell)
+        ]
+        self.shown_cells = states
+        if not changed:
+            return []
+
+        rects = []
+        for r, c in changed:
+            area = self._cell_area(r, c)
+            self.screen.set_clip(area)
+            self.screen.blit(self.background, area, area)
+            for rr in range(r - 1, r + 2):
+                for cc in range(c - 1, c + 2):
+                    if (rr, cc) in states:
+                        self._draw_piece(rr, cc)
+            rects.append(area)
+        self.screen.set_clip(None)
+        return rects
+
+    def _draw_piece(self, r, c):
+        piece, is_last, is_win = self.shown_cells[(r, c)]
+        pos = self._cell_area(r, c).topleft
+
+        self.screen.blit(self.sprites[piece], pos)
+        if is_last:
+            self.screen.blit(self.sprites["last"], pos)
+        if is_win:
+            self.screen.blit(self.sprites["win"], pos)
+
+    # PANEL
+    def _panel_state(self):
+        mouse = pygame.mouse.get_pos()
+        buttons = [self.btn_restart, self.btn_undo, self.btn_redo, self.btn_home]
+        return (
+            tuple(tuple(b) if b else None for b in buttons),
+            tuple(bool(b and b.collidepoint(mouse)) for b in buttons),
+            self.game.game_over,
+            self.game.winner,
+        )
 
     def _draw_panel(self):
+        self.shown_panel = self._panel_state()
+        self.screen.blit(self.background, self.panel_rect, self.panel_rect)
+
         pygame.draw.rect(
             self.screen,
             (30, 45, 60),
-            (self.panel_x, self.panel_y,
-             self.SIDE_PANEL_WIDTH, self.panel_h),
+            self.panel_rect,
             border_radius=12
         )
 
@@ -301,7 +450,7 @@ class GameScreen:
 
         if self.game.game_over:
             text = f"{self.game.winner} thắng!" if self.game.winner else "Hòa!"
-            label = self.big_font.render(text, True, (220, 230, 240))
+            label = render_text(self.big_font, text, (220, 230, 240))
             self.screen.blit(label, (self.panel_x + 40, self.panel_y + 220))
 
     def _draw_button(self, rect, text):
@@ -309,7 +458,7 @@ class GameScreen:
         color = (80, 140, 180) if hover else (50, 90, 120)
 
         pygame.draw.rect(self.screen, color, rect, border_radius=8)
-        label = self.font.render(text, True, (220, 230, 240))
+        label = render_text(self.font, text, (220, 230, 240))
         self.screen.blit(label, label.get_rect(center=rect.center))
 
 
@@ -17,6 +17,9 @@ from config.ui_config import (
     BUTTON_BORDER_RADIUS
 )
 
+from src.utils.helpers import get_font, render_text
+from src.ui.event_loop import event_loop, hovered
+
 from src.core.constants import ACTION_EXIT
 
 
@@ -25,20 +28,18 @@ def draw_button(screen, rect, text, font, mouse_pos):
     color = BUTTON_HOVER_COLOR if rect.collidepoint(mouse_pos) else BUTTON_COLOR
     pygame.draw.rect(screen, color, rect, border_radius=BUTTON_BORDER_RADIUS)
 
-    text_surf = font.render(text, True, TEXT_COLOR)
+    text_surf = render_text(font, text, TEXT_COLOR)
     text_rect = text_surf.get_rect(center=rect.center)
     screen.blit(text_surf, text_rect)
 
 
 def show_guide(screen):
-    clock = pygame.time.Clock()
-
-    title_font = pygame.font.Font(FONT_NAME, FONT_SIZE_TITLE)
-    text_font = pygame.font.Font(FONT_NAME, FONT_SIZE_TEXT)
-    button_font = pygame.font.Font(FONT_NAME, FONT_SIZE_BUTTON)
+    title_font = get_font(FONT_NAME, FONT_SIZE_TITLE)
+    text_font = get_font(FONT_NAME, FONT_SIZE_TEXT)
+    button_font = get_font(FONT_NAME, FONT_SIZE_BUTTON)
 
     # ===== TITLE =====
-    title_surf = title_font.render("HƯỚNG DẪN CHƠI", True, TEXT_COLOR)
+    title_surf = render_text(title_font, "HƯỚNG DẪN CHƠI", TEXT_COLOR)
     title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, 80))
 
     # ===== GUIDE CONTENT =====
@@ -64,7 +65,7 @@ def show_guide(screen):
     ]
 
     text_surfaces = [
-        text_font.render(line, True, TEXT_COLOR)
+        render_text(text_font, line, TEXT_COLOR)
         for line in guide_text
     ]
 
@@ -76,8 +77,7 @@ def show_guide(screen):
         BUTTON_HEIGHT
     )
 
-    #LOOP
-    while True:
+    def draw():
         mouse_pos = pygame.mouse.get_pos()
         screen.fill(BACKGROUND_COLOR)
 
@@ -99,13 +99,14 @@ def show_guide(screen):
         # Draw back button
         draw_button(screen, button_rect, "Quay lại", button_font, mouse_pos)
 
-        pygame.display.flip()
-        clock.tick(60)
+    def handle(event):
+        if event.type == pygame.QUIT:
+            return ACTION_EXIT
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1 and button_rect.collidepoint(event.pos):
                 return ACTION_EXIT
+        return None
 
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1 and button_rect.collidepoint(event.pos):
-                    return ACTION_EXIT
+    #LOOP: chỉ vẽ lại khi hover nút "Quay lại" đổi
+    return event_loop(draw, handle, state=lambda: hovered([button_rect]))
@@ -17,6 +17,9 @@ from config.ui_config import (
     MENU_GAP
 )
 
+from src.utils.helpers import get_font, render_text
+from src.ui.event_loop import event_loop, hovered
+
 from src.core.constants import (
     ACTION_PVP,
     ACTION_PVE,
@@ -29,7 +32,7 @@ def draw_button(screen, rect, text, font, mouse_pos):
     color = BUTTON_HOVER_COLOR if rect.collidepoint(mouse_pos) else BUTTON_COLOR
     pygame.draw.rect(screen, color, rect, border_radius=BUTTON_BORDER_RADIUS)
 
-    text_surf = font.render(text, True, TEXT_COLOR)
+    text_surf = render_text(font, text, TEXT_COLOR)
     text_rect = text_surf.get_rect(center=rect.center)
     screen.blit(text_surf, text_rect)
 
@@ -40,14 +43,12 @@ def play_menu(screen):
     Trả về: ACTION_PVP / ACTION_PVE / ACTION_EXIT
     """
 
-    clock = pygame.time.Clock()
-
     # Fonts
-    title_font = pygame.font.Font(FONT_NAME, FONT_SIZE_TITLE)
-    button_font = pygame.font.Font(FONT_NAME, FONT_SIZE_BUTTON)
+    title_font = get_font(FONT_NAME, FONT_SIZE_TITLE)
+    button_font = get_font(FONT_NAME, FONT_SIZE_BUTTON)
 
     # Title
-    title_surf = title_font.render("CHỌN CHẾ ĐỘ CHƠI", True, TEXT_COLOR)
+    title_surf = render_text(title_font, "CHỌN CHẾ ĐỘ CHƠI", TEXT_COLOR)
     title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, 120))
 
     # Buttons
@@ -69,8 +70,7 @@ def play_menu(screen):
         )
         button_rects.append(rect)
 
-    # Loop menu
-    while True:
+    def draw():
         mouse_pos = pygame.mouse.get_pos()
         screen.fill(BACKGROUND_COLOR)
 
@@ -87,15 +87,16 @@ def play_menu(screen):
                 mouse_pos
             )
 
-        pygame.display.flip()
-        clock.tick(60)
+    def handle(event):
+        if event.type == pygame.QUIT:
+            return ACTION_EXIT
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return ACTION_EXIT
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                for i, rect in enumerate(button_rects):
+                    if rect.collidepoint(event.pos):
+                        return buttons[i][0]
+        return None
 
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    for i, rect in enumerate(button_rects):
-                        if rect.collidepoint(event.pos):
-                            return buttons[i][0]
+    # Loop menu: chỉ vẽ lại khi nút hover đổi
+    return event_loop(draw, handle, state=lambda: hovered(button_rects))
@@ -1,6 +1,11 @@
 
+from collections import OrderedDict
+from functools import lru_cache
+
 import pygame
 
+from config.ui_config import TEXT_CACHE_SIZE
+
 
 # BASIC HELPERS
 def clamp(value, min_value, max_value):
@@ -15,10 +20,75 @@ def point_in_rect(point, rect: pygame.Rect):
 
 
 
+# TEXT CACHE
+@lru_cache(maxsize=None)
+def get_font(name, size):
+    #Font dùng chung theo (file, cỡ) → các màn hình dùng cùng 1 object, khoá của TextCache ổn định
+    return pygame.font.Font(name, size)
+
+
+class TextCache:
+    """
+    LRU các surface chữ đã render, khoá (font, text, màu, antialias).
+    font.render là lời gọi đắt nhất mỗi frame; chữ trên HUD / nút / menu hầu như không đổi
+    → ở trạng thái ổn định gần như mọi lần vẽ chữ là 1 lần tra dict.
+    Surface trả về dùng chung: chỉ blit, không vẽ đè lên.
+    """
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "size": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    #Thay cho font.render(text, antialias, color) ở mọi module UI
+    return TEXT_CACHE.render(font, text, color, antialias)
+
+
 # TEXT HELPERS
 def draw_text_center(screen, text, font, color, center):
     #Vẽ text căn giữa tại vị trí center (x, y).
-    surf = font.render(text, True, color)
+    surf = render_text(font, text, color)
     rect = surf.get_rect(center=center)
     screen.blit(surf, rect)
     return rect
@@ -28,7 +98,7 @@ def draw_text(screen, text, font, color, topleft):
 
     #Vẽ text tại góc trên trái topleft (x, y).
 
-    surf = font.render(text, True, color)
+    surf = render_text(font, text, color)
     rect = surf.get_rect(topleft=topleft)
     screen.blit(surf, rect)
     return rect